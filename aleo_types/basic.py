@@ -1,26 +1,70 @@
 import math
 import struct
 from decimal import Decimal
+from functools import lru_cache
 from ipaddress import IPv4Address, IPv6Address
-from typing import overload, Optional
+from typing import overload, Optional, Self, TypeVar, cast
 
-from .serialize import Serializable, JSONType, JSONSerialize
+from .serialize import Serializable, JSONType, JSONSerialize, ViewReader, load_from_view, read_struct, read_fixed, read_nested, read_since, read_run
 from .traits import *
 
 
+_u8_struct = struct.Struct("<B")
+_u16_struct = struct.Struct("<H")
+_u32_struct = struct.Struct("<I")
+_u64_struct = struct.Struct("<Q")
+_u128_struct = struct.Struct("<QQ")
+_i8_struct = struct.Struct("<b")
+_i16_struct = struct.Struct("<h")
+_i32_struct = struct.Struct("<i")
+_i64_struct = struct.Struct("<q")
+# struct codes for runs of ints by (size, signed), 128 bit ints have none
+_run_codes = {(1, False): "B", (2, False): "H", (4, False): "I", (8, False): "Q",
+              (1, True): "b", (2, True): "h", (4, True): "i", (8, True): "q"}
+
+
+def bech32_encode(prefix: str, data: bytes) -> str:
+    return aleo_explorer_rust.bech32_encode(prefix, data) # type: ignore
+
+
+@lru_cache(maxsize=65536)
+def interned_bech32_encode(prefix: str, data: bytes) -> str:
+    # bounded table for values rendered over and over, like the addresses of active accounts
+    return bech32_encode(prefix, data)
+
+
 class Bech32m:
+    _str: Optional[str] = None
 
     def __init__(self, data: bytes, prefix: str):
         self.data = data
         self.prefix = prefix
 
-    def __str__(self):
-        return aleo_explorer_rust.bech32_encode(self.prefix, self.data)
+    def __str__(self) -> str:
+        s = self._str
+        if s is None:
+            s = self._str = bech32_encode(self.prefix, self.data)
+        return s
 
     def __repr__(self):
         return str(self)
 
 
+def truncdiv(a: int, b: int) -> int:
+    # integer division rounding towards zero like the VM, python's // rounds towards negative infinity
+    q = abs(a) // abs(b)
+    return -q if (a < 0) != (b < 0) else q
+
+
+_IntT = TypeVar("_IntT", bound="Int")
+
+def _checked(cls: TType[_IntT], value: int) -> _IntT:
+    # __new__ without the Decimal conversion, for the results of int arithmetic
+    if not cls.min <= value <= cls.max:
+        raise OverflowError(f"value {value} out of range for {cls.__name__}")
+    return int.__new__(cls, value)
+
+
 class IntProtocol(Sized, Compare, AddWrapped, SubWrapped, MulWrapped, DivWrapped, And, Or, Xor, Not, ShlWrapped, ShrWrapped, RemWrapped, PowWrapped, Cast, Protocol):
     min: int
     max: int
@@ -46,11 +90,9 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         return int(self)
 
     def __add__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__add__(self, other))
-        if type(other) is not type(self):
+        if type(other) is not int and type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for +: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__add__(self, other))
+        return _checked(self.__class__, int.__add__(self, other))
 
     @classmethod
     def wrap_value(cls, value: int):
@@ -72,11 +114,9 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
 
 
     def __sub__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__sub__(self, other))
-        if type(other) is not type(self):
+        if type(other) is not int and type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for -: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__sub__(self, other))
+        return _checked(self.__class__, int.__sub__(self, other))
 
     def sub_wrapped(self, other: int | Self):
         if isinstance(other, Int):
@@ -85,11 +125,9 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         return self.__class__(self.wrap_value(value))
 
     def __mul__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__mul__(self, other))
-        if type(other) is not type(self):
+        if type(other) is not int and type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for *: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__mul__(self, other))
+        return _checked(self.__class__, int.__mul__(self, other))
 
     def mul_wrapped(self, other: int | Self):
         if isinstance(other, Int):
@@ -115,26 +153,22 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
     # we are deviating from python's insane behavior here
     # this is actually __truncdiv__
     def __floordiv__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int(Decimal(int(self)) // Decimal(other)))
-        if type(other) is not type(self):
+        if type(other) is not int and type(other) is not type(self):
             raise TypeError("unsupported operand type(s) for //: '{}' and '{}'".format(type(self), type(other)))
-        if other == 0:
+        if not other:
             raise ZeroDivisionError("division by zero")
-        return self.__class__(int(Decimal(int(self)) // Decimal(other)))
+        return _checked(self.__class__, truncdiv(int(self), int(other)))
 
     def div_wrapped(self, other: int | Self):
         if isinstance(other, Int):
             other = int(other)
-        value = int(int(self) / other)
+        value = truncdiv(int(self), other)
         return self.__class__(self.wrap_value(value))
 
     def __lshift__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__lshift__(self, other))
-        if not issubclass(type(other), Int):
+        if type(other) is not int and not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for <<: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__lshift__(self, other))
+        return _checked(self.__class__, int.__lshift__(self, other))
 
     def shl_wrapped(self, other: int | Self):
         if isinstance(other, Int):
@@ -142,11 +176,10 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         return self.__class__(self.wrap_value(int.__lshift__(self, other)))
 
     def __rshift__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__rshift__(self, other))
-        if not issubclass(type(other), Int):
+        if type(other) is not int and not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for >>: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__rshift__(self, other))
+        # shifting right only moves a value towards 0 or -1, it stays in range
+        return int.__new__(self.__class__, int.__rshift__(self, other))
 
     def shr_wrapped(self, other: int | Self):
         if isinstance(other, Int):
@@ -154,32 +187,33 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         return self.__class__(self.wrap_value(int.__rshift__(self, other)))
 
     def __and__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__and__(self, other))
-        if not issubclass(type(other), Int):
+        # bitwise ops and modulo of two values of the same type can't leave its range
+        if type(other) is type(self):
+            return int.__new__(self.__class__, int.__and__(self, other))
+        if type(other) is not int and not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for &: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__and__(self, other))
+        return _checked(self.__class__, int.__and__(self, other))
 
     def __or__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__or__(self, other))
-        if not issubclass(type(other), Int):
+        if type(other) is type(self):
+            return int.__new__(self.__class__, int.__or__(self, other))
+        if type(other) is not int and not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for |: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__or__(self, other))
+        return _checked(self.__class__, int.__or__(self, other))
 
     def __xor__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__xor__(self, other))
-        if not issubclass(type(other), Int):
+        if type(other) is type(self):
+            return int.__new__(self.__class__, int.__xor__(self, other))
+        if type(other) is not int and not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for ^: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__xor__(self, other))
+        return _checked(self.__class__, int.__xor__(self, other))
 
     def __mod__(self, other: int | Self):
-        if type(other) is int:
-            return self.__class__(int.__mod__(self, other))
-        if not issubclass(type(other), Int):
+        if type(other) is type(self):
+            return int.__new__(self.__class__, int.__mod__(self, other))
+        if type(other) is not int and not issubclass(type(other), Int):
             raise TypeError("unsupported operand type(s) for %: '{}' and '{}'".format(type(self), type(other)))
-        return self.__class__(int.__mod__(self, other))
+        return _checked(self.__class__, int.__mod__(self, other))
 
     def rem_wrapped(self, other: int | Self):
         return self.__mod__(other)
@@ -232,6 +266,18 @@ class Int(int, Serializable, JSONSerialize, IntProtocol):
         return destination_type.primitive_type.load(BytesIO(aleo_explorer_rust.cast(str(self) + str(self.__class__.__name__), reverse_primitive_type_map[self.__class__], destination_type, lossy)))
 
 
+    @classmethod
+    def load_run(cls, data: BytesIO, count: int) -> list[Self]:
+        size = cls.size
+        signed = cls.min < 0
+        run = read_run(data, size, count)
+        if (code := _run_codes.get((size, signed))) is not None:
+            values = struct.unpack(f"<{count}{code}", run)
+        else:
+            values = [int.from_bytes(run[i:i + size], "little", signed=signed) for i in range(0, size * count, size)]
+        # decoded from their exact width, the values are in range
+        return [int.__new__(cls, value) for value in values]
+
     def dump(self) -> bytes:
         raise TypeError("cannot deserialize Int base class")
 
@@ -247,8 +293,11 @@ class IntEnumu8(Serializable, IntEnum, metaclass=ProtocolEnumMeta):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<B", data.read(1))[0])
-        return self
+        value = read_struct(data, _u8_struct)[0]
+        try:
+            return cast(Self, cls._value2member_map_[value])
+        except KeyError:
+            return cls(value)
 
 
 class IntEnumu16(Serializable, IntEnum, metaclass=ProtocolEnumMeta):
@@ -258,8 +307,11 @@ class IntEnumu16(Serializable, IntEnum, metaclass=ProtocolEnumMeta):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<H", data.read(2))[0])
-        return self
+        value = read_struct(data, _u16_struct)[0]
+        try:
+            return cast(Self, cls._value2member_map_[value])
+        except KeyError:
+            return cls(value)
 
 
 class IntEnumu32(Serializable, IntEnum, metaclass=ProtocolEnumMeta):
@@ -269,8 +321,11 @@ class IntEnumu32(Serializable, IntEnum, metaclass=ProtocolEnumMeta):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<I", data.read(4))[0])
-        return self
+        value = read_struct(data, _u32_struct)[0]
+        try:
+            return cast(Self, cls._value2member_map_[value])
+        except KeyError:
+            return cls(value)
 
 
 class u8(Int, Mod):
@@ -283,7 +338,7 @@ class u8(Int, Mod):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<B", data.read(1))[0])
+        self = cls(read_struct(data, _u8_struct)[0])
         return self
 
 
@@ -297,7 +352,7 @@ class u16(Int, Mod):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<H", data.read(2))[0])
+        self = cls(read_struct(data, _u16_struct)[0])
         return self
 
 
@@ -311,7 +366,7 @@ class u32(Int, Mod):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<I", data.read(4))[0])
+        self = cls(read_struct(data, _u32_struct)[0])
         return self
 
 
@@ -325,7 +380,7 @@ class u64(Int, Mod):
 
     @classmethod
     def load(cls, data: BytesIO):
-        self = cls(struct.unpack("<Q", data.read(8))[0])
+        self = cls(read_struct(data, _u64_struct)[0])
         return self
 
     def json(self) -> JSONType:
@@ -344,7 +399,7 @@ class u128(Int, Mod):
 
     @classmethod
     def load(cls, data: BytesIO):
-        lo, hi = struct.unpack("<QQ", data.read(16))
+        lo, hi = read_struct(data, _u128_struct)
         self = cls((hi << 64) | lo)
         return self
 
@@ -362,7 +417,7 @@ class i8(Int, AbsWrapped, Neg):
 
     @classmethod
     def load(cls, data: BytesIO):
-        return cls(struct.unpack("<b", data.read(1))[0])
+        return cls(read_struct(data, _i8_struct)[0])
 
     def __abs__(self):
         return i8(abs(int(self)))
@@ -384,7 +439,7 @@ class i16(Int, AbsWrapped, Neg):
 
     @classmethod
     def load(cls, data: BytesIO):
-        return cls(struct.unpack("<h", data.read(2))[0])
+        return cls(read_struct(data, _i16_struct)[0])
 
     def __abs__(self):
         return i16(abs(int(self)))
@@ -406,7 +461,7 @@ class i32(Int, AbsWrapped, Neg):
 
     @classmethod
     def load(cls, data: BytesIO):
-        return cls(struct.unpack("<i", data.read(4))[0])
+        return cls(read_struct(data, _i32_struct)[0])
 
     def __abs__(self):
         return i32(abs(int(self)))
@@ -428,7 +483,7 @@ class i64(Int, AbsWrapped, Neg):
 
     @classmethod
     def load(cls, data: BytesIO):
-        return cls(struct.unpack("<q", data.read(8))[0])
+        return cls(read_struct(data, _i64_struct)[0])
 
     def __abs__(self):
         return i64(abs(int(self)))
@@ -453,7 +508,7 @@ class i128(Int, AbsWrapped, Neg):
 
     @classmethod
     def load(cls, data: BytesIO):
-        return cls(int.from_bytes(data.read(16), "little", signed=True))
+        return cls(int.from_bytes(read_fixed(data, 16), "little", signed=True))
 
     def __abs__(self):
         return i128(abs(int(self)))
@@ -480,7 +535,7 @@ class bool_(Sized, Serializable, JSONSerialize, And, Or, Not, Xor, Nand, Nor):
 
     @classmethod
     def load(cls, data: BytesIO):
-        value = data.read(1)[0]
+        value = read_struct(data, _u8_struct)[0]
         if value == 0:
             value = False
         elif value == 1:
@@ -20,6 +20,10 @@ TP = TypeVarTuple('TP')
 L = TypeVar('L', bound=Int | FixedSize)
 I_co = TypeVar('I_co', bound=Int, covariant=True)
 
+# parametrized class -> (generic class, parameters), so the classes built by __class_getitem__ can be rebuilt by name
+# in another process (see node.decoder)
+generic_classes: dict[type, tuple[type, Any]] = {}
+
 # from cpython 3.11.6
 def tp_cache(func: Optional[Callable[..., Any]] = None, /, *, typed: bool = False):
     """Internal wrapper caching __getitem__ of generic types.
@@ -27,7 +31,13 @@ def tp_cache(func: Optional[Callable[..., Any]] = None, /, *, typed: bool = Fals
     For non-hashable arguments, the original function is used as a fallback.
     """
     def decorator(func: Callable[..., Any]):
-        cached = functools.lru_cache(maxsize=None, typed=typed)(func)
+        def register(cls: type, key: Any):
+            res = func(cls, key)
+            if isinstance(res, GenericAlias):
+                generic_classes[cast(type, res.__origin__)] = (cls, key)
+            return res
+
+        cached = functools.lru_cache(maxsize=None, typed=typed)(register)
 
         @functools.wraps(func)
         def inner(*args: Hashable, **kwds: Hashable):
@@ -123,12 +133,12 @@ class Vec(list[T], Serializable, JSONSerialize, Generic[T, L]):
         return GenericAlias(param_type, key)
 
     def dump(self) -> bytes:
-        res = b""
+        res: list[bytes] = []
         if isinstance(self._size, Int):
-            res += self._size.dump()
+            res.append(self._size.dump())
         for item in self:
-            res += item.dump()
-        return res
+            res.append(item.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
@@ -137,6 +147,9 @@ class Vec(list[T], Serializable, JSONSerialize, Generic[T, L]):
             size = size_type
         else:
             size = cast(Int, size_type).load(data)
+        # fixed size element types read the whole run at once and split it
+        if size and (load_run := getattr(value_type, "load_run", None)) is not None:
+            return cls(load_run(data, size))
         return cls(list(value_type.load(data) for _ in range(size)))
 
     def json(self) -> JSONType:
@@ -39,36 +39,8 @@ class Message(EnumBaseSerialize, RustEnum, Serializable):
 
     @classmethod
     def load(cls, data: BytesIO):
-        type_ = Message.Type(struct.unpack("<H", data.read(2))[0])
-        match type_:
-            case Message.Type.BlockRequest:
-                message = BlockRequest.load(data)
-            case Message.Type.BlockResponse:
-                message = BlockResponse.load(data)
-            case Message.Type.ChallengeRequest:
-                message = ChallengeRequest.load(data)
-            case Message.Type.ChallengeResponse:
-                message = ChallengeResponse.load(data)
-            case Message.Type.Disconnect:
-                message = Disconnect.load(data)
-            case Message.Type.PeerRequest:
-                message = PeerRequest.load(data)
-            case Message.Type.PeerResponse:
-                message = PeerResponse.load(data)
-            case Message.Type.Ping:
-                message = Ping.load(data)
-            case Message.Type.Pong:
-                message = Pong.load(data)
-            case Message.Type.PuzzleRequest:
-                message = PuzzleRequest.load(data)
-            case Message.Type.PuzzleResponse:
-                message = PuzzleResponse.load(data)
-            case Message.Type.UnconfirmedSolution:
-                message = UnconfirmedSolution.load(data)
-            case Message.Type.UnconfirmedTransaction:
-                message = UnconfirmedTransaction.load(data)
-        # noinspection PyUnboundLocalVariable
-        return message
+        type_ = Message.Type.load(data)
+        return Message.load_variant(type_, data)
 
 class BlockRequest(Message):
     type = Message.Type.BlockRequest
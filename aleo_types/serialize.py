@@ -1,20 +1,56 @@
-import inspect
+import functools
 import re
+import struct
+from abc import ABCMeta
 from enum import IntEnum
 from io import BytesIO
-from typing import TYPE_CHECKING, Protocol, Self, runtime_checkable, Any, cast
+# noinspection PyUnresolvedReferences,PyProtectedMember
+from typing import TYPE_CHECKING, Protocol, Self, runtime_checkable, Any, Callable, cast, TypeVar, _ProtocolMeta  # type: ignore[reportPrivateUsage]
 
 if TYPE_CHECKING:
     pass
 
-class Deserialize(Protocol):
+
+class CachedProtocolMeta(_ProtocolMeta):
+    """
+    typing sends every isinstance() against a class with protocol bases through a python level check, which for runtime
+    protocols walks the protocol members each time. Concrete classes go straight to ABCMeta's C implementation, and
+    runtime protocols, which here only have methods, remember their answer per type.
+    """
+
+    _cached_is_protocol: bool
+
+    def __init__(cls, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # what typing.is_protocol (3.13+) checks, looked up once per class instead of on every isinstance()
+        cls._cached_is_protocol = bool(getattr(cls, "_is_protocol", False))
+
+    def __instancecheck__(cls, instance: Any) -> bool:
+        if not cls._cached_is_protocol:
+            return ABCMeta.__instancecheck__(cls, instance)
+        key = (cls, instance.__class__)
+        try:
+            return _protocol_checks[key]
+        except KeyError:
+            pass
+        result = super().__instancecheck__(instance)
+        _protocol_checks[key] = result
+        return result
+
+
+_protocol_checks: dict[tuple[type, type], bool] = {}
+
+
+class Deserialize(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
         ...
 
 
-class Serialize(Protocol):
+class Serialize(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
 
     def dump(self) -> bytes:
         ...
@@ -22,51 +58,176 @@ class Serialize(Protocol):
 
 @runtime_checkable
 class Serializable(Serialize, Deserialize, Protocol):
-    pass
+    __slots__ = ()
+
+class ViewReader:
+    """
+    BytesIO compatible reader over a memoryview, for decoding large buffers like blocks and frames. Fixed size types
+    read through read_struct / read_fixed, which unpack in place instead of copying the bytes out first.
+    """
+    __slots__ = ("view", "offset")
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self.view = memoryview(data)
+        self.offset = 0
+
+    def read(self, size: int = -1) -> bytes:
+        return self.read_view(size).tobytes()
+
+    def read_view(self, size: int = -1) -> memoryview:
+        start = self.offset
+        end = len(self.view) if size < 0 else min(start + size, len(self.view))
+        self.offset = end
+        return self.view[start:end]
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        values = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def tell(self) -> int:
+        return self.offset
+
+    def getbuffer(self) -> memoryview:
+        return self.view
+
+
+def read_struct(data: BytesIO | ViewReader, fmt: struct.Struct) -> tuple[Any, ...]:
+    if isinstance(data, ViewReader):
+        return data.unpack(fmt)
+    return fmt.unpack(data.read(fmt.size))
+
+
+def read_fixed(data: BytesIO | ViewReader, size: int) -> bytes | memoryview:
+    if isinstance(data, ViewReader):
+        return data.read_view(size)
+    return data.read(size)
+
+
+def read_run(data: BytesIO | ViewReader, size: int, count: int) -> bytes | memoryview:
+    # count fixed size elements in one read, for the load_run of types a Vec can split without decoding one by one
+    run = read_fixed(data, size * count)
+    if len(run) != size * count:
+        raise ValueError("unexpected end of data")
+    return run
+
+
+def read_nested(data: BytesIO | ViewReader, size: int) -> BytesIO:
+    # length prefixed sub-buffer, a view reader hands out a view of itself instead of copying
+    if isinstance(data, ViewReader):
+        return cast(BytesIO, ViewReader(data.read_view(size)))
+    return BytesIO(data.read(size))
+
+
+def read_since(data: BytesIO | ViewReader, start: int) -> bytes:
+    # the encoding of whatever was loaded from data after start, kept by types that memoize their dump()
+    if isinstance(data, ViewReader):
+        return data.view[start:data.offset].tobytes()
+    with data.getbuffer() as view:
+        return bytes(view[start:data.tell()])
+
+
+DT = TypeVar("DT", bound=Deserialize)
+
+def load_from_view(cls: type[DT], data: bytes | bytearray | memoryview) -> DT:
+    return cls.load(cast(BytesIO, ViewReader(data)))
+
 
 JSONType = dict[str, Any] | list[Any] | tuple[Any] | str | int | float | bool | None
 name_convert_pattern = re.compile(r'(?<!^)(?<![A-Z])(?=[A-Z])')
 
 
+@functools.cache
 def enum_name_convert(name: str) -> str:
     return name_convert_pattern.sub('_', name).lower()
 
 
+_json_field_cache: dict[type, tuple[str, ...]] = {}
+
+
+def _json_fields(cls: type) -> tuple[str, ...]:
+    # public slots of a class, base classes first, which is the order __init__ assigns them in
+    try:
+        return _json_field_cache[cls]
+    except KeyError:
+        pass
+    fields: list[str] = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        fields.extend(name for name in slots if not name.startswith("_") and name not in fields)
+    _json_field_cache[cls] = tuple(fields)
+    return _json_field_cache[cls]
+
+
+def _json_value(v: Any) -> JSONType:
+    if isinstance(v, JSONSerialize):
+        return v.json()
+    elif isinstance(v, dict):
+        v = cast(dict[Any, Any], v)
+        dict_sub: dict[str, JSONType] = {}
+        for k1, v1 in v.items():
+            if isinstance(v1, IntEnum):
+                dict_sub[str(k1)] = enum_name_convert(v1.name)
+            elif not isinstance(v1, JSONSerialize):
+                raise TypeError(f"cannot serialize {v1.__class__.__name__}")
+            else:
+                dict_sub[str(k1)] = v1.json()
+        return dict_sub
+    elif isinstance(v, (list, tuple)):
+        v = cast(list[Any], v)
+        list_sub: list[JSONType] = []
+        for item in v:
+            if not isinstance(item, JSONSerialize):
+                raise TypeError(f"cannot serialize {item.__class__.__name__}")
+            list_sub.append(item.json())
+        return list_sub
+    elif isinstance(v, IntEnum):
+        return enum_name_convert(v.name)
+    else:
+        raise TypeError(f"cannot serialize {v.__class__.__name__}")
+
+
+def _build_json_encoder(cls: type) -> Callable[[Any], dict[str, JSONType]]:
+    """
+    Encoder for the default JSONSerialize.json() of cls: the public slots, then the public instance __dict__ entries,
+    then the enum constants declared on the class itself. Everything that only depends on the class is resolved here.
+    """
+    fields = _json_fields(cls)
+    has_dict = cls.__dictoffset__ != 0
+    enums = tuple((k, enum_name_convert(v.name)) for k, v in cls.__dict__.items()
+                  if not k.startswith("_") and isinstance(v, IntEnum))
+
+    def encode(self: Any) -> dict[str, JSONType]:
+        res: dict[str, JSONType] = {}
+        for k in fields:
+            try:
+                v = getattr(self, k)
+            except AttributeError:
+                continue
+            res[k] = _json_value(v)
+        if has_dict:
+            for k, v in self.__dict__.items():
+                if not k.startswith("_"):
+                    res[k] = _json_value(v)
+        res.update(enums)
+        return res
+
+    return encode
+
+
+_json_encoders: dict[type, Callable[[Any], dict[str, JSONType]]] = {}
+
+
 @runtime_checkable
-class JSONSerialize(Protocol):
+class JSONSerialize(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        _json_encoders[cls] = _build_json_encoder(cls)
 
     def json(self) -> JSONType:
         """Return a JSON-serializable object."""
-        res: dict[str, Any] = {}
-        for k, v in self.__dict__.items():
-            if not k.startswith("_"):
-                if isinstance(v, JSONSerialize):
-                    res[k] = v.json()
-                elif isinstance(v, dict):
-                    v = cast(dict[Any, Any], v)
-                    dict_sub = {}
-                    for k1, v1 in v.items():
-                        if isinstance(v1, IntEnum):
-                            dict_sub[str(k1)] = enum_name_convert(v1.name)
-                        elif not isinstance(v1, JSONSerialize):
-                            raise TypeError(f"cannot serialize {v1.__class__.__name__}")
-                        else:
-                            dict_sub[str(k1)] = v1.json()
-                    res[k] = dict_sub
-                elif isinstance(v, (list, tuple)):
-                    v = cast(list[Any], v)
-                    list_sub: list[JSONType] = []
-                    for item in v:
-                        if not isinstance(item, JSONSerialize):
-                            raise TypeError(f"cannot serialize {item.__class__.__name__}")
-                        list_sub.append(item.json())
-                    res[k] = list_sub
-                elif isinstance(v, IntEnum):
-                    res[k] = enum_name_convert(v.name)
-                else:
-                    raise TypeError(f"cannot serialize {v.__class__.__name__}")
-        for k, v in self.__class__.__dict__.items():
-            if not k.startswith("_") and not inspect.isfunction(v):
-                if isinstance(v, IntEnum):
-                    res[k] = enum_name_convert(v.name)
-        return res
+        return _json_encoders[self.__class__](self)
@@ -1,20 +1,23 @@
 from enum import IntEnum
 from typing import Protocol, runtime_checkable, Self, Type as TType
 
-from .serialize import Serialize
+from .serialize import Serialize, CachedProtocolMeta
 from .utils import *
 
 
-class Sized(Protocol):
+class Sized(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     size: int
 
 @runtime_checkable
-class Equal(Protocol):
+class Equal(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __eq__(self, other: Any) -> bool:
         ...
 
 @runtime_checkable
 class Compare(Equal, Protocol):
+    __slots__ = ()
     def __lt__(self, other: Any) -> bool:
         ...
 
@@ -29,164 +32,228 @@ class Compare(Equal, Protocol):
 
 
 @runtime_checkable
-class Abs(Protocol):
+class Abs(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __abs__(self) -> Self:
         ...
 
 @runtime_checkable
 class AbsWrapped(Abs, Protocol):
+    __slots__ = ()
     def abs_wrapped(self) -> Self:
         ...
 
 @runtime_checkable
-class Add(Protocol):
+class Add(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __add__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class AddWrapped(Add, Protocol):
+    __slots__ = ()
     def add_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Sub(Protocol):
+class Sub(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __sub__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class SubWrapped(Sub, Protocol):
+    __slots__ = ()
     def sub_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Mul(Protocol):
+class Mul(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __mul__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class MulWrapped(Mul, Protocol):
+    __slots__ = ()
     def mul_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Div(Protocol):
+class Div(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __floordiv__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class DivWrapped(Div, Protocol):
+    __slots__ = ()
     def div_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class And(Protocol):
+class And(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __and__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Or(Protocol):
+class Or(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __or__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Xor(Protocol):
+class Xor(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __xor__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Not(Protocol):
+class Not(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __invert__(self) -> Self:
         ...
 
 @runtime_checkable
-class Nand(Protocol):
+class Nand(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def nand(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Nor(Protocol):
+class Nor(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def nor(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Shl(Protocol):
+class Shl(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __lshift__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class ShlWrapped(Shl, Protocol):
+    __slots__ = ()
     def shl_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Shr(Protocol):
+class Shr(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __rshift__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class ShrWrapped(Shr, Protocol):
+    __slots__ = ()
     def shr_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Rem(Protocol):
+class Rem(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __mod__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class RemWrapped(Rem, Protocol):
+    __slots__ = ()
     def rem_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Pow(Protocol):
+class Pow(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __pow__(self, other: Any, mod: None = None) -> Self:
         ...
 
 @runtime_checkable
 class PowWrapped(Pow, Protocol):
+    __slots__ = ()
     def pow_wrapped(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
 class Double(Add, Protocol):
+    __slots__ = ()
     def double(self) -> Self:
         ...
 
 @runtime_checkable
 class Square(Mul, Protocol):
+    __slots__ = ()
     def square(self) -> Self:
         ...
 
 @runtime_checkable
-class Sqrt(Protocol):
+class Sqrt(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def sqrt(self) -> Self:
         ...
 
 @runtime_checkable
-class Inv(Protocol):
+class Inv(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def inv(self) -> Self:
         ...
 
 @runtime_checkable
-class Mod(Protocol):
+class Mod(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __mod__(self, other: Any) -> Self:
         ...
 
 @runtime_checkable
-class Neg(Protocol):
+class Neg(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def __neg__(self) -> Self:
         ...
 
 @runtime_checkable
-class Cast(Protocol):
+class Cast(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     def cast(self, destination_type: Any, *, lossy: bool) -> Any:
         ...
 
-class RustEnum(Protocol):
+class RustEnum(Protocol, metaclass=CachedProtocolMeta):
+    __slots__ = ()
     Type: TType[IntEnum]
 
 class EnumBaseSerialize(Serialize):
+    __slots__ = ()
+    # variant classes indexed by type tag, kept on the class that declares Type and filled in as variants are defined
+    _variants: list[Any]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        type_ = cls.__dict__.get("type")
+        if not isinstance(type_, IntEnum):
+            return
+        for base in cls.__mro__[1:]:
+            enum_type = base.__dict__.get("Type")
+            if enum_type is not None and isinstance(type_, enum_type):
+                variants: list[Any] | None = base.__dict__.get("_variants")
+                if variants is None:
+                    variants = []
+                    setattr(base, "_variants", variants)
+                if len(variants) <= type_:
+                    variants.extend([None] * (type_ + 1 - len(variants)))
+                # the first class declaring a tag wins, subclasses of a variant share its tag
+                if variants[type_] is None:
+                    variants[type_] = cls
+                return
+
+    @classmethod
+    def load_variant(cls, type_: int, data: BytesIO) -> Self:
+        try:
+            variant = cls._variants[type_]
+        except (AttributeError, IndexError):
+            variant = None
+        if variant is None:
+            raise ValueError(f"unknown {cls.__name__} type {type_}")
+        return variant.load(data)
 
     def dump(self) -> bytes:
         raise TypeError("cannot serialize base class")
@@ -1,14 +1,15 @@
 from enum import EnumMeta
 from io import BytesIO
-# noinspection PyUnresolvedReferences,PyProtectedMember
-from typing import get_type_hints, _ProtocolMeta, Any  # type: ignore[reportPrivateUsage]
+from typing import get_type_hints, Any
 
 import aleo_explorer_rust
 
+from .serialize import CachedProtocolMeta
+
 
 # Metaclass Helper
 
-class ProtocolEnumMeta(_ProtocolMeta, EnumMeta):
+class ProtocolEnumMeta(CachedProtocolMeta, EnumMeta):
     # https://stackoverflow.com/questions/56131308/create-an-abstract-enum-class/56135108#56135108
     def __new__(cls, *args: Any, **kw: Any):
         abstract_enum_cls = super().__new__(cls, *args, **kw)
@@ -7,15 +7,22 @@ class AleoIDProtocol(Sized, Serializable, Protocol):
     size: int
     _prefix: str
 
+    @classmethod
+    def load_run(cls, data: BytesIO, count: int) -> list[Self]:
+        # ids are stored as their raw bytes, a Vec of them is one slice per element
+        size = cls.size
+        run = bytes(read_run(data, size, count))
+        return [cls(run[i:i + size]) for i in range(0, size * count, size)] # type: ignore[reportCallIssue]
+
 class AleoID(AleoIDProtocol, JSONSerialize):
     size = 32
     _prefix = ""
+    _str: Optional[str] = None
 
     def __init__(self, data: bytes):
         if len(self._prefix) != 2:
             raise ValueError("locator_prefix must be 2 bytes")
         self._data = data
-        self._bech32m = Bech32m(data, self._prefix)
 
     def dump(self) -> bytes:
         return self._data
@@ -33,13 +40,19 @@ class AleoID(AleoIDProtocol, JSONSerialize):
             raise ValueError("incorrect hrp")
         if len(raw) != cls.size:
             raise ValueError("incorrect length")
-        return cls(bytes(raw))
+        self = cls(bytes(raw))
+        self._str = data.lower()
+        return self
 
     def json(self) -> JSONType:
         return str(self)
 
-    def __str__(self):
-        return str(self._bech32m)
+    def __str__(self) -> str:
+        # computed once, the same ids are rendered many times while saving and serving blocks
+        s = self._str
+        if s is None:
+            s = self._str = bech32_encode(self._prefix, self._data)
+        return s
 
     def __repr__(self):
         return self.__class__.__name__ + "(" + str(self) + ")"
@@ -53,10 +66,10 @@ class AleoID(AleoIDProtocol, JSONSerialize):
 class AleoObject(AleoIDProtocol, JSONSerialize):
     size = 0
     _prefix = ""
+    _str: Optional[str] = None
 
     def __init__(self, data: bytes):
         self._data = data
-        self._bech32m = Bech32m(data, self._prefix)
 
     def dump(self) -> bytes:
         return self._data
@@ -74,13 +87,21 @@ class AleoObject(AleoIDProtocol, JSONSerialize):
             raise ValueError("incorrect hrp")
         if len(raw) != cls.size:
             raise ValueError("incorrect length")
-        return cls(bytes(raw))
+        self = cls(bytes(raw))
+        self._str = data.lower()
+        return self
 
     def json(self) -> JSONType:
         return str(self)
 
-    def __str__(self):
-        return str(self._bech32m)
+    def __str__(self) -> str:
+        s = self._str
+        if s is None:
+            s = self._str = self._encode()
+        return s
+
+    def _encode(self) -> str:
+        return bech32_encode(self._prefix, self._data)
 
     def __repr__(self):
         return self.__class__.__name__ + "(" + str(self) + ")"
@@ -124,6 +145,9 @@ class Address(AleoObject, Cast):
     _prefix = "aleo"
     size = 32
 
+    def _encode(self) -> str:
+        return interned_bech32_encode(self._prefix, self._data)
+
     def cast(self, destination_type: Any, *, lossy: bool) -> Any:
         from .vm_instruction import LiteralType
         if not isinstance(destination_type, LiteralType):
@@ -151,9 +175,14 @@ class Field(Serializable, JSONSerialize, Double, Sub, Square, Div, Sqrt, Compare
 
     @classmethod
     def load(cls, data: BytesIO):
-        data_ = int.from_bytes(data.read(32), "little")
+        data_ = int.from_bytes(read_fixed(data, 32), "little")
         return cls(data_)
 
+    @classmethod
+    def load_run(cls, data: BytesIO, count: int) -> list[Self]:
+        run = read_run(data, 32, count)
+        return [cls(int.from_bytes(run[i:i + 32], "little")) for i in range(0, 32 * count, 32)]
+
     @classmethod
     def loads(cls, data: str):
         return cls(int(data.removesuffix("field")))
@@ -234,7 +263,7 @@ class Group(Serializable, JSONSerialize, Add, Sub, Mul, Neg, Cast):
 
     @classmethod
     def load(cls, data: BytesIO):
-        data_ = int.from_bytes(data.read(32), "little")
+        data_ = int.from_bytes(read_fixed(data, 32), "little")
         return cls(data_)
 
     @classmethod
@@ -290,7 +319,7 @@ class Scalar(Serializable, JSONSerialize, Add, Sub, Mul, Compare, Cast):
 
     @classmethod
     def load(cls, data: BytesIO):
-        data_ = int.from_bytes(data.read(32), "little")
+        data_ = int.from_bytes(read_fixed(data, 32), "little")
         return cls(data_)
 
     @classmethod
@@ -350,7 +379,7 @@ class Fq(Serializable):
 
     @classmethod
     def load(cls, data: BytesIO):
-        value = int.from_bytes(data.read(48), "little")
+        value = int.from_bytes(read_fixed(data, 48), "little")
         return cls(value=value)
 
     def __str__(self):
@@ -451,21 +480,56 @@ class ComputeKey(Serializable):
 
 
 class Signature(Serializable, JSONSerialize):
+    """
+    Loaded signatures keep their raw bytes and only decode the scalars and compute key when those are accessed.
+    Certificates carry hundreds of them that are mostly just rendered as strings.
+    """
+    size = 128
 
     def __init__(self, *, challenge: Scalar, response: Scalar, compute_key: ComputeKey):
-        self.challenge = challenge
-        self.response = response
-        self.compute_key = compute_key
+        self._fields: Optional[tuple[Scalar, Scalar, ComputeKey]] = (challenge, response, compute_key)
+        self._raw: Optional[bytes] = None
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> Self:
+        self = cls.__new__(cls)
+        self._fields = None
+        self._raw = raw
+        return self
+
+    def _decoded(self) -> tuple[Scalar, Scalar, ComputeKey]:
+        if self._fields is None:
+            data = BytesIO(cast(bytes, self._raw))
+            self._fields = (Scalar.load(data), Scalar.load(data), ComputeKey.load(data))
+        return self._fields
+
+    @property
+    def challenge(self) -> Scalar:
+        return self._decoded()[0]
+
+    @property
+    def response(self) -> Scalar:
+        return self._decoded()[1]
+
+    @property
+    def compute_key(self) -> ComputeKey:
+        return self._decoded()[2]
 
     def dump(self) -> bytes:
-        return self.challenge.dump() + self.response.dump() + self.compute_key.dump()
+        if self._raw is None:
+            challenge, response, compute_key = self._decoded()
+            self._raw = challenge.dump() + response.dump() + compute_key.dump()
+        return self._raw
 
     @classmethod
     def load(cls, data: BytesIO):
-        challange = Scalar.load(data)
-        response = Scalar.load(data)
-        compute_key = ComputeKey.load(data)
-        return cls(challenge=challange, response=response, compute_key=compute_key)
+        return cls.from_bytes(bytes(read_run(data, cls.size, 1)))
+
+    @classmethod
+    def load_run(cls, data: BytesIO, count: int) -> list[Self]:
+        size = cls.size
+        run = bytes(read_run(data, size, count))
+        return [cls.from_bytes(run[i:i + size]) for i in range(0, size * count, size)]
 
     @classmethod
     def loads(cls, data: str):
@@ -508,5 +572,5 @@ class Data(Serializable, Generic[T]):
         if version != cls.version:
             raise ValueError(f"expected version {cls.version}, got {version}")
         size = u32.load(data)
-        value = cls.types.load(BytesIO(data.read(size)))
+        value = cls.types.load(read_nested(data, size))
         return cls(value)
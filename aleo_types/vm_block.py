@@ -312,30 +312,7 @@ class Command(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Instruction:
-            return InstructionCommand.load(data)
-        elif type_ == cls.Type.Await:
-            return AwaitCommand.load(data)
-        elif type_ == cls.Type.Contains:
-            return ContainsCommand.load(data)
-        elif type_ == cls.Type.Get:
-            return GetCommand.load(data)
-        elif type_ == cls.Type.GetOrUse:
-            return GetOrUseCommand.load(data)
-        elif type_ == cls.Type.RandChaCha:
-            return RandChaChaCommand.load(data)
-        elif type_ == cls.Type.Remove:
-            return RemoveCommand.load(data)
-        elif type_ == cls.Type.Set:
-            return SetCommand.load(data)
-        elif type_ == cls.Type.BranchEq:
-            return BranchEqCommand.load(data)
-        elif type_ == cls.Type.BranchNeq:
-            return BranchNeqCommand.load(data)
-        elif type_ == cls.Type.Position:
-            return PositionCommand.load(data)
-        else:
-            raise ValueError("Invalid variant")
+        return cls.load_variant(type_, data)
 
     def cost(self, program: Program) -> int:
         if isinstance(self, InstructionCommand):
@@ -552,12 +529,7 @@ class FinalizeType(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Plaintext:
-            return PlaintextFinalizeType.load(data)
-        elif type_ == cls.Type.Future:
-            return FutureFinalizeType.load(data)
-        else:
-            raise ValueError("Invalid variant")
+        return cls.load_variant(type_, data)
 
 class PlaintextFinalizeType(FinalizeType):
     type = FinalizeType.Type.Plaintext
@@ -652,20 +624,7 @@ class ValueType(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Constant:
-            return ConstantValueType.load(data)
-        elif type_ == cls.Type.Public:
-            return PublicValueType.load(data)
-        elif type_ == cls.Type.Private:
-            return PrivateValueType.load(data)
-        elif type_ == cls.Type.Record:
-            return RecordValueType.load(data)
-        elif type_ == cls.Type.ExternalRecord:
-            return ExternalRecordValueType.load(data)
-        elif type_ == cls.Type.Future:
-            return FutureValueType.load(data)
-        else:
-            raise ValueError("Invalid variant")
+        return cls.load_variant(type_, data)
 
 
 class ConstantValueType(ValueType):
@@ -801,13 +760,13 @@ class Function(Serializable, JSONSerialize):
         self.finalize = finalize
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.name.dump()
-        res += self.inputs.dump()
-        res += self.instructions.dump()
-        res += self.outputs.dump()
-        res += self.finalize.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.name.dump())
+        res.append(self.inputs.dump())
+        res.append(self.instructions.dump())
+        res.append(self.outputs.dump())
+        res.append(self.finalize.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -849,29 +808,35 @@ class Program(Serializable, JSONSerialize):
         self.closures = closures
         self.functions = functions
         self.identifiers = identifiers
+        # wire encoding, kept from load() or the first dump()
+        self._bytes: Optional[bytes] = None
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.id.dump()
-        res += self.imports.dump()
-        res += len(self.identifiers).to_bytes(2, "little")
+        if self._bytes is not None:
+            return self._bytes
+        res: list[bytes] = []
+        res.append(self.version.dump())
+        res.append(self.id.dump())
+        res.append(self.imports.dump())
+        res.append(len(self.identifiers).to_bytes(2, "little"))
         for i, d in self.identifiers.items():
-            res += d.dump()
+            res.append(d.dump())
             if d == ProgramDefinition.Mapping:
-                res += self.mappings[i].dump()
+                res.append(self.mappings[i].dump())
             elif d == ProgramDefinition.Struct:
-                res += self.structs[i].dump()
+                res.append(self.structs[i].dump())
             elif d == ProgramDefinition.Record:
-                res += self.records[i].dump()
+                res.append(self.records[i].dump())
             elif d == ProgramDefinition.Closure:
-                res += self.closures[i].dump()
+                res.append(self.closures[i].dump())
             elif d == ProgramDefinition.Function:
-                res += self.functions[i].dump()
-        return res
+                res.append(self.functions[i].dump())
+        self._bytes = b"".join(res)
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
+        start = data.tell()
         version = u8.load(data)
         if version != cls.version:
             raise ValueError("Invalid version")
@@ -906,8 +871,10 @@ class Program(Serializable, JSONSerialize):
                 f = Function.load(data)
                 functions[f.name] = f
                 identifiers[f.name] = d
-        return cls(id_=id_, imports=imports, mappings=mappings, structs=structs, records=records,
-                   closures=closures, functions=functions, identifiers=identifiers)
+        program = cls(id_=id_, imports=imports, mappings=mappings, structs=structs, records=records,
+                      closures=closures, functions=functions, identifiers=identifiers)
+        program._bytes = read_since(data, start)
+        return program
 
     def json(self) -> JSONType:
         res = super().json()
@@ -949,14 +916,14 @@ class CircuitInfo(Serializable):
         self.num_non_zero_c = num_non_zero_c
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.num_public_inputs.dump()
-        res += self.num_variables.dump()
-        res += self.num_constraints.dump()
-        res += self.num_non_zero_a.dump()
-        res += self.num_non_zero_b.dump()
-        res += self.num_non_zero_c.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.num_public_inputs.dump())
+        res.append(self.num_variables.dump())
+        res.append(self.num_constraints.dump())
+        res.append(self.num_non_zero_a.dump())
+        res.append(self.num_non_zero_b.dump())
+        res.append(self.num_non_zero_c.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -992,12 +959,12 @@ class KZGVerifierKey(Serializable):
         self.beta_h = beta_h
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.g.dump()
-        res += self.gamma_g.dump()
-        res += self.h.dump()
-        res += self.beta_h.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.g.dump())
+        res.append(self.gamma_g.dump())
+        res.append(self.h.dump())
+        res.append(self.beta_h.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1019,12 +986,12 @@ class SonicVerifierKey(Serializable):
         self.max_degree = max_degree
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.vk.dump()
-        res += self.degree_bounds_and_neg_powers_of_h.dump()
-        res += self.supported_degree.dump()
-        res += self.max_degree.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.vk.dump())
+        res.append(self.degree_bounds_and_neg_powers_of_h.dump())
+        res.append(self.supported_degree.dump())
+        res.append(self.max_degree.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1158,12 +1125,12 @@ class Deployment(Serializable, JSONSerialize):
         self.verifying_keys = verifying_keys
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.edition.dump()
-        res += self.program.dump()
-        res += self.verifying_keys.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.version.dump())
+        res.append(self.edition.dump())
+        res.append(self.program.dump())
+        res.append(self.verifying_keys.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1214,21 +1181,21 @@ class Commitments(Serializable):
         self.h_2 = h_2
 
     def dump(self) -> bytes:
-        res = b""
+        res: list[bytes] = []
         for witness_commitment in self.witness_commitments:
-            res += witness_commitment.dump()
-        res += self.mask_poly.dump()
-        res += self.h_0.dump()
-        res += self.g_1.dump()
-        res += self.h_1.dump()
+            res.append(witness_commitment.dump())
+        res.append(self.mask_poly.dump())
+        res.append(self.h_0.dump())
+        res.append(self.g_1.dump())
+        res.append(self.h_1.dump())
         for g_a_commitment in self.g_a_commitments:
-            res += g_a_commitment.dump()
+            res.append(g_a_commitment.dump())
         for g_b_commitment in self.g_b_commitments:
-            res += g_b_commitment.dump()
+            res.append(g_b_commitment.dump())
         for g_c_commitment in self.g_c_commitments:
-            res += g_c_commitment.dump()
-        res += self.h_2.dump()
-        return res
+            res.append(g_c_commitment.dump())
+        res.append(self.h_2.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
@@ -1272,14 +1239,14 @@ class Evaluations(Serializable):
         self.g_c_evals = g_c_evals
 
     def dump(self) -> bytes:
-        res = self.g_1_eval.dump()
+        res: list[bytes] = [self.g_1_eval.dump()]
         for g_a_eval in self.g_a_evals:
-            res += g_a_eval.dump()
+            res.append(g_a_eval.dump())
         for g_b_eval in self.g_b_evals:
-            res += g_b_eval.dump()
+            res.append(g_b_eval.dump())
         for g_c_eval in self.g_c_evals:
-            res += g_c_eval.dump()
-        return res
+            res.append(g_c_eval.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
@@ -1327,11 +1294,11 @@ class ThirdMessage(Serializable):
         self.sums = sums
 
     def dump(self) -> bytes:
-        res = b""
+        res: list[bytes] = []
         for sum_ in self.sums:
             for s in sum_:
-                res += s.dump()
-        return res
+                res.append(s.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
@@ -1353,10 +1320,10 @@ class FourthMessage(Serializable):
         self.sums = sums
 
     def dump(self) -> bytes:
-        res = b""
+        res: list[bytes] = []
         for sum_ in self.sums:
-            res += sum_.dump()
-        return res
+            res.append(sum_.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO) -> Self:
@@ -1384,15 +1351,15 @@ class Proof(Serializable, JSONSerialize):
         self.pc_proof = pc_proof
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.batch_sizes.dump()
-        res += self.commitments.dump()
-        res += self.evaluations.dump()
-        res += self.third_msg.dump()
-        res += self.fourth_msg.dump()
-        res += self.pc_proof.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.version.dump())
+        res.append(self.batch_sizes.dump())
+        res.append(self.commitments.dump())
+        res.append(self.evaluations.dump())
+        res.append(self.third_msg.dump())
+        res.append(self.fourth_msg.dump())
+        res.append(self.pc_proof.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1447,6 +1414,7 @@ class Ciphertext(Serializable, JSONSerialize):
 
 
 class Plaintext(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):  # enum
+    __slots__ = ("_bytes",)
 
     class Type(IntEnumu8):
         Literal = 0
@@ -1454,28 +1422,30 @@ class Plaintext(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):  # en
         Array = 2
 
     type: Type
+    # wire encoding, kept from load() or the first dump(); plaintexts aren't modified once built
+    _bytes: Optional[bytes]
 
     @classmethod
     def load(cls, data: BytesIO):
+        start = data.tell()
         type_ = Plaintext.Type.load(data)
-        if type_ == Plaintext.Type.Literal:
-            return LiteralPlaintext.load(data)
-        elif type_ == Plaintext.Type.Struct:
-            return StructPlaintext.load(data)
-        elif type_ == Plaintext.Type.Array:
-            return ArrayPlaintext.load(data)
-        else:
-            raise ValueError("invalid type")
+        plaintext = Plaintext.load_variant(type_, data)
+        plaintext._bytes = read_since(data, start)
+        return plaintext
 
 
 class LiteralPlaintext(Plaintext):
+    __slots__ = ("literal",)
     type = Plaintext.Type.Literal
 
     def __init__(self, *, literal: Literal):
         self.literal = literal
+        self._bytes = None
 
     def dump(self) -> bytes:
-        return self.type.dump() + self.literal.dump()
+        if self._bytes is None:
+            self._bytes = self.type.dump() + self.literal.dump()
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1504,20 +1474,25 @@ class LiteralPlaintext(Plaintext):
 
 
 class StructPlaintext(Plaintext):
+    __slots__ = ("members",)
     type = Plaintext.Type.Struct
 
     def __init__(self, *, members: Vec[Tuple[Identifier, Plaintext], u8]):
         self.members = members
+        self._bytes = None
 
     def dump(self) -> bytes:
-        res = self.type.dump()
-        res += len(self.members).to_bytes(byteorder="little")
+        if self._bytes is not None:
+            return self._bytes
+        res: list[bytes] = [self.type.dump()]
+        res.append(len(self.members).to_bytes(byteorder="little"))
         for member in self.members:
-            res += member[0].dump()  # Identifier
+            res.append(member[0].dump())  # Identifier
             num_bytes = member[1].dump()  # Plaintext
-            res += len(num_bytes).to_bytes(2, "little")
-            res += num_bytes
-        return res
+            res.append(len(num_bytes).to_bytes(2, "little"))
+            res.append(num_bytes)
+        self._bytes = b"".join(res)
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1526,7 +1501,7 @@ class StructPlaintext(Plaintext):
         for _ in range(num_members):
             identifier = Identifier.load(data)
             num_bytes = u16.load(data)
-            plaintext = Plaintext.load(BytesIO(data.read(num_bytes)))
+            plaintext = Plaintext.load(read_nested(data, num_bytes))
             members.append(Tuple[Identifier, Plaintext]((identifier, plaintext)))
         return cls(members=Vec[Tuple[Identifier, Plaintext], u8](members))
 
@@ -1643,6 +1618,7 @@ class StructPlaintext(Plaintext):
         for i, member in enumerate(self.members):
             if member[0] == identifier:
                 self.members[i] = Tuple[Identifier, Plaintext]((identifier, plaintext))
+                self._bytes = None
                 return
         raise ValueError("Identifier not found")
 
@@ -1661,19 +1637,24 @@ class StructPlaintext(Plaintext):
         return True
 
 class ArrayPlaintext(Plaintext):
+    __slots__ = ("elements",)
     type = Plaintext.Type.Array
 
     def __init__(self, *, elements: Vec[Plaintext, u32]):
         self.elements = elements
+        self._bytes = None
 
     def dump(self) -> bytes:
-        res = self.type.dump()
-        res += len(self.elements).to_bytes(4, "little")
+        if self._bytes is not None:
+            return self._bytes
+        res: list[bytes] = [self.type.dump()]
+        res.append(len(self.elements).to_bytes(4, "little"))
         for element in self.elements:
             data = element.dump()
-            res += len(data).to_bytes(2, "little")
-            res += data
-        return res
+            res.append(len(data).to_bytes(2, "little"))
+            res.append(data)
+        self._bytes = b"".join(res)
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1681,7 +1662,7 @@ class ArrayPlaintext(Plaintext):
         num_elements = u32.load(data)
         for _ in range(num_elements):
             num_bytes = u16.load(data)
-            element = Plaintext.load(BytesIO(data.read(num_bytes)))
+            element = Plaintext.load(read_nested(data, num_bytes))
             elements.append(element)
         return cls(elements=Vec[Plaintext, u32](elements))
 
@@ -1703,6 +1684,7 @@ class ArrayPlaintext(Plaintext):
 
     def __setitem__(self, key: int, value: Plaintext):
         self.elements[key] = value
+        self._bytes = None
 
     def __len__(self):
         return len(self.elements)
@@ -1938,16 +1920,16 @@ class Record(Serializable, JSONSerialize, Generic[T]):
         return GenericAlias(param_type, item)
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.owner.dump()
-        res += len(self.data).to_bytes(byteorder="little")
+        res: list[bytes] = []
+        res.append(self.owner.dump())
+        res.append(len(self.data).to_bytes(byteorder="little"))
         for identifier, entry in self.data:
-            res += identifier.dump()
+            res.append(identifier.dump())
             bytes_ = entry.dump()
-            res += len(bytes_).to_bytes(2, "little")
-            res += bytes_
-        res += self.nonce.dump()
-        return res
+            res.append(len(bytes_).to_bytes(2, "little"))
+            res.append(bytes_)
+        res.append(self.nonce.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -1958,7 +1940,7 @@ class Record(Serializable, JSONSerialize, Generic[T]):
         for _ in range(data_len):
             identifier = Identifier.load(data)
             entry_len = u16.load(data)
-            entry = Entry[Private].load(BytesIO(data.read(entry_len)))
+            entry = Entry[Private].load(read_nested(data, entry_len))
             d.append(Tuple[Identifier, Entry[T]]((identifier, entry)))
         data_ = Vec[Tuple[Identifier, Entry[T]], u8](d)
         nonce = Group.load(data)
@@ -1987,18 +1969,16 @@ class Value(EnumBaseSerialize, RustEnum, Serializable):
         Future = 2
 
     type: Type
+    # wire encoding, kept from load() or the first dump()
+    _bytes: Optional[bytes] = None
 
     @classmethod
     def load(cls, data: BytesIO):
+        start = data.tell()
         type_ = Value.Type.load(data)
-        if type_ == Value.Type.Plaintext:
-            return PlaintextValue.load(data)
-        elif type_ == Value.Type.Record:
-            return RecordValue.load(data)
-        elif type_ == Value.Type.Future:
-            return FutureValue.load(data)
-        else:
-            raise ValueError("unknown value type")
+        value = Value.load_variant(type_, data)
+        value._bytes = read_since(data, start)
+        return value
 
 
 class PlaintextValue(Value):
@@ -2008,7 +1988,9 @@ class PlaintextValue(Value):
         self.plaintext = plaintext
 
     def dump(self) -> bytes:
-        return self.type.dump() + self.plaintext.dump()
+        if self._bytes is None:
+            self._bytes = self.type.dump() + self.plaintext.dump()
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -2031,7 +2013,9 @@ class RecordValue(Value):
         self.record = record
 
     def dump(self) -> bytes:
-        return self.type.dump() + self.record.dump()
+        if self._bytes is None:
+            self._bytes = self.type.dump() + self.record.dump()
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -2040,6 +2024,7 @@ class RecordValue(Value):
 
 
 class Future(Serializable, JSONSerialize):
+    __slots__ = ("program_id", "function_name", "arguments")
 
     def __init__(self, *, program_id: ProgramID, function_name: Identifier, arguments: Vec[Argument, u8]):
         self.program_id = program_id
@@ -2064,6 +2049,7 @@ class Future(Serializable, JSONSerialize):
 
 
 class Argument(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Plaintext = 0
@@ -2074,16 +2060,12 @@ class Argument(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         size = u16.load(data)
-        data = BytesIO(data.read(size))
+        data = read_nested(data, size)
         type_ = Argument.Type.load(data)
-        if type_ == Argument.Type.Plaintext:
-            return PlaintextArgument.load(data)
-        elif type_ == Argument.Type.Future:
-            return FutureArgument.load(data)
-        else:
-            raise ValueError("unknown argument type")
+        return Argument.load_variant(type_, data)
 
 class PlaintextArgument(Argument):
+    __slots__ = ("plaintext",)
     type = Argument.Type.Plaintext
 
     def __init__(self, *, plaintext: Plaintext):
@@ -2108,6 +2090,7 @@ class PlaintextArgument(Argument):
         return str(self.plaintext)
 
 class FutureArgument(Argument):
+    __slots__ = ("future",)
     type = Argument.Type.Future
 
     def __init__(self, *, future: Future):
@@ -2138,7 +2121,9 @@ class FutureValue(Value):
         self.future = future
 
     def dump(self) -> bytes:
-        return self.type.dump() + self.future.dump()
+        if self._bytes is None:
+            self._bytes = self.type.dump() + self.future.dump()
+        return self._bytes
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -2153,6 +2138,7 @@ class FutureValue(Value):
 
 
 class TransitionInput(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Constant = 0
@@ -2166,20 +2152,10 @@ class TransitionInput(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = TransitionInput.Type.load(data)
-        if type_ == TransitionInput.Type.Constant:
-            return ConstantTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.Public:
-            return PublicTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.Private:
-            return PrivateTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.Record:
-            return RecordTransitionInput.load(data)
-        elif type_ == TransitionInput.Type.ExternalRecord:
-            return ExternalRecordTransitionInput.load(data)
-        else:
-            raise ValueError("unknown transition input type")
+        return TransitionInput.load_variant(type_, data)
 
 class ConstantTransitionInput(TransitionInput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionInput.Type.Constant
 
     def __init__(self, *, plaintext_hash: Field, plaintext: Option[Plaintext]):
@@ -2197,6 +2173,7 @@ class ConstantTransitionInput(TransitionInput):
 
 
 class PublicTransitionInput(TransitionInput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionInput.Type.Public
 
     def __init__(self, *, plaintext_hash: Field, plaintext: Option[Plaintext]):
@@ -2214,6 +2191,7 @@ class PublicTransitionInput(TransitionInput):
 
 
 class PrivateTransitionInput(TransitionInput):
+    __slots__ = ("ciphertext_hash", "ciphertext")
     type = TransitionInput.Type.Private
 
     def __init__(self, *, ciphertext_hash: Field, ciphertext: Option[Ciphertext]):
@@ -2231,6 +2209,7 @@ class PrivateTransitionInput(TransitionInput):
 
 
 class RecordTransitionInput(TransitionInput):
+    __slots__ = ("serial_number", "tag")
     type = TransitionInput.Type.Record
 
     def __init__(self, *, serial_number: Field, tag: Field):
@@ -2248,6 +2227,7 @@ class RecordTransitionInput(TransitionInput):
 
 
 class ExternalRecordTransitionInput(TransitionInput):
+    __slots__ = ("input_commitment",)
     type = TransitionInput.Type.ExternalRecord
 
     def __init__(self, *, input_commitment: Field):
@@ -2263,6 +2243,7 @@ class ExternalRecordTransitionInput(TransitionInput):
 
 
 class TransitionOutput(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
+    __slots__ = ()
 
     class Type(IntEnumu8):
         Constant = 0
@@ -2277,23 +2258,11 @@ class TransitionOutput(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize)
     @classmethod
     def load(cls, data: BytesIO):
         type_ = TransitionOutput.Type.load(data)
-        if type_ == TransitionOutput.Type.Constant:
-            return ConstantTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Public:
-            return PublicTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Private:
-            return PrivateTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Record:
-            return RecordTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.ExternalRecord:
-            return ExternalRecordTransitionOutput.load(data)
-        elif type_ == TransitionOutput.Type.Future:
-            return FutureTransitionOutput.load(data)
-        else:
-            raise ValueError("unknown transition output type")
+        return TransitionOutput.load_variant(type_, data)
 
 
 class ConstantTransitionOutput(TransitionOutput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionOutput.Type.Constant
 
     def __init__(self, *, plaintext_hash: Field, plaintext: Option[Plaintext]):
@@ -2311,6 +2280,7 @@ class ConstantTransitionOutput(TransitionOutput):
 
 
 class PublicTransitionOutput(TransitionOutput):
+    __slots__ = ("plaintext_hash", "plaintext")
     type = TransitionOutput.Type.Public
 
     def __init__(self, *, plaintext_hash: Field, plaintext: Option[Plaintext]):
@@ -2328,6 +2298,7 @@ class PublicTransitionOutput(TransitionOutput):
 
 
 class PrivateTransitionOutput(TransitionOutput):
+    __slots__ = ("ciphertext_hash", "ciphertext")
     type = TransitionOutput.Type.Private
 
     def __init__(self, *, ciphertext_hash: Field, ciphertext: Option[Ciphertext]):
@@ -2345,6 +2316,7 @@ class PrivateTransitionOutput(TransitionOutput):
 
 
 class RecordTransitionOutput(TransitionOutput):
+    __slots__ = ("commitment", "checksum", "record_ciphertext")
     type = TransitionOutput.Type.Record
 
     def __init__(self, *, commitment: Field, checksum: Field, record_ciphertext: Option[Record[Ciphertext]]):
@@ -2364,6 +2336,7 @@ class RecordTransitionOutput(TransitionOutput):
 
 
 class ExternalRecordTransitionOutput(TransitionOutput):
+    __slots__ = ("commitment",)
     type = TransitionOutput.Type.ExternalRecord
 
     def __init__(self, *, commitment: Field):
@@ -2378,6 +2351,7 @@ class ExternalRecordTransitionOutput(TransitionOutput):
         return cls(commitment=commitment)
 
 class FutureTransitionOutput(TransitionOutput):
+    __slots__ = ("future_hash", "future")
     type = TransitionOutput.Type.Future
 
     def __init__(self, *, future_hash: Field, future: Option[Future]):
@@ -2395,6 +2369,7 @@ class FutureTransitionOutput(TransitionOutput):
 
 
 class Transition(Serializable, JSONSerialize):
+    __slots__ = ("id", "program_id", "function_name", "inputs", "outputs", "tpk", "tcm", "scm")
     version = u8(1)
 
     def __init__(self, *, id_: TransitionID, program_id: ProgramID, function_name: Identifier,
@@ -2410,17 +2385,17 @@ class Transition(Serializable, JSONSerialize):
         self.scm = scm
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.id.dump()
-        res += self.program_id.dump()
-        res += self.function_name.dump()
-        res += self.inputs.dump()
-        res += self.outputs.dump()
-        res += self.tpk.dump()
-        res += self.tcm.dump()
-        res += self.scm.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.version.dump())
+        res.append(self.id.dump())
+        res.append(self.program_id.dump())
+        res.append(self.function_name.dump())
+        res.append(self.inputs.dump())
+        res.append(self.outputs.dump())
+        res.append(self.tpk.dump())
+        res.append(self.tcm.dump())
+        res.append(self.scm.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -2448,12 +2423,12 @@ class Fee(Serializable, JSONSerialize):
         self.proof = proof
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.transition.dump()
-        res += self.global_state_root.dump()
-        res += self.proof.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.version.dump())
+        res.append(self.transition.dump())
+        res.append(self.global_state_root.dump())
+        res.append(self.proof.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -2505,12 +2480,12 @@ class Execution(Serializable, JSONSerialize):
         self.proof = proof
 
     def dump(self) -> bytes:
-        res = b""
-        res += self.version.dump()
-        res += self.transitions.dump()
-        res += self.global_state_root.dump()
-        res += self.proof.dump()
-        return res
+        res: list[bytes] = []
+        res.append(self.version.dump())
+        res.append(self.transitions.dump())
+        res.append(self.global_state_root.dump())
+        res.append(self.proof.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -2575,14 +2550,7 @@ class Transaction(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
         type_ = cls.Type.load(data)
         if version != cls.version:
             raise ValueError("incorrect version")
-        if type_ == cls.Type.Deploy:
-            return DeployTransaction.load(data)
-        elif type_ == cls.Type.Execute:
-            return ExecuteTransaction.load(data)
-        elif type_ == cls.Type.Fee:
-            return FeeTransaction.load(data)
-        else:
-            raise ValueError("incorrect type")
+        return cls.load_variant(type_, data)
 
     async def get_fee_breakdown(self, db: "Database") -> FeeComponent:
         if isinstance(self, DeployTransaction):
@@ -2702,20 +2670,7 @@ class FinalizeOperation(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.InitializeMapping:
-            return InitializeMapping.load(data)
-        elif type_ == cls.Type.InsertKeyValue:
-            return InsertKeyValue.load(data)
-        elif type_ == cls.Type.UpdateKeyValue:
-            return UpdateKeyValue.load(data)
-        elif type_ == cls.Type.RemoveKeyValue:
-            return RemoveKeyValue.load(data)
-        elif type_ == cls.Type.ReplaceMapping:
-            return ReplaceMapping.load(data)
-        elif type_ == cls.Type.RemoveMapping:
-            return RemoveMapping.load(data)
-        else:
-            raise ValueError("incorrect type")
+        return cls.load_variant(type_, data)
 
 class ConfirmedTransaction(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     class Type(IntEnumu8):
@@ -2732,16 +2687,7 @@ class ConfirmedTransaction(EnumBaseSerialize, RustEnum, Serializable, JSONSerial
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.AcceptedDeploy:
-            return AcceptedDeploy.load(data)
-        elif type_ == cls.Type.AcceptedExecute:
-            return AcceptedExecute.load(data)
-        elif type_ == cls.Type.RejectedDeploy:
-            return RejectedDeploy.load(data)
-        elif type_ == cls.Type.RejectedExecute:
-            return RejectedExecute.load(data)
-        else:
-            raise ValueError("incorrect type")
+        return cls.load_variant(type_, data)
 
     async def get_fee_breakdown(self, db: "Database") -> FeeComponent:
         """
@@ -2946,12 +2892,7 @@ class Rejected(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Deployment:
-            return RejectedDeployment.load(data)
-        elif type_ == cls.Type.Execution:
-            return RejectedExecution.load(data)
-        else:
-            raise ValueError("Invalid Rejected Type")
+        return cls.load_variant(type_, data)
 
 class RejectedDeployment(Rejected):
     type = Rejected.Type.Deployment
@@ -3165,6 +3106,7 @@ class PartialSolution(Serializable, JSONSerialize):
 
 
 class Solution(Serializable, JSONSerialize):
+    __slots__ = ("partial_solution", "target")
 
     def __init__(self, *, partial_solution: PartialSolution, target: u64):
         self.partial_solution = partial_solution
@@ -3209,14 +3151,7 @@ class Ratify(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
         if version != cls.version:
             raise ValueError(f"invalid version {version}")
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Genesis:
-            return GenesisRatify.load(data)
-        elif type_ == cls.Type.BlockReward:
-            return BlockRewardRatify.load(data)
-        elif type_ == cls.Type.PuzzleReward:
-            return PuzzleRewardRatify.load(data)
-        else:
-            raise ValueError(f"invalid ratify type {type_}")
+        return cls.load_variant(type_, data)
 
 class Committee(Serializable, JSONSerialize):
     version = u8(1)
@@ -3326,12 +3261,7 @@ class Authority(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Beacon:
-            return BeaconAuthority.load(data)
-        elif type_ == cls.Type.Quorum:
-            return QuorumAuthority.load(data)
-        else:
-            raise ValueError("incorrect type")
+        return cls.load_variant(type_, data)
 
 
 class BeaconAuthority(Authority):
@@ -3361,14 +3291,7 @@ class TransmissionID(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Ratification:
-            return RatificationTransmissionID.load(data)
-        elif type_ == cls.Type.Solution:
-            return SolutionTransmissionID.load(data)
-        elif type_ == cls.Type.Transaction:
-            return TransactionTransmissionID.load(data)
-        else:
-            raise ValueError("incorrect type")
+        return cls.load_variant(type_, data)
 
 
 class RatificationTransmissionID(TransmissionID):
@@ -3442,6 +3365,7 @@ class TransactionTransmissionID(TransmissionID):
 
 
 class BatchHeader(Serializable, JSONSerialize):
+    __slots__ = ("batch_id", "author", "round", "timestamp", "committee_id", "transmission_ids", "previous_certificate_ids", "signature")
     version = u8(1)
 
     def __init__(self, *, batch_id: Field, author: Address, round_: u64, timestamp: i64, committee_id: Field,
@@ -3506,11 +3430,11 @@ class Subdag(Serializable, JSONSerialize):
         self.subdag = subdag
 
     def dump(self) -> bytes:
-        res = self.version.dump()
-        res += len(self.subdag).to_bytes(4, 'little')
+        res: list[bytes] = [self.version.dump()]
+        res.append(len(self.subdag).to_bytes(4, 'little'))
         for round_, certificates in self.subdag.items():
-            res += round_.dump() + certificates.dump()
-        return res
+            res.append(round_.dump() + certificates.dump())
+        return b"".join(res)
 
     @classmethod
     def load(cls, data: BytesIO):
@@ -3690,4 +3614,125 @@ class Block(Serializable, JSONSerialize):
         total = 0
         for fee in fees:
             total += fee.burnt + fee.storage_cost + fee.namespace_cost + sum(fee.finalize_costs)
-        return total
\ No newline at end of file
+        return total
+
+class LazyBlock(Block):
+    """
+    Block decoded from a standalone buffer, with the hashes and header read up front and the remaining sections on
+    first access. Sections aren't length prefixed, so reaching a later section also decodes the ones before it.
+
+    Good for callers that mostly need the header, like the genesis blocks every process loads at startup.
+    """
+
+    _section_types: tuple[type[Serializable], ...] = (Authority, Ratifications, Solutions, Vec[SolutionID, u32],
+                                                     Transactions, Vec[TransactionID, u32])
+
+    def __init__(self, *, raw: bytes, block_hash: BlockHash, previous_hash: BlockHash, header: BlockHeader,
+                 offset: int):
+        self.block_hash = block_hash
+        self.previous_hash = previous_hash
+        self.header = header
+        self._raw = raw
+        self._offset = offset
+        self._sections: list[Any] = []
+        self._modified = False
+
+    def _section(self, index: int) -> Any:
+        sections = self._sections
+        if index < len(sections):
+            return sections[index]
+        data = ViewReader(self._raw)
+        data.offset = self._offset
+        while len(sections) <= index:
+            sections.append(self._section_types[len(sections)].load(cast(BytesIO, data)))
+        self._offset = data.offset
+        if index == len(self._section_types) - 1 and data.offset != len(self._raw):
+            raise ValueError("trailing data after block")
+        return sections[index]
+
+    def _set_section(self, index: int, value: Any):
+        self._section(len(self._section_types) - 1)
+        self._sections[index] = value
+        self._modified = True
+
+    @property
+    def authority(self) -> Authority:
+        return self._section(0)
+
+    @authority.setter
+    def authority(self, value: Authority):
+        self._set_section(0, value)
+
+    @property
+    def ratifications(self) -> Ratifications:
+        return self._section(1)
+
+    @ratifications.setter
+    def ratifications(self, value: Ratifications):
+        self._set_section(1, value)
+
+    @property
+    def solutions(self) -> Solutions:
+        return self._section(2)
+
+    @solutions.setter
+    def solutions(self, value: Solutions):
+        self._set_section(2, value)
+
+    @property
+    def aborted_solution_ids(self) -> Vec[SolutionID, u32]:
+        return self._section(3)
+
+    @aborted_solution_ids.setter
+    def aborted_solution_ids(self, value: Vec[SolutionID, u32]):
+        self._set_section(3, value)
+
+    @property
+    def transactions(self) -> Transactions:
+        return self._section(4)
+
+    @transactions.setter
+    def transactions(self, value: Transactions):
+        self._set_section(4, value)
+
+    @property
+    def aborted_transactions_ids(self) -> Vec[TransactionID, u32]:
+        return self._section(5)
+
+    @aborted_transactions_ids.setter
+    def aborted_transactions_ids(self, value: Vec[TransactionID, u32]):
+        self._set_section(5, value)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "LazyBlock":
+        data = ViewReader(raw)
+        version = u8.load(cast(BytesIO, data))
+        if version != cls.version:
+            raise ValueError("invalid block version")
+        block_hash = BlockHash.load(cast(BytesIO, data))
+        previous_hash = BlockHash.load(cast(BytesIO, data))
+        header = BlockHeader.load(cast(BytesIO, data))
+        return cls(raw=bytes(raw), block_hash=block_hash, previous_hash=previous_hash, header=header,
+                   offset=data.offset)
+
+    @classmethod
+    def load(cls, data: BytesIO):
+        # the block has to be the rest of the buffer, as its end is only known once every section is decoded
+        return cls.from_bytes(data.read())
+
+    def decode(self) -> Block:
+        return Block(block_hash=self.block_hash, previous_hash=self.previous_hash, header=self.header,
+                     authority=self.authority, ratifications=self.ratifications, solutions=self.solutions,
+                     aborted_solution_ids=self.aborted_solution_ids, transactions=self.transactions,
+                     aborted_transactions_ids=self.aborted_transactions_ids)
+
+    def dump(self) -> bytes:
+        if self._modified:
+            return super().dump()
+        return self._raw
+
+    def json(self) -> JSONType:
+        return self.decode().json()
+
+    def __reduce__(self):
+        return LazyBlock.from_bytes, (self.dump(),)
@@ -34,6 +34,7 @@ class StringType(Serializable):
         return self.string
 
 class Literal(Serializable, JSONSerialize): # enum
+    __slots__ = ("type", "primitive")
 
     class Type(IntEnumu16):
         Address = 0
@@ -272,12 +273,7 @@ class Register(EnumBaseSerialize, Serialize, JSONSerialize, RustEnum):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Locator:
-            return LocatorRegister.load(data)
-        elif type_ == cls.Type.Access:
-            return AccessRegister.load(data)
-        else:
-            raise ValueError(f"Invalid register type {type_}")
+        return cls.load_variant(type_, data)
 
 
 class LocatorRegister(Register):
@@ -304,12 +300,7 @@ class Access(EnumBaseSerialize, Serialize, JSONSerialize, RustEnum):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Member:
-            return MemberAccess.load(data)
-        elif type_ == cls.Type.Index:
-            return IndexAccess.load(data)
-        else:
-            raise ValueError("unknown access type")
+        return cls.load_variant(type_, data)
 
 class MemberAccess(Access):
     type = Access.Type.Member
@@ -372,22 +363,7 @@ class Operand(EnumBaseSerialize, Serialize, JSONSerialize, RustEnum):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Literal:
-            return LiteralOperand.load(data)
-        elif type_ == cls.Type.Register:
-            return RegisterOperand.load(data)
-        elif type_ == cls.Type.ProgramID:
-            return ProgramIDOperand.load(data)
-        elif type_ == cls.Type.Signer:
-            return SignerOperand.load(data)
-        elif type_ == cls.Type.Caller:
-            return CallerOperand.load(data)
-        elif type_ == cls.Type.BlockHeight:
-            return BlockHeightOperand.load(data)
-        elif type_ == cls.Type.NetworkID:
-            return NetworkIDOperand.load(data)
-        else:
-            raise ValueError("unknown operand type")
+        return cls.load_variant(type_, data)
 
 class LiteralOperand(Operand):
     type = Operand.Type.Literal
@@ -582,12 +558,7 @@ class CallOperator(EnumBaseSerialize, RustEnum, Serializable, JSONSerialize):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Locator:
-            return LocatorCallOperator.load(data)
-        elif type_ == cls.Type.Resource:
-            return ResourceCallOperator.load(data)
-        else:
-            raise ValueError("unknown call operator type")
+        return cls.load_variant(type_, data)
 
 
 class LocatorCallOperator(CallOperator):
@@ -716,13 +687,7 @@ class PlaintextType(EnumBaseSerialize, Serialize, JSONSerialize, RustEnum):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Literal:
-            return LiteralPlaintextType.load(data)
-        if type_ == cls.Type.Struct:
-            return StructPlaintextType.load(data)
-        if type_ == cls.Type.Array:
-            return ArrayPlaintextType.load(data)
-        raise ValueError("unknown type")
+        return cls.load_variant(type_, data)
 
     size_in_bytes: Callable[["Program"], int]
 
@@ -853,14 +818,7 @@ class RegisterType(EnumBaseSerialize, Serialize, JSONSerialize, RustEnum):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.Plaintext:
-            return PlaintextRegisterType.load(data)
-        elif type_ == cls.Type.Record:
-            return RecordRegisterType.load(data)
-        elif type_ == cls.Type.ExternalRecord:
-            return ExternalRecordRegisterType.load(data)
-        else:
-            raise ValueError(f"Invalid register type {type_}")
+        return cls.load_variant(type_, data)
 
 
 class PlaintextRegisterType(RegisterType):
@@ -919,18 +877,7 @@ class CastType(EnumBaseSerialize, Serialize, JSONSerialize, RustEnum):
     @classmethod
     def load(cls, data: BytesIO):
         type_ = cls.Type.load(data)
-        if type_ == cls.Type.GroupXCoordinate:
-            return GroupXCoordinateCastType.load(data)
-        elif type_ == cls.Type.GroupYCoordinate:
-            return GroupYCoordinateCastType.load(data)
-        elif type_ == cls.Type.Plaintext:
-            return PlaintextCastType.load(data)
-        elif type_ == cls.Type.Record:
-            return RecordCastType.load(data)
-        elif type_ == cls.Type.ExternalRecord:
-            return ExternalRecordCastType.load(data)
-        else:
-            raise ValueError(f"Invalid cast type {type_}")
+        return cls.load_variant(type_, data)
 
 class GroupXCoordinateCastType(CastType):
     type = CastType.Type.GroupXCoordinate
@@ -19,9 +19,9 @@ from middleware.api_filter import APIFilterMiddleware
 from middleware.api_quota import APIQuotaMiddleware
 from middleware.asgi_logger import AccessLoggerMiddleware
 from middleware.server_timing import ServerTimingMiddleware
-from util.cache import Cache
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from util.global_cache import global_mapping_cache
 from util.set_proc_title import set_proc_title
 from .execute_routes import preview_finalize_route
 from .mapping_routes import mapping_route, mapping_list_route, mapping_value_list_route, mapping_key_count_route
@@ -88,7 +88,9 @@ async def startup():
                   message_callback=noop)
     await db.connect()
     app.state.db = db
-    app.state.program_cache = Cache()
+    app.state.hot_block_task = asyncio.create_task(db.run_hot_block_cache())
+    # nothing is written from here, so the mapping cache can be trimmed right away
+    global_mapping_cache.trim_on_insert = True
     app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
     set_proc_title("aleo-explorer: api")
 
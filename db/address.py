@@ -3,6 +3,9 @@ from __future__ import annotations
 
 import time
 
+import psycopg
+from psycopg.rows import DictRow
+
 from aleo_types import *
 from db.block import DatabaseBlock
 from explorer.types import Message as ExplorerMessage
@@ -293,119 +296,76 @@ LIMIT 10
             return None
         return int(data)
 
-    async def get_address_speed(self, address: str) -> tuple[float, int]: # (speed, interval)
+    @staticmethod
+    async def get_window_work(cur: psycopg.AsyncCursor[DictRow], start: int, end: Optional[int] = None,
+                               address: Optional[str] = None) -> tuple[int, Decimal]:
+        """
+        Solution count and work of the blocks with start <= timestamp < end, or with start <= timestamp if end is None,
+        for the whole network or one prover. A solution's work is the proof target of the block before the one that
+        includes it. Read as the difference of two running totals kept in block_work and prover_work at ingest, so the
+        cost doesn't depend on the length of the window.
+        """
+        if address is None:
+            query, params = "SELECT cumulative_solution_count, cumulative_work FROM block_work WHERE TRUE", []
+        else:
+            query, params = "SELECT cumulative_solution_count, cumulative_work FROM prover_work WHERE address = %s", [address]
+        totals: list[tuple[int, Decimal]] = []
+        for before in (end, start):
+            if before is None:
+                await cur.execute(query + " ORDER BY timestamp DESC LIMIT 1", params)
+            else:
+                await cur.execute(query + " AND timestamp < %s ORDER BY timestamp DESC LIMIT 1", params + [before])
+            if (res := await cur.fetchone()) is None:
+                totals.append((0, Decimal(0)))
+            else:
+                totals.append((res["cumulative_solution_count"], res["cumulative_work"]))
+        return totals[0][0] - totals[1][0], totals[0][1] - totals[1][1]
+
+    async def get_address_speed(self, address: str) -> tuple[Decimal, int]: # (speed, interval)
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 interval_list = [900, 1800, 3600, 14400, 43200, 86400]
                 now = int(time.time())
                 try:
                     for interval in interval_list:
-                        await cur.execute(
-                            "SELECT b.height FROM solution s "
-                            "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                            "JOIN block b ON ps.block_id = b.id "
-                            "WHERE address = %s AND timestamp > %s",
-                            (address, now - interval)
-                        )
-                        partial_solutions = await cur.fetchall()
-                        if len(partial_solutions) < 10 and interval != 86400:
+                        solution_count, work = await DatabaseAddress.get_window_work(cur, now - interval + 1, address=address)
+                        if solution_count < 10 and interval != 86400:
                             continue
-                        heights = list(map(lambda x: x['height'], partial_solutions))
-                        ref_heights = list(map(lambda x: x - 1, set(heights)))
-                        await cur.execute(
-                            "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                        )
-                        ref_proof_targets = await cur.fetchall()
-                        ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                        total_solutions = 0
-                        for height in heights:
-                            total_solutions += ref_proof_target_dict[height - 1]
-                        return total_solutions / interval, interval
-                    return 0, 0
+                        return work / interval, interval
+                    return Decimal(0), 0
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def get_address_interval_speed(self, address: str, interval: int) -> float:
+    async def get_address_interval_speed(self, address: str, interval: int) -> Decimal:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 now = int(time.time())
                 try:
-                    await cur.execute(
-                        "SELECT b.height FROM solution s "
-                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE address = %s AND timestamp > %s",
-                        (address, now - interval)
-                    )
-                    partial_solutions = await cur.fetchall()
-                    heights = list(map(lambda x: x['height'], partial_solutions))
-                    ref_heights = list(map(lambda x: x - 1, set(heights)))
-                    await cur.execute(
-                        "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                    )
-                    ref_proof_targets = await cur.fetchall()
-                    ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                    total_solutions = 0
-                    for height in heights:
-                        total_solutions += ref_proof_target_dict[height - 1]
-                    return total_solutions / interval
+                    _, work = await DatabaseAddress.get_window_work(cur, now - interval + 1, address=address)
+                    return work / interval
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
         
 
-    async def get_network_speed(self, interval: int) -> float:
+    async def get_network_speed(self, interval: int) -> Decimal:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 now = int(time.time())
                 try:
-                    await cur.execute(
-                        "SELECT b.height FROM solution s "
-                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE timestamp > %s",
-                        (now - interval,)
-                    )
-                    partial_solutions = await cur.fetchall()
-                    heights = list(map(lambda x: x['height'], partial_solutions))
-                    ref_heights = list(map(lambda x: x - 1, set(heights)))
-                    await cur.execute(
-                        "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                    )
-                    ref_proof_targets = await cur.fetchall()
-                    ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                    total_solutions = 0
-                    for height in heights:
-                        total_solutions += ref_proof_target_dict[height - 1]
-                    return total_solutions / interval
+                    _, work = await DatabaseAddress.get_window_work(cur, now - interval + 1)
+                    return work / interval
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def get_network_interval_speed(self, interval_start: int, interval_end: int) -> float:
+    async def get_network_interval_speed(self, interval_start: int, interval_end: int) -> Decimal:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
-                    await cur.execute(
-                        "SELECT b.height FROM solution s "
-                        "JOIN puzzle_solution ps ON s.puzzle_solution_id = ps.id "
-                        "JOIN block b ON ps.block_id = b.id "
-                        "WHERE timestamp >= %s AND timestamp < %s",
-                        (interval_start, interval_end)
-                    )
-                    partial_solutions = await cur.fetchall()
-                    heights = list(map(lambda x: x['height'], partial_solutions))
-                    ref_heights = list(map(lambda x: x - 1, set(heights)))
-                    await cur.execute(
-                        "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                    )
-                    ref_proof_targets = await cur.fetchall()
-                    ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                    total_solutions = 0
-                    for height in heights:
-                        total_solutions += ref_proof_target_dict[height - 1]
-                    return total_solutions / (interval_end - interval_start)
+                    _, work = await DatabaseAddress.get_window_work(cur, interval_start, interval_end)
+                    return work / (interval_end - interval_start)
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
@@ -517,31 +477,14 @@ LIMIT 10
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def get_address_15min_speed(self, address: str) -> float: # (speed, interval)
+    async def get_address_15min_speed(self, address: str) -> Decimal: # (speed, interval)
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 interval = 900
                 now = int(time.time())
                 try:
-                    await cur.execute(
-                        "SELECT b.height FROM solution s "
-                        "JOIN puzzle_solution ps ON ps.id = s.puzzle_solution_id "
-                        "JOIN block b ON b.id = ps.block_id "
-                        "WHERE address = %s AND timestamp > %s",
-                        (address, now - interval)
-                    )
-                    prover_solutions = await cur.fetchall()
-                    heights = list(map(lambda x: x['height'], prover_solutions))
-                    ref_heights = list(map(lambda x: x - 1, set(heights)))
-                    await cur.execute(
-                        "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                    )
-                    ref_proof_targets = await cur.fetchall()
-                    ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                    total_solutions = 0
-                    for height in heights:
-                        total_solutions += ref_proof_target_dict[height - 1]
-                    return total_solutions / interval
+                    _, work = await DatabaseAddress.get_window_work(cur, now - interval + 1, address=address)
+                    return work / interval
                 except Exception as e:
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
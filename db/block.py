@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
 
 import psycopg
 import psycopg.sql
 from psycopg.rows import DictRow
 import time
+import zlib
 
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
 from node import Network
+from util.global_cache import HotBlockCache, clear_local_program_caches, global_hot_blocks, program_cache_channel
 from .base import DatabaseBase, profile
 
 
@@ -40,149 +43,206 @@ class DatabaseBlock(DatabaseBase):
 
     @staticmethod
     @profile
-    async def _load_future(conn: psycopg.AsyncConnection[DictRow], transition_output_db_id: Optional[int],
-                           future_argument_db_id: Optional[int]) -> Optional[Future]:
+    async def _load_futures(conn: psycopg.AsyncConnection[DictRow], transition_output_future_ids: list[int]) -> dict[int, Future]:
+        """
+        Futures of the given transition_output_future rows by row id. Argument futures are fetched one nesting level
+        at a time, so the number of queries depends on the nesting depth instead of the number of futures.
+        """
+        futures: dict[int, dict[str, Any]] = {}
+        arguments: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        output_futures: dict[int, int] = {}
+        argument_futures: dict[int, int] = {}
+        if not transition_output_future_ids:
+            return {}
         async with conn.cursor() as cur:
-            if transition_output_db_id:
+            await cur.execute(
+                "SELECT id, transition_output_future_id, program_id, function_name FROM future WHERE type = 'Output' AND "
+                "transition_output_future_id = ANY(%s)",
+                (transition_output_future_ids,)
+            )
+            rows = await cur.fetchall()
+            for res in rows:
+                output_futures[res["transition_output_future_id"]] = res["id"]
+            while rows:
+                for res in rows:
+                    futures[res["id"]] = res
                 await cur.execute(
-                    "SELECT id, program_id, function_name FROM future WHERE type = 'Output' AND "
-                    "transition_output_future_id = %s",
-                    (transition_output_db_id,)
+                    "SELECT id, future_id, type, plaintext FROM future_argument WHERE future_id = ANY(%s) ORDER BY id",
+                    ([res["id"] for res in rows],)
                 )
-            elif future_argument_db_id:
+                nested_argument_ids: list[int] = []
+                for res in await cur.fetchall():
+                    arguments[res["future_id"]].append(res)
+                    if res["type"] == "Future":
+                        nested_argument_ids.append(res["id"])
+                if not nested_argument_ids:
+                    break
                 await cur.execute(
-                    "SELECT id, program_id, function_name FROM future WHERE type = 'Argument' AND "
-                    "future_argument_id = %s",
-                    (future_argument_db_id,)
+                    "SELECT id, future_argument_id, program_id, function_name FROM future WHERE type = 'Argument' AND "
+                    "future_argument_id = ANY(%s)",
+                    (nested_argument_ids,)
                 )
-            else:
-                raise ValueError("transition_output_db_id or future_argument_db_id must be set")
-            if (res := await cur.fetchone()) is None:
-                if transition_output_db_id:
-                    return None
-                raise RuntimeError("failed to insert row into database")
-            future_db_id = res["id"]
-            program_id = res["program_id"]
-            function_name = res["function_name"]
-            await cur.execute(
-                "SELECT id, type, plaintext FROM future_argument WHERE future_id = %s ORDER BY id",
-                (future_db_id,)
-            )
-            arguments: list[Argument] = []
-            for res in await cur.fetchall():
+                rows = await cur.fetchall()
+                for res in rows:
+                    argument_futures[res["future_argument_id"]] = res["id"]
+
+        def build(future_db_id: int) -> Future:
+            future = futures[future_db_id]
+            args: list[Argument] = []
+            for res in arguments[future_db_id]:
                 if res["type"] == "Plaintext":
-                    arguments.append(PlaintextArgument(
+                    args.append(PlaintextArgument(
                         plaintext=Plaintext.load(BytesIO(res["plaintext"]))
                     ))
                 elif res["type"] == "Future":
-                    arguments.append(FutureArgument(
-                        future=await DatabaseBlock._load_future(conn, None, res["id"]) # type: ignore
+                    if res["id"] not in argument_futures:
+                        raise RuntimeError("failed to insert row into database")
+                    args.append(FutureArgument(
+                        future=build(argument_futures[res["id"]])
                     ))
                 else:
                     raise NotImplementedError
             return Future(
-                program_id=ProgramID.loads(program_id),
-                function_name=Identifier.loads(function_name),
-                arguments=Vec[Argument, u8](arguments)
+                program_id=ProgramID.loads(future["program_id"]),
+                function_name=Identifier.loads(future["function_name"]),
+                arguments=Vec[Argument, u8](args)
             )
 
+        return {output_id: build(future_db_id) for output_id, future_db_id in output_futures.items()}
+
     @staticmethod
     @profile
-    async def _get_transition_from_dict(transition: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]):
+    async def _get_transitions_from_dicts(transitions: list[dict[str, Any]], conn: psycopg.AsyncConnection[DictRow]) -> dict[int, Transition]:
+        """Transitions of the given transition rows by row id, reading the input and output tables once for all of them."""
+        if not transitions:
+            return {}
+        transition_db_ids = [transition["id"] for transition in transitions]
         async with conn.cursor() as cur:
-            await cur.execute("SELECT * FROM get_transition_inputs(%s)", (transition["id"],))
+            await cur.execute(
+                "SELECT i.transition_id, i.type, i.index, pu.plaintext_hash, pu.plaintext, pr.ciphertext_hash, pr.ciphertext, "
+                "r.serial_number, r.tag, e.commitment "
+                "FROM transition_input i "
+                "LEFT JOIN transition_input_public pu ON pu.transition_input_id = i.id "
+                "LEFT JOIN transition_input_private pr ON pr.transition_input_id = i.id "
+                "LEFT JOIN transition_input_record r ON r.transition_input_id = i.id "
+                "LEFT JOIN transition_input_external_record e ON e.transition_input_id = i.id "
+                "WHERE i.transition_id = ANY(%s)",
+                (transition_db_ids,)
+            )
             transition_inputs = await cur.fetchall()
-            tis: list[tuple[TransitionInput, int]] = []
-            for transition_input in transition_inputs:
-                if transition_input["type"] == TransitionInput.Type.Public.name:
-                    if transition_input["plaintext"] is None:
-                        plaintext = None
-                    else:
-                        plaintext = Plaintext.load(BytesIO(transition_input["plaintext"]))
-                    tis.append((PublicTransitionInput(
-                        plaintext_hash=Field.loads(transition_input["plaintext_hash"]),
-                        plaintext=Option[Plaintext](plaintext)
-                    ), transition_input["index"]))
-                elif transition_input["type"] == TransitionInput.Type.Private.name:
-                    if transition_input["ciphertext"] is None:
-                        ciphertext = None
-                    else:
-                        ciphertext = Ciphertext.loads(transition_input["ciphertext"])
-                    tis.append((PrivateTransitionInput(
-                        ciphertext_hash=Field.loads(transition_input["ciphertext_hash"]),
-                        ciphertext=Option[Ciphertext](ciphertext)
-                    ), transition_input["index"]))
-                elif transition_input["type"] == TransitionInput.Type.Record.name:
-                    tis.append((RecordTransitionInput(
-                        serial_number=Field.loads(transition_input["serial_number"]),
-                        tag=Field.loads(transition_input["tag"])
-                    ), transition_input["index"]))
-                elif transition_input["type"] == TransitionInput.Type.ExternalRecord.name:
-                    tis.append((ExternalRecordTransitionInput(
-                        input_commitment=Field.loads(transition_input["commitment"]),
-                    ), transition_input["index"]))
+            await cur.execute(
+                "SELECT o.transition_id, o.type, o.index, pu.plaintext_hash, pu.plaintext, pr.ciphertext_hash, pr.ciphertext, "
+                "r.commitment as record_commitment, r.checksum, r.record_ciphertext, "
+                "e.commitment as external_record_commitment, f.id as future_id, f.future_hash "
+                "FROM transition_output o "
+                "LEFT JOIN transition_output_public pu ON pu.transition_output_id = o.id "
+                "LEFT JOIN transition_output_private pr ON pr.transition_output_id = o.id "
+                "LEFT JOIN transition_output_record r ON r.transition_output_id = o.id "
+                "LEFT JOIN transition_output_external_record e ON e.transition_output_id = o.id "
+                "LEFT JOIN transition_output_future f ON f.transition_output_id = o.id "
+                "WHERE o.transition_id = ANY(%s)",
+                (transition_db_ids,)
+            )
+            transition_outputs = await cur.fetchall()
+        futures = await DatabaseBlock._load_futures(
+            conn, [x["future_id"] for x in transition_outputs if x["future_id"] is not None]
+        )
+
+        tis: dict[int, list[tuple[TransitionInput, int]]] = defaultdict(list)
+        for transition_input in transition_inputs:
+            if transition_input["type"] == TransitionInput.Type.Public.name:
+                if transition_input["plaintext"] is None:
+                    plaintext = None
                 else:
-                    raise NotImplementedError
-            tis.sort(key=lambda x: x[1])
-            transition_inputs = [x[0] for x in tis]
+                    plaintext = Plaintext.load(BytesIO(transition_input["plaintext"]))
+                ti = PublicTransitionInput(
+                    plaintext_hash=Field.loads(transition_input["plaintext_hash"]),
+                    plaintext=Option[Plaintext](plaintext)
+                )
+            elif transition_input["type"] == TransitionInput.Type.Private.name:
+                if transition_input["ciphertext"] is None:
+                    ciphertext = None
+                else:
+                    ciphertext = Ciphertext.loads(transition_input["ciphertext"])
+                ti = PrivateTransitionInput(
+                    ciphertext_hash=Field.loads(transition_input["ciphertext_hash"]),
+                    ciphertext=Option[Ciphertext](ciphertext)
+                )
+            elif transition_input["type"] == TransitionInput.Type.Record.name:
+                ti = RecordTransitionInput(
+                    serial_number=Field.loads(transition_input["serial_number"]),
+                    tag=Field.loads(transition_input["tag"])
+                )
+            elif transition_input["type"] == TransitionInput.Type.ExternalRecord.name:
+                ti = ExternalRecordTransitionInput(
+                    input_commitment=Field.loads(transition_input["commitment"]),
+                )
+            else:
+                raise NotImplementedError
+            tis[transition_input["transition_id"]].append((ti, transition_input["index"]))
 
-            await cur.execute("SELECT * FROM get_transition_outputs(%s)", (transition["id"],))
-            transition_outputs = await cur.fetchall()
-            tos: list[tuple[TransitionOutput, int]] = []
-            for transition_output in transition_outputs:
-                if transition_output["type"] == TransitionOutput.Type.Public.name:
-                    if transition_output["plaintext"] is None:
-                        plaintext = None
-                    else:
-                        plaintext = Plaintext.load(BytesIO(transition_output["plaintext"]))
-                    tos.append((PublicTransitionOutput(
-                        plaintext_hash=Field.loads(transition_output["plaintext_hash"]),
-                        plaintext=Option[Plaintext](plaintext)
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.Private.name:
-                    if transition_output["ciphertext"] is None:
-                        ciphertext = None
-                    else:
-                        ciphertext = Ciphertext.loads(transition_output["ciphertext"])
-                    tos.append((PrivateTransitionOutput(
-                        ciphertext_hash=Field.loads(transition_output["ciphertext_hash"]),
-                        ciphertext=Option[Ciphertext](ciphertext)
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.Record.name:
-                    if transition_output["record_ciphertext"] is None:
-                        record_ciphertext = None
-                    else:
-                        record_ciphertext = Record[Ciphertext].loads(transition_output["record_ciphertext"])
-                    tos.append((RecordTransitionOutput(
-                        commitment=Field.loads(transition_output["record_commitment"]),
-                        checksum=Field.loads(transition_output["checksum"]),
-                        record_ciphertext=Option[Record[Ciphertext]](record_ciphertext)
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.ExternalRecord.name:
-                    tos.append((ExternalRecordTransitionOutput(
-                        commitment=Field.loads(transition_output["external_record_commitment"]),
-                    ), transition_output["index"]))
-                elif transition_output["type"] == TransitionOutput.Type.Future.name:
-                    future = await DatabaseBlock._load_future(conn, transition_output["future_id"], None)
-                    tos.append((FutureTransitionOutput(
-                        future_hash=Field.loads(transition_output["future_hash"]),
-                        future=Option[Future](future)
-                    ), transition_output["index"]))
+        tos: dict[int, list[tuple[TransitionOutput, int]]] = defaultdict(list)
+        for transition_output in transition_outputs:
+            if transition_output["type"] == TransitionOutput.Type.Public.name:
+                if transition_output["plaintext"] is None:
+                    plaintext = None
                 else:
-                    raise NotImplementedError
-            tos.sort(key=lambda x: x[1])
-            transition_outputs = [x[0] for x in tos]
+                    plaintext = Plaintext.load(BytesIO(transition_output["plaintext"]))
+                to = PublicTransitionOutput(
+                    plaintext_hash=Field.loads(transition_output["plaintext_hash"]),
+                    plaintext=Option[Plaintext](plaintext)
+                )
+            elif transition_output["type"] == TransitionOutput.Type.Private.name:
+                if transition_output["ciphertext"] is None:
+                    ciphertext = None
+                else:
+                    ciphertext = Ciphertext.loads(transition_output["ciphertext"])
+                to = PrivateTransitionOutput(
+                    ciphertext_hash=Field.loads(transition_output["ciphertext_hash"]),
+                    ciphertext=Option[Ciphertext](ciphertext)
+                )
+            elif transition_output["type"] == TransitionOutput.Type.Record.name:
+                if transition_output["record_ciphertext"] is None:
+                    record_ciphertext = None
+                else:
+                    record_ciphertext = Record[Ciphertext].loads(transition_output["record_ciphertext"])
+                to = RecordTransitionOutput(
+                    commitment=Field.loads(transition_output["record_commitment"]),
+                    checksum=Field.loads(transition_output["checksum"]),
+                    record_ciphertext=Option[Record[Ciphertext]](record_ciphertext)
+                )
+            elif transition_output["type"] == TransitionOutput.Type.ExternalRecord.name:
+                to = ExternalRecordTransitionOutput(
+                    commitment=Field.loads(transition_output["external_record_commitment"]),
+                )
+            elif transition_output["type"] == TransitionOutput.Type.Future.name:
+                to = FutureTransitionOutput(
+                    future_hash=Field.loads(transition_output["future_hash"]),
+                    future=Option[Future](futures.get(transition_output["future_id"]))
+                )
+            else:
+                raise NotImplementedError
+            tos[transition_output["transition_id"]].append((to, transition_output["index"]))
 
-            return Transition(
+        res: dict[int, Transition] = {}
+        for transition in transitions:
+            transition_inputs = sorted(tis[transition["id"]], key=lambda x: x[1])
+            transition_outputs = sorted(tos[transition["id"]], key=lambda x: x[1])
+            res[transition["id"]] = Transition(
                 id_=TransitionID.loads(transition["transition_id"]),
                 program_id=ProgramID.loads(transition["program_id"]),
                 function_name=Identifier.loads(transition["function_name"]),
-                inputs=Vec[TransitionInput, u8](transition_inputs),
-                outputs=Vec[TransitionOutput, u8](transition_outputs),
+                inputs=Vec[TransitionInput, u8]([x[0] for x in transition_inputs]),
+                outputs=Vec[TransitionOutput, u8]([x[0] for x in transition_outputs]),
                 tpk=Group.loads(transition["tpk"]),
                 tcm=Field.loads(transition["tcm"]),
                 scm=Field.loads(transition["scm"]),
             )
+        return res
+
+    @staticmethod
+    async def _get_transition_from_dict(transition: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]):
+        return (await DatabaseBlock._get_transitions_from_dicts([transition], conn))[transition["id"]]
 
     async def get_transaction_reject_reason(self, transaction_id: TransactionID | str) -> Optional[str]:
         async with self.pool.connection() as conn:
@@ -520,11 +580,38 @@ class DatabaseBlock(DatabaseBase):
 
     @staticmethod
     async def get_confirmed_transaction_from_dict(conn: psycopg.AsyncConnection[DictRow], confirmed_transaction: dict[str, Any]) -> ConfirmedTransaction:
+        return (await DatabaseBlock.get_confirmed_transactions_from_dicts(conn, [confirmed_transaction]))[0]
+
+    @staticmethod
+    @profile
+    async def get_confirmed_transactions_from_dicts(conn: psycopg.AsyncConnection[DictRow], confirmed_transactions: list[dict[str, Any]]) -> list[ConfirmedTransaction]:
+        """
+        Confirmed transactions of the given get_confirmed_transactions() rows, in the same order. Finalize operations,
+        programs and transitions are read once for all of them instead of once per transaction.
+        """
+        if not confirmed_transactions:
+            return []
+        fs: dict[int, list[FinalizeOperation]] = defaultdict(list)
+        programs: dict[int, dict[str, Any]] = {}
+        execute_transitions: dict[int, list[dict[str, Any]]] = defaultdict(list)
+        fee_transitions: dict[int, dict[str, Any]] = {}
         async with conn.cursor() as cur:
-            await cur.execute("SELECT * FROM get_finalize_operations(%s)", (confirmed_transaction["confirmed_transaction_id"],))
-            finalize_operations = await cur.fetchall()
-            f: list[FinalizeOperation] = []
-            for finalize_operation in finalize_operations:
+            await cur.execute(
+                "SELECT o.confirmed_transaction_id, o.type, o.index, "
+                "COALESCE(im.mapping_id, ikv.mapping_id, ukv.mapping_id, rkv.mapping_id, rm.mapping_id, pm.mapping_id) as mapping_id, "
+                "COALESCE(ikv.key_id, ukv.key_id, rkv.key_id) as key_id, COALESCE(ikv.value_id, ukv.value_id) as value_id "
+                "FROM finalize_operation o "
+                "LEFT JOIN finalize_operation_initialize_mapping im ON im.finalize_operation_id = o.id "
+                "LEFT JOIN finalize_operation_insert_kv ikv ON ikv.finalize_operation_id = o.id "
+                "LEFT JOIN finalize_operation_update_kv ukv ON ukv.finalize_operation_id = o.id "
+                "LEFT JOIN finalize_operation_remove_kv rkv ON rkv.finalize_operation_id = o.id "
+                "LEFT JOIN finalize_operation_remove_mapping rm ON rm.finalize_operation_id = o.id "
+                "LEFT JOIN finalize_operation_replace_mapping pm ON pm.finalize_operation_id = o.id "
+                "WHERE o.confirmed_transaction_id = ANY(%s) ORDER BY o.id",
+                ([x["confirmed_transaction_id"] for x in confirmed_transactions],)
+            )
+            for finalize_operation in await cur.fetchall():
+                f = fs[finalize_operation["confirmed_transaction_id"]]
                 if finalize_operation["type"] == FinalizeOperation.Type.InitializeMapping.name:
                     f.append(InitializeMapping(mapping_id=Field.loads(finalize_operation["mapping_id"])))
                 elif finalize_operation["type"] == FinalizeOperation.Type.InsertKeyValue.name:
@@ -551,17 +638,47 @@ class DatabaseBlock(DatabaseBase):
                 else:
                     raise NotImplementedError
 
+            deploy_ids = [
+                x["transaction_deploy_id"] for x in confirmed_transactions
+                if x["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name
+            ]
+            if deploy_ids:
+                await cur.execute(
+                    "SELECT transaction_deploy_id, raw_data, owner, signature FROM program WHERE transaction_deploy_id = ANY(%s)",
+                    (deploy_ids,)
+                )
+                for program_data in await cur.fetchall():
+                    programs[program_data["transaction_deploy_id"]] = program_data
+            execute_ids = [x["transaction_execute_id"] for x in confirmed_transactions if x.get("transaction_execute_id") is not None]
+            if execute_ids:
+                await cur.execute(
+                    "SELECT * FROM transition WHERE transaction_execute_id = ANY(%s) ORDER BY id",
+                    (execute_ids,)
+                )
+                for transition in await cur.fetchall():
+                    execute_transitions[transition["transaction_execute_id"]].append(transition)
+            fee_ids = [x["fee_id"] for x in confirmed_transactions if x["fee_id"] is not None]
+            if fee_ids:
+                await cur.execute(
+                    "SELECT * FROM transition WHERE fee_id = ANY(%s) ORDER BY id",
+                    (fee_ids,)
+                )
+                for transition in await cur.fetchall():
+                    fee_transitions.setdefault(transition["fee_id"], transition)
+        transitions = await DatabaseBlock._get_transitions_from_dicts(
+            [x for ts in execute_transitions.values() for x in ts] + list(fee_transitions.values()), conn
+        )
+
+        ctxs: list[ConfirmedTransaction] = []
+        for confirmed_transaction in confirmed_transactions:
+            f = fs[confirmed_transaction["confirmed_transaction_id"]]
             transaction = confirmed_transaction
             # TODO: store full program on rejected deploy so we dont need dummy data - should we?
             match confirmed_transaction["confirmed_transaction_type"]:
                 case ConfirmedTransaction.Type.AcceptedDeploy.name | ConfirmedTransaction.Type.RejectedDeploy.name:
                     deploy_transaction = transaction
                     if confirmed_transaction["confirmed_transaction_type"] == ConfirmedTransaction.Type.AcceptedDeploy.name:
-                        await cur.execute(
-                            "SELECT raw_data, owner, signature FROM program WHERE transaction_deploy_id = %s",
-                            (deploy_transaction["transaction_deploy_id"],)
-                        )
-                        program_data = await cur.fetchone()
+                        program_data = programs.get(deploy_transaction["transaction_deploy_id"])
                         if program_data is None:
                             raise RuntimeError("database inconsistent")
                         program = program_data["raw_data"]
@@ -589,18 +706,14 @@ class DatabaseBlock(DatabaseBase):
                     fee_dict = transaction
                     if not fee_dict:
                         raise RuntimeError("database inconsistent")
-                    await cur.execute(
-                        "SELECT * FROM transition WHERE fee_id = %s",
-                        (fee_dict["fee_id"],)
-                    )
-                    fee_transition = await cur.fetchone()
+                    fee_transition = fee_transitions.get(fee_dict["fee_id"])
                     if fee_transition is None:
                         raise ValueError("fee transition not found")
                     proof = None
                     if fee_dict["fee_proof"] is not None:
                         proof = Proof.loads(fee_dict["fee_proof"])
                     fee = Fee(
-                        transition=await DatabaseBlock._get_transition_from_dict(fee_transition, conn),
+                        transition=transitions[fee_transition["id"]],
                         global_state_root=StateRoot.loads(fee_dict["fee_global_state_root"]),
                         proof=Option[Proof](proof),
                     )
@@ -639,23 +752,12 @@ class DatabaseBlock(DatabaseBase):
                     )
                 case ConfirmedTransaction.Type.AcceptedExecute.name | ConfirmedTransaction.Type.RejectedExecute.name:
                     execute_transaction = transaction
-                    await cur.execute(
-                        "SELECT * FROM transition WHERE transaction_execute_id = %s",
-                        (execute_transaction["transaction_execute_id"],)
-                    )
-                    transitions = await cur.fetchall()
-                    tss: list[Transition] = []
-                    for transition in transitions:
-                        tss.append(await DatabaseBlock._get_transition_from_dict(transition, conn))
+                    tss = [transitions[x["id"]] for x in execute_transitions[execute_transaction["transaction_execute_id"]]]
                     fee = transaction
                     if fee["fee_id"] is None:
                         fee = None
                     else:
-                        await cur.execute(
-                            "SELECT * FROM transition WHERE fee_id = %s",
-                            (fee["fee_id"],)
-                        )
-                        fee_transition = await cur.fetchone()
+                        fee_transition = fee_transitions.get(fee["fee_id"])
                         if fee_transition is None:
                             print(transaction)
                             raise ValueError("fee transition not found")
@@ -663,7 +765,7 @@ class DatabaseBlock(DatabaseBase):
                         if fee["fee_proof"] is not None:
                             proof = Proof.loads(fee["fee_proof"])
                         fee = Fee(
-                            transition=await DatabaseBlock._get_transition_from_dict(fee_transition, conn),
+                            transition=transitions[fee_transition["id"]],
                             global_state_root=StateRoot.loads(fee["fee_global_state_root"]),
                             proof=Option[Proof](proof),
                         )
@@ -705,7 +807,8 @@ class DatabaseBlock(DatabaseBase):
                         )
                 case _:
                     raise NotImplementedError
-            return ctx
+            ctxs.append(ctx)
+        return ctxs
 
     async def get_confirmed_transaction(self, transaction_id: str) -> Optional[ConfirmedTransaction]:
         async with self.pool.connection() as conn:
@@ -766,84 +869,129 @@ class DatabaseBlock(DatabaseBase):
                     raise
 
     @staticmethod
-    @profile
     async def _get_full_block(block: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]):
+        return (await DatabaseBlock._get_full_blocks([block], conn))[0]
+
+    @staticmethod
+    async def _get_genesis_ratify(cur: psycopg.AsyncCursor[DictRow]) -> GenesisRatify:
+        await cur.execute("SELECT * FROM committee_history WHERE height = %s", (0,))
+        committee_history = await cur.fetchone()
+        if committee_history is None:
+            raise RuntimeError("database inconsistent")
+        await cur.execute("SELECT * FROM committee_history_member WHERE committee_id = %s", (committee_history["id"],))
+        committee_history_members = await cur.fetchall()
+        members: list[Tuple[Address, u64, bool_, u8]] = []
+        for committee_history_member in committee_history_members:
+            members.append(Tuple[Address, u64, bool_, u8]((
+                Address.loads(committee_history_member["address"]),
+                u64(committee_history_member["stake"]),
+                bool_(committee_history_member["is_open"]),
+                u8(committee_history_member["commission"]),
+            )))
+        committee = Committee(
+            id_=Field.loads(committee_history["committee_id"]),
+            starting_round=u64(committee_history["starting_round"]),
+            members=Vec[Tuple[Address, u64, bool_, u8], u16](members),
+            total_stake=u64(committee_history["total_stake"]),
+        )
+        await cur.execute("SELECT * FROM ratification_genesis_balance")
+        public_balances = await cur.fetchall()
+        balances: list[Tuple[Address, u64]] = []
+        for public_balance in public_balances:
+            balances.append(Tuple[Address, u64]((Address.loads(public_balance["address"]), u64(public_balance["amount"]))))
+        await cur.execute("SELECT * FROM ratification_genesis_bonded")
+        bonded_balances = await cur.fetchall()
+        bonded: list[Tuple[Address, Address, Address, u64]] = []
+        for bonded_balance in bonded_balances:
+            bonded.append(
+                Tuple[Address, Address, Address, u64]((
+                    Address.loads(bonded_balance["staker"]),
+                    Address.loads(bonded_balance["validator"]),
+                    Address.loads(bonded_balance["withdrawal"]),
+                    u64(bonded_balance["amount"])
+                ))
+            )
+        return GenesisRatify(
+            committee=committee,
+            public_balances=Vec[Tuple[Address, u64], u16](balances),
+            bonded_balances=Vec[Tuple[Address, Address, Address, u64], u16](bonded),
+        )
+
+    @staticmethod
+    @profile
+    async def _get_full_blocks(blocks: list[dict[str, Any]], conn: psycopg.AsyncConnection[DictRow]) -> list[Block]:
+        """
+        Full blocks of the given block rows, in the same order. Blocks with a stored raw copy are decoded from it,
+        the others are rebuilt from the normalized tables.
+        """
+        if not blocks:
+            return []
         async with conn.cursor() as cur:
-            await cur.execute("SELECT * FROM get_confirmed_transactions(%s)", (block["id"],))
+            await cur.execute(
+                "SELECT block_id, data FROM block_raw WHERE block_id = ANY(%s)",
+                ([block["id"] for block in blocks],)
+            )
+            raw_blocks: dict[int, Block] = {
+                x["block_id"]: LazyBlock.from_bytes(zlib.decompress(x["data"])) for x in await cur.fetchall()
+            }
+        missing = [block for block in blocks if block["id"] not in raw_blocks]
+        for block, full_block in zip(missing, await DatabaseBlock._rebuild_full_blocks(missing, conn)):
+            raw_blocks[block["id"]] = full_block
+        return [raw_blocks[block["id"]] for block in blocks]
+
+    @staticmethod
+    @profile
+    async def _rebuild_full_blocks(blocks: list[dict[str, Any]], conn: psycopg.AsyncConnection[DictRow]) -> list[Block]:
+        """
+        Full blocks of the given block rows rebuilt from the normalized tables, in the same order. Every child table is
+        read once for all the blocks, with the rows matched to their parents in memory, so the number of queries
+        doesn't grow with the number of blocks, transactions or certificates.
+        """
+        if not blocks:
+            return []
+        block_db_ids = [block["id"] for block in blocks]
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT b.id as block_db_id, c.* FROM UNNEST(%s::integer[]) WITH ORDINALITY b(id, ord) "
+                "CROSS JOIN LATERAL get_confirmed_transactions(b.id) c "
+                "ORDER BY b.ord, c.index",
+                (block_db_ids,)
+            )
             confirmed_transactions = await cur.fetchall()
-            ctxs: list[ConfirmedTransaction] = []
-            for confirmed_transaction in confirmed_transactions:
-                ctxs.append(await DatabaseBlock.get_confirmed_transaction_from_dict(conn, confirmed_transaction))
-            await cur.execute("SELECT * FROM ratification WHERE block_id = %s ORDER BY index", (block["id"],))
-            ratifications = await cur.fetchall()
-            rs: list[Ratify] = []
-            for ratification in ratifications:
+            ctxs: dict[int, list[ConfirmedTransaction]] = defaultdict(list)
+            for confirmed_transaction, ctx in zip(
+                confirmed_transactions,
+                await DatabaseBlock.get_confirmed_transactions_from_dicts(conn, confirmed_transactions)
+            ):
+                ctxs[confirmed_transaction["block_db_id"]].append(ctx)
+
+            await cur.execute("SELECT * FROM ratification WHERE block_id = ANY(%s) ORDER BY block_id, index", (block_db_ids,))
+            rs: dict[int, list[Ratify]] = defaultdict(list)
+            for ratification in await cur.fetchall():
                 match ratification["type"]:
                     case Ratify.Type.Genesis.name:
-                        await cur.execute("SELECT * FROM committee_history WHERE height = %s", (0,))
-                        committee_history = await cur.fetchone()
-                        if committee_history is None:
-                            raise RuntimeError("database inconsistent")
-                        await cur.execute("SELECT * FROM committee_history_member WHERE committee_id = %s", (committee_history["id"],))
-                        committee_history_members = await cur.fetchall()
-                        members: list[Tuple[Address, u64, bool_, u8]] = []
-                        for committee_history_member in committee_history_members:
-                            members.append(Tuple[Address, u64, bool_, u8]((
-                                Address.loads(committee_history_member["address"]),
-                                u64(committee_history_member["stake"]),
-                                bool_(committee_history_member["is_open"]),
-                                u8(committee_history_member["commission"]),
-                            )))
-                        committee = Committee(
-                            id_=Field.loads(committee_history["committee_id"]),
-                            starting_round=u64(committee_history["starting_round"]),
-                            members=Vec[Tuple[Address, u64, bool_, u8], u16](members),
-                            total_stake=u64(committee_history["total_stake"]),
-                        )
-                        await cur.execute("SELECT * FROM ratification_genesis_balance")
-                        public_balances = await cur.fetchall()
-                        balances: list[Tuple[Address, u64]] = []
-                        for public_balance in public_balances:
-                            balances.append(Tuple[Address, u64]((Address.loads(public_balance["address"]), u64(public_balance["amount"]))))
-                        await cur.execute("SELECT * FROM ratification_genesis_bonded")
-                        bonded_balances = await cur.fetchall()
-                        bonded: list[Tuple[Address, Address, Address, u64]] = []
-                        for bonded_balance in bonded_balances:
-                            bonded.append(
-                                Tuple[Address, Address, Address, u64]((
-                                    Address.loads(bonded_balance["staker"]),
-                                    Address.loads(bonded_balance["validator"]),
-                                    Address.loads(bonded_balance["withdrawal"]),
-                                    u64(bonded_balance["amount"])
-                                ))
-                            )
-                        rs.append(GenesisRatify(
-                            committee=committee,
-                            public_balances=Vec[Tuple[Address, u64], u16](balances),
-                            bonded_balances=Vec[Tuple[Address, Address, Address, u64], u16](bonded),
-                        ))
+                        rs[ratification["block_id"]].append(await DatabaseBlock._get_genesis_ratify(cur))
                     case Ratify.Type.BlockReward.name:
-                        rs.append(BlockRewardRatify(
+                        rs[ratification["block_id"]].append(BlockRewardRatify(
                             amount=u64(ratification["amount"]),
                         ))
                     case Ratify.Type.PuzzleReward.name:
-                        rs.append(PuzzleRewardRatify(
+                        rs[ratification["block_id"]].append(PuzzleRewardRatify(
                             amount=u64(ratification["amount"]),
                         ))
                     case _:
                         raise NotImplementedError
 
-            await cur.execute("SELECT * FROM puzzle_solution WHERE block_id = %s", (block["id"],))
-            puzzle_solution = await cur.fetchone()
-            if puzzle_solution is not None:
+            await cur.execute("SELECT * FROM puzzle_solution WHERE block_id = ANY(%s)", (block_db_ids,))
+            puzzle_solutions = {x["id"]: x["block_id"] for x in await cur.fetchall()}
+            ss: dict[int, list[Solution]] = {block_db_id: [] for block_db_id in puzzle_solutions.values()}
+            if puzzle_solutions:
                 await cur.execute(
-                    "SELECT * FROM solution WHERE puzzle_solution_id = %s",
-                    (puzzle_solution["id"],)
+                    "SELECT * FROM solution WHERE puzzle_solution_id = ANY(%s) ORDER BY id",
+                    (list(puzzle_solutions),)
                 )
-                solutions = await cur.fetchall()
-                ss: list[Solution] = []
-                for solution in solutions:
-                    ss.append(Solution(
+                for solution in await cur.fetchall():
+                    ss[puzzle_solutions[solution["puzzle_solution_id"]]].append(Solution(
                         partial_solution=PartialSolution(
                             solution_id=SolutionID.load(BytesIO(aleo_explorer_rust.solution_to_id(str(solution["epoch_hash"]), str(solution["address"]), int(solution["counter"])))),
                             epoch_hash=BlockHash.loads(solution["epoch_hash"]),
@@ -852,12 +1000,69 @@ class DatabaseBlock(DatabaseBase):
                         ),
                         target=u64(solution["target"]),
                     ))
-                puzzle_solution = PuzzleSolutions(solutions=Vec[Solution, u8](ss))
+
+            await cur.execute("SELECT * FROM authority WHERE block_id = ANY(%s)", (block_db_ids,))
+            authorities = {x["block_id"]: x for x in await cur.fetchall()}
+            quorum_authority_ids = [x["id"] for x in authorities.values() if x["type"] == Authority.Type.Quorum.name]
+            dag_vertices: dict[int, list[dict[str, Any]]] = defaultdict(list)
+            signatures: dict[int, list[Signature]] = defaultdict(list)
+            previous_cert_ids: dict[int, list[str]] = {}
+            tids: dict[int, list[TransmissionID]] = defaultdict(list)
+            if quorum_authority_ids:
+                await cur.execute(
+                    "SELECT * FROM dag_vertex WHERE authority_id = ANY(%s) ORDER BY authority_id, index",
+                    (quorum_authority_ids,)
+                )
+                vertex_ids: list[int] = []
+                for dag_vertex in await cur.fetchall():
+                    dag_vertices[dag_vertex["authority_id"]].append(dag_vertex)
+                    vertex_ids.append(dag_vertex["id"])
+
+                await cur.execute(
+                    "SELECT vertex_id, signature FROM dag_vertex_signature WHERE vertex_id = ANY(%s) ORDER BY vertex_id, index",
+                    (vertex_ids,)
+                )
+                for signature in await cur.fetchall():
+                    signatures[signature["vertex_id"]].append(Signature.loads(signature["signature"]))
+
+                # TODO: use batch id after next reset - do we still want to keep this? would be way too expensive
+                await cur.execute(
+                    "SELECT vertex_id, previous_vertex_id FROM dag_vertex_previous_id WHERE vertex_id = ANY(%s) ORDER BY id",
+                    (vertex_ids,)
+                )
+                for previous in await cur.fetchall():
+                    previous_cert_ids.setdefault(previous["vertex_id"], previous["previous_vertex_id"])
+
+                await cur.execute(
+                    "SELECT * FROM dag_vertex_transmission_id WHERE vertex_id = ANY(%s) ORDER BY vertex_id, index",
+                    (vertex_ids,)
+                )
+                for tid in await cur.fetchall():
+                    if tid["type"] == TransmissionID.Type.Ratification.name:
+                        tids[tid["vertex_id"]].append(RatificationTransmissionID())
+                    elif tid["type"] == TransmissionID.Type.Solution.name:
+                        tids[tid["vertex_id"]].append(SolutionTransmissionID(id_=SolutionID.loads(tid["commitment"]), checksum=u128(int(tid["checksum"]))))
+                    elif tid["type"] == TransmissionID.Type.Transaction.name:
+                        tids[tid["vertex_id"]].append(TransactionTransmissionID(id_=TransactionID.loads(tid["transaction_id"]), checksum=u128(int(tid["checksum"]))))
+
+            await cur.execute("SELECT * FROM block_aborted_solution_id WHERE block_id = ANY(%s) ORDER BY id", (block_db_ids,))
+            aborted_solution_ids: dict[int, list[SolutionID]] = defaultdict(list)
+            for x in await cur.fetchall():
+                aborted_solution_ids[x["block_id"]].append(SolutionID.loads(x["solution_id"]))
+
+            await cur.execute("SELECT * FROM block_aborted_transaction_id WHERE block_id = ANY(%s) ORDER BY id", (block_db_ids,))
+            aborted_transaction_ids: dict[int, list[TransactionID]] = defaultdict(list)
+            for x in await cur.fetchall():
+                aborted_transaction_ids[x["block_id"]].append(TransactionID.loads(x["transaction_id"]))
+
+        res: list[Block] = []
+        for block in blocks:
+            if block["id"] in ss:
+                puzzle_solution = PuzzleSolutions(solutions=Vec[Solution, u8](ss[block["id"]]))
             else:
                 puzzle_solution = None
 
-            await cur.execute("SELECT * FROM authority WHERE block_id = %s", (block["id"],))
-            authority = await cur.fetchone()
+            authority = authorities.get(block["id"])
             if authority is None:
                 raise RuntimeError("database inconsistent")
             if authority["type"] == Authority.Type.Beacon.name:
@@ -865,79 +1070,21 @@ class DatabaseBlock(DatabaseBase):
                     signature=Signature.loads(authority["signature"]),
                 )
             elif authority["type"] == Authority.Type.Quorum.name:
-                await cur.execute(
-                    "SELECT * FROM dag_vertex WHERE authority_id = %s ORDER BY index",
-                    (authority["id"],)
-                )
-                dag_vertices = await cur.fetchall()
-                certificates: list[BatchCertificate] = []
-                for dag_vertex in dag_vertices:
-                    await cur.execute(
-                        "SELECT * FROM dag_vertex_signature WHERE vertex_id = %s ORDER BY index",
-                        (dag_vertex["id"],)
-                    )
-                    dag_vertex_signatures = await cur.fetchall()
-
-                    signatures: list[Signature] = []
-                    for signature in dag_vertex_signatures:
-                        signatures.append(Signature.loads(signature["signature"]))
-
-                    # await cur.execute(
-                    #     "SELECT previous_vertex_id FROM dag_vertex_adjacency WHERE vertex_id = %s ORDER BY index",
-                    #     (dag_vertex["id"],)
-                    # )
-                    # previous_ids = [x["previous_vertex_id"] for x in await cur.fetchall()]
-
-                    # TODO: use batch id after next reset - do we still want to keep this? would be way too expensive
-                    # await cur.execute(
-                    #     "SELECT batch_certificate_id FROM dag_vertex v "
-                    #     "JOIN UNNEST(%s) WITH ORDINALITY q(id, ord) ON q.id = v.id "
-                    #     "ORDER BY ord",
-                    #     (previous_ids,)
-                    # )
-                    # previous_cert_ids = [x["batch_certificate_id"] for x in await cur.fetchall()]
-                    # previous_cert_ids: list[str] = []
-
-                    await cur.execute(
-                        "SELECT previous_vertex_id FROM dag_vertex_previous_id WHERE vertex_id = %s ",
-                        (dag_vertex["id"],)
-                    )
-                    res = await cur.fetchone()
-                    if res:
-                        previous_cert_ids = res["previous_vertex_id"]
-                    else:
-                        previous_cert_ids = []
-
-                    await cur.execute(
-                        "SELECT * FROM dag_vertex_transmission_id WHERE vertex_id = %s ORDER BY index",
-                        (dag_vertex["id"],)
-                    )
-                    tids: list[TransmissionID] = []
-                    for tid in await cur.fetchall():
-                        if tid["type"] == TransmissionID.Type.Ratification.name:
-                            tids.append(RatificationTransmissionID())
-                        elif tid["type"] == TransmissionID.Type.Solution.name:
-                            tids.append(SolutionTransmissionID(id_=SolutionID.loads(tid["commitment"]), checksum=u128(int(tid["checksum"]))))
-                        elif tid["type"] == TransmissionID.Type.Transaction.name:
-                            tids.append(TransactionTransmissionID(id_=TransactionID.loads(tid["transaction_id"]), checksum=u128(int(tid["checksum"]))))
-
-                    certificates.append(
-                        BatchCertificate(
-                            batch_header=BatchHeader(
-                                batch_id=Field.loads(dag_vertex["batch_id"]),
-                                author=Address.loads(dag_vertex["author"]),
-                                round_=u64(dag_vertex["round"]),
-                                timestamp=i64(dag_vertex["timestamp"]),
-                                committee_id=Field.loads(dag_vertex["committee_id"]),
-                                transmission_ids=Vec[TransmissionID, u32](tids),
-                                previous_certificate_ids=Vec[Field, u16]([Field.loads(x) for x in previous_cert_ids]),
-                                signature=Signature.loads(dag_vertex["author_signature"]),
-                            ),
-                            signatures=Vec[Signature, u16](signatures),
-                        )
-                    )
                 subdags: dict[u64, Vec[BatchCertificate, u16]] = defaultdict(lambda: Vec[BatchCertificate, u16]([]))
-                for certificate in certificates:
+                for dag_vertex in dag_vertices[authority["id"]]:
+                    certificate = BatchCertificate(
+                        batch_header=BatchHeader(
+                            batch_id=Field.loads(dag_vertex["batch_id"]),
+                            author=Address.loads(dag_vertex["author"]),
+                            round_=u64(dag_vertex["round"]),
+                            timestamp=i64(dag_vertex["timestamp"]),
+                            committee_id=Field.loads(dag_vertex["committee_id"]),
+                            transmission_ids=Vec[TransmissionID, u32](tids[dag_vertex["id"]]),
+                            previous_certificate_ids=Vec[Field, u16]([Field.loads(x) for x in previous_cert_ids.get(dag_vertex["id"]) or []]),
+                            signature=Signature.loads(dag_vertex["author_signature"]),
+                        ),
+                        signatures=Vec[Signature, u16](signatures[dag_vertex["id"]]),
+                    )
                     subdags[certificate.batch_header.round].append(certificate)
                 subdag = Subdag(
                     subdag=subdags
@@ -946,27 +1093,20 @@ class DatabaseBlock(DatabaseBase):
             else:
                 raise NotImplementedError
 
-            await cur.execute("SELECT * FROM block_aborted_solution_id WHERE block_id = %s", (block["id"],))
-            aborted_solution_ids = await cur.fetchall()
-            aborted_solution_ids = [SolutionID.loads(x["solution_id"]) for x in aborted_solution_ids]
-
-            await cur.execute("SELECT * FROM block_aborted_transaction_id WHERE block_id = %s", (block["id"],))
-            aborted_transaction_ids = await cur.fetchall()
-            aborted_transaction_ids = [TransactionID.loads(x["transaction_id"]) for x in aborted_transaction_ids]
-
-            return Block(
+            res.append(Block(
                 block_hash=BlockHash.loads(block['block_hash']),
                 previous_hash=BlockHash.loads(block['previous_hash']),
                 header=DatabaseBlock._get_block_header(block),
                 authority=auth,
                 transactions=Transactions(
-                    transactions=Vec[ConfirmedTransaction, u32](ctxs),
+                    transactions=Vec[ConfirmedTransaction, u32](ctxs[block["id"]]),
                 ),
-                ratifications=Ratifications(ratifications=Vec[Ratify, u32](rs)),
+                ratifications=Ratifications(ratifications=Vec[Ratify, u32](rs[block["id"]])),
                 solutions=Solutions(solutions=Option[PuzzleSolutions](puzzle_solution)),
-                aborted_solution_ids=Vec[SolutionID, u32](aborted_solution_ids),
-                aborted_transactions_ids=Vec[TransactionID, u32](aborted_transaction_ids),
-            )
+                aborted_solution_ids=Vec[SolutionID, u32](aborted_solution_ids[block["id"]]),
+                aborted_transactions_ids=Vec[TransactionID, u32](aborted_transaction_ids[block["id"]]),
+            ))
+        return res
 
     @staticmethod
     async def get_full_block_range(start: int, end: int, conn: psycopg.AsyncConnection[DictRow]):
@@ -976,7 +1116,7 @@ class DatabaseBlock(DatabaseBase):
                 (start, end)
             )
             blocks = await cur.fetchall()
-            return [await DatabaseBlock._get_full_block(block, conn) for block in blocks]
+            return await DatabaseBlock._get_full_blocks(blocks, conn)
 
     @staticmethod
     async def _get_fast_block(block: dict[str, Any], conn: psycopg.AsyncConnection[DictRow]) -> dict[str, Any]:
@@ -1015,7 +1155,45 @@ class DatabaseBlock(DatabaseBase):
             blocks = await cur.fetchall()
             return [await DatabaseBlock._get_fast_block(block, conn) for block in blocks]
 
+    async def run_hot_block_cache(self):
+        """
+        Keeps global_hot_blocks at the latest blocks for as long as it runs, from the heights published by
+        _save_block and revert_to_last_backup. Only for processes that don't write blocks themselves. Also drops the
+        decoded programs of this process whenever the writer clears or reverts the database.
+        """
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub: # type: ignore
+                    await pubsub.subscribe(HotBlockCache.channel, program_cache_channel) # type: ignore
+                    async for message in pubsub.listen():
+                        if message["channel"] == program_cache_channel:
+                            # a clear may have been missed while not subscribed, so drop them on subscribe too
+                            if message["type"] in ("subscribe", "message"):
+                                clear_local_program_caches()
+                            continue
+                        async with self.pool.connection() as conn:
+                            async with conn.cursor() as cur:
+                                if message["type"] == "subscribe":
+                                    # anything committed after this is published to us
+                                    await cur.execute("SELECT * FROM block ORDER BY height DESC LIMIT 1")
+                                elif message["type"] == "message":
+                                    await cur.execute("SELECT * FROM block WHERE height = %s", (int(message["data"]),))
+                                else:
+                                    continue
+                                block = await cur.fetchone()
+                                if block is not None:
+                                    global_hot_blocks.set_latest(await self._get_full_block(block, conn))
+            except asyncio.CancelledError:
+                global_hot_blocks.clear()
+                raise
+            except Exception as e:
+                global_hot_blocks.clear()
+                await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+                await asyncio.sleep(5)
+
     async def get_latest_height(self) -> Optional[int]:
+        if (latest_block := global_hot_blocks.latest()) is not None:
+            return latest_block.height
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
@@ -1043,6 +1221,8 @@ class DatabaseBlock(DatabaseBase):
 
 
     async def get_latest_block(self) -> Block:
+        if (latest_block := global_hot_blocks.latest()) is not None:
+            return latest_block
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
@@ -1082,6 +1262,8 @@ class DatabaseBlock(DatabaseBase):
                     raise
 
     async def get_block_by_height(self, height: int) -> Block | None:
+        if (block := global_hot_blocks.get(height)) is not None:
+            return block
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
@@ -1108,6 +1290,8 @@ class DatabaseBlock(DatabaseBase):
                     raise
 
     async def get_block_header_by_height(self, height: int):
+        if (block := global_hot_blocks.get(height)) is not None:
+            return block.header
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
                 try:
@@ -1279,4 +1463,45 @@ class DatabaseBlock(DatabaseBase):
         puzzle_reward_1M = await self.redis.get("24H_reward:1M_puzzle")
         if puzzle_reward_1M is None:
             return 0
-        return int(puzzle_reward_1M)
\ No newline at end of file
+        return int(puzzle_reward_1M)
+
+    async def build_network_summary(self, height: int) -> dict[str, Any]:
+        db = cast("Database", self)
+        validators_count = await db.get_validator_count_at_height(height)
+        committee = await db.get_committee_at_height(height)
+        recent_blocks = await db.get_recent_blocks_fast(10)
+        for block in recent_blocks:
+            block["reward"] = block["block_reward"] + block["coinbase_reward"] * 2 // 3
+        return {
+            "height": height,
+            "validators_count": validators_count,
+            "provers_count": await self.redis.hlen("address_puzzle_reward"),
+            "delegators_count": await self.redis.hlen("credits.aleo:bonded") - validators_count,
+            "total_stake": int(committee["total_stake"]),
+            # text, as the speed is a Decimal
+            "network_speed": str(await db.get_network_speed(900)),
+            # numeric columns as strings, like rpc.format.format_number
+            "recent_blocks": [
+                {k: str(int(v)) if isinstance(v, Decimal) else v for k, v in block.items()} for block in recent_blocks
+            ],
+        }
+
+    async def get_network_summary(self) -> dict[str, Any]:
+        """
+        Homepage numbers as saved by DatabaseInsert.save_network_summary after each block, with the 24H rewards, in
+        one redis round trip. Built from the database if nothing is saved yet.
+        """
+        summary, puzzle_reward, block_reward, puzzle_reward_1M = await self.redis.mget(
+            ["network_summary", "24H_reward:puzzle", "24H_reward:block", "24H_reward:1M_puzzle"]
+        )
+        if summary is None:
+            latest_height = await self.get_latest_height()
+            if latest_height is None:
+                raise RuntimeError("no blocks in database")
+            res = await self.build_network_summary(latest_height)
+        else:
+            res = json.loads(summary)
+        res["puzzle_reward"] = int(puzzle_reward or 0)
+        res["block_reward"] = int(block_reward or 0)
+        res["puzzle_reward_1M"] = int(puzzle_reward_1M or 0)
+        return res
\ No newline at end of file
@@ -4,8 +4,9 @@ from __future__ import annotations
 import os
 import signal
 import time
+import zlib
 from collections import defaultdict
-from typing import cast
+from typing import Iterator, LiteralString, cast
 
 import psycopg.sql
 from psycopg.rows import DictRow
@@ -17,9 +18,9 @@ from aleo_types.cached import cached_get_key_id, cached_get_mapping_id, cached_c
 from db.block import DatabaseBlock
 from disasm.utils import value_type_to_mode_type_str, plaintext_type_to_str
 from explorer.types import Message as ExplorerMessage
-from util.global_cache import global_mapping_cache
+from util.global_cache import HotBlockCache, global_mapping_cache
 from .base import DatabaseBase, profile
-from .util import DatabaseUtil
+from .util import DatabaseUtil, RedisUndoLog
 from .address import DatabaseAddress
 
 
@@ -43,22 +44,324 @@ class _SupplyTracker:
         self.supply -= delta
 
 
+class _PendingTransition:
+
+    def __init__(self, transaction_db_id: int, exe_tx_db_id: Optional[int], fee_db_id: Optional[int],
+                 transition: Transition, ts_index: int, is_rejected: bool, should_exist: bool):
+        self.transaction_db_id = transaction_db_id
+        self.exe_tx_db_id = exe_tx_db_id
+        self.fee_db_id = fee_db_id
+        self.transition = transition
+        self.ts_index = ts_index
+        self.is_rejected = is_rejected
+        self.should_exist = should_exist
+        self.confirmed_transaction_db_id: Optional[int] = None
+        self.height: Optional[int] = None
+        self.timestamp: Optional[int] = None
+        self.address_type: Optional[str] = None
+
+
+class _TransitionWriter:
+    """
+    Buffers transitions and everything hanging off them (inputs, outputs, futures, address_transition)
+    so they can be written with preallocated ids and a single COPY per table, instead of one
+    INSERT ... RETURNING id per row.
+    """
+
+    def __init__(self):
+        self.pending: list[_PendingTransition] = []
+        self.by_transaction: dict[int, list[_PendingTransition]] = defaultdict(list)
+
+    def add(self, transaction_db_id: int, exe_tx_db_id: Optional[int], fee_db_id: Optional[int],
+            transition: Transition, ts_index: int, is_rejected: bool = False, should_exist: bool = False):
+        pending = _PendingTransition(transaction_db_id, exe_tx_db_id, fee_db_id, transition, ts_index, is_rejected, should_exist)
+        self.pending.append(pending)
+        self.by_transaction[transaction_db_id].append(pending)
+
+    def confirm(self, transaction_db_id: int, confirmed_transaction_db_id: int, height: int, timestamp: int):
+        for pending in self.by_transaction.get(transaction_db_id, []):
+            pending.confirmed_transaction_db_id = confirmed_transaction_db_id
+            pending.height = height
+            pending.timestamp = timestamp
+
+    def set_address_type(self, transaction_db_id: int, address_type: str, transition_id: Optional[str] = None):
+        for pending in self.by_transaction.get(transaction_db_id, []):
+            if transition_id is None or str(pending.transition.id) == transition_id:
+                pending.address_type = address_type
+
+    @staticmethod
+    def _count_future(future: Future) -> tuple[int, int]:
+        futures, arguments = 1, len(future.arguments)
+        for argument in future.arguments:
+            if isinstance(argument, FutureArgument):
+                f, a = _TransitionWriter._count_future(argument.future)
+                futures += f
+                arguments += a
+        return futures, arguments
+
+    @staticmethod
+    async def _allocate_ids(cur: psycopg.AsyncCursor[DictRow], counts: dict[str, int]) -> dict[str, Iterator[int]]:
+        tables = [table for table, count in counts.items() if count > 0]
+        ids: dict[str, list[int]] = defaultdict(list)
+        if tables:
+            await cur.execute(
+                "SELECT t.name, nextval(pg_get_serial_sequence(t.name, 'id')) AS id "
+                "FROM unnest(%s::text[], %s::int[]) AS t(name, count) "
+                "CROSS JOIN LATERAL generate_series(1, t.count)",
+                (tables, [counts[table] for table in tables])
+            )
+            for row in await cur.fetchall():
+                ids[row["name"]].append(row["id"])
+        # ids must be ascending within a table, future arguments are read back ordered by id
+        return {table: iter(sorted(ids[table])) for table in counts}
+
+    async def flush(self, conn: psycopg.AsyncConnection[DictRow]):
+        pending = self.pending
+        self.pending = []
+        self.by_transaction = defaultdict(list)
+        if not pending:
+            return
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "SELECT id, transition_id FROM transition WHERE transition_id = ANY(%s::text[])",
+                ([str(p.transition.id) for p in pending],)
+            )
+            existing: dict[str, int] = {row["transition_id"]: row["id"] for row in await cur.fetchall()}
+            if existing:
+                stale_ids: list[int] = []
+                kept: list[_PendingTransition] = []
+                for p in pending:
+                    transition_db_id = existing.get(str(p.transition.id))
+                    if transition_db_id is not None:
+                        if p.is_rejected and p.should_exist:
+                            continue
+                        stale_ids.append(transition_db_id)
+                    kept.append(p)
+                if stale_ids:
+                    await cur.execute(
+                        "DELETE FROM address_transition WHERE transition_id = ANY(%s::int[])", (stale_ids,)
+                    )
+                    await cur.execute(
+                        "DELETE FROM transition WHERE id = ANY(%s::int[])", (stale_ids,)
+                    )
+                pending = kept
+                if not pending:
+                    return
+
+            program_ids = list({str(p.transition.program_id) for p in pending})
+            await cur.execute(
+                "SELECT id, program_id FROM program WHERE program_id = ANY(%s::text[])", (program_ids,)
+            )
+            program_db_ids: dict[str, int] = {row["program_id"]: row["id"] for row in await cur.fetchall()}
+            if len(program_db_ids) != len(program_ids):
+                raise RuntimeError("program in transition does not exist - unconfirmed transaction?")
+
+            counts = {
+                "transition": len(pending),
+                "transition_input": 0,
+                "transition_output": 0,
+                "transition_output_future": 0,
+                "future": 0,
+                "future_argument": 0,
+            }
+            for p in pending:
+                counts["transition_input"] += len(p.transition.inputs)
+                counts["transition_output"] += len(p.transition.outputs)
+                for transition_output in p.transition.outputs:
+                    if isinstance(transition_output, FutureTransitionOutput):
+                        counts["transition_output_future"] += 1
+                        if transition_output.future.value is not None:
+                            futures, arguments = self._count_future(transition_output.future.value)
+                            counts["future"] += futures
+                            counts["future_argument"] += arguments
+            ids = await self._allocate_ids(cur, counts)
+
+            rows: dict[str, list[tuple[Any, ...]]] = defaultdict(list)
+            # futures reference future arguments and vice versa, so they are written level by level
+            future_rows: list[list[tuple[Any, ...]]] = []
+            future_argument_rows: list[list[tuple[Any, ...]]] = []
+            called: dict[tuple[int, str], int] = defaultdict(int)
+
+            for p in pending:
+                transition = p.transition
+                transition_db_id = next(ids["transition"])
+                program_id = str(transition.program_id)
+                function_name = str(transition.function_name)
+                rows["transition"].append((
+                    transition_db_id, str(transition.id), p.transaction_db_id, p.confirmed_transaction_db_id,
+                    p.exe_tx_db_id, p.fee_db_id, program_id, function_name, str(transition.tpk), str(transition.tcm),
+                    p.ts_index, str(transition.scm)
+                ))
+                called[(program_db_ids[program_id], function_name)] += 1
+
+                def add_addresses(plaintext: Plaintext):
+                    if isinstance(plaintext, LiteralPlaintext) and plaintext.literal.type == Literal.Type.Address:
+                        addresses = [str(plaintext.literal.primitive)]
+                    elif isinstance(plaintext, StructPlaintext):
+                        addresses = DatabaseUtil.get_addresses_from_struct(plaintext)
+                    else:
+                        return
+                    for address in addresses:
+                        rows["address_transition"].append((
+                            address, transition_db_id, program_id, function_name, p.height, p.timestamp, p.address_type
+                        ))
+
+                def add_future(future: Future, depth: int, transition_output_future_db_id: Optional[int],
+                               argument_db_id: Optional[int]):
+                    future_db_id = next(ids["future"])
+                    while len(future_rows) <= depth:
+                        future_rows.append([])
+                        future_argument_rows.append([])
+                    future_rows[depth].append((
+                        future_db_id, "Output" if transition_output_future_db_id else "Argument",
+                        transition_output_future_db_id, argument_db_id, str(future.program_id), str(future.function_name)
+                    ))
+                    for argument in future.arguments:
+                        future_argument_db_id = next(ids["future_argument"])
+                        if isinstance(argument, PlaintextArgument):
+                            future_argument_rows[depth].append((
+                                future_argument_db_id, future_db_id, argument.type.name, argument.plaintext.dump()
+                            ))
+                            add_addresses(argument.plaintext)
+                        elif isinstance(argument, FutureArgument):
+                            future_argument_rows[depth].append((
+                                future_argument_db_id, future_db_id, argument.type.name, None
+                            ))
+                            add_future(argument.future, depth + 1, None, future_argument_db_id)
+                        else:
+                            raise NotImplementedError
+
+                transition_input: TransitionInput
+                for input_index, transition_input in enumerate(transition.inputs):
+                    transition_input_db_id = next(ids["transition_input"])
+                    rows["transition_input"].append((transition_input_db_id, transition_db_id, transition_input.type.name, input_index))
+                    if isinstance(transition_input, PublicTransitionInput):
+                        rows["transition_input_public"].append((
+                            transition_input_db_id, str(transition_input.plaintext_hash), transition_input.plaintext.dump_nullable()
+                        ))
+                        if transition_input.plaintext.value is not None:
+                            add_addresses(transition_input.plaintext.value)
+                    elif isinstance(transition_input, PrivateTransitionInput):
+                        rows["transition_input_private"].append((
+                            transition_input_db_id, str(transition_input.ciphertext_hash), transition_input.ciphertext.dumps()
+                        ))
+                    elif isinstance(transition_input, RecordTransitionInput):
+                        rows["transition_input_record"].append((
+                            transition_input_db_id, str(transition_input.serial_number), str(transition_input.tag)
+                        ))
+                    elif isinstance(transition_input, ExternalRecordTransitionInput):
+                        rows["transition_input_external_record"].append((
+                            transition_input_db_id, str(transition_input.input_commitment)
+                        ))
+                    else:
+                        raise NotImplementedError
+
+                transition_output: TransitionOutput
+                for output_index, transition_output in enumerate(transition.outputs):
+                    transition_output_db_id = next(ids["transition_output"])
+                    rows["transition_output"].append((transition_output_db_id, transition_db_id, transition_output.type.name, output_index))
+                    if isinstance(transition_output, PublicTransitionOutput):
+                        rows["transition_output_public"].append((
+                            transition_output_db_id, str(transition_output.plaintext_hash), transition_output.plaintext.dump_nullable()
+                        ))
+                    elif isinstance(transition_output, PrivateTransitionOutput):
+                        rows["transition_output_private"].append((
+                            transition_output_db_id, str(transition_output.ciphertext_hash), transition_output.ciphertext.dumps()
+                        ))
+                    elif isinstance(transition_output, RecordTransitionOutput):
+                        rows["transition_output_record"].append((
+                            transition_output_db_id, str(transition_output.commitment), str(transition_output.checksum),
+                            transition_output.record_ciphertext.dumps()
+                        ))
+                    elif isinstance(transition_output, ExternalRecordTransitionOutput):
+                        rows["transition_output_external_record"].append((
+                            transition_output_db_id, str(transition_output.commitment)
+                        ))
+                    elif isinstance(transition_output, FutureTransitionOutput):
+                        transition_output_future_db_id = next(ids["transition_output_future"])
+                        rows["transition_output_future"].append((
+                            transition_output_future_db_id, transition_output_db_id, str(transition_output.future_hash)
+                        ))
+                        if transition_output.future.value is not None:
+                            add_future(transition_output.future.value, 0, transition_output_future_db_id, None)
+                    else:
+                        raise NotImplementedError
+
+            async def copy_rows(statement: LiteralString, data: list[tuple[Any, ...]]):
+                if not data:
+                    return
+                async with cur.copy(statement) as copy:
+                    for row in data:
+                        await copy.write_row(row)
+
+            await copy_rows(
+                "COPY transition (id, transition_id, transaction_id, confirmed_transaction_id, transaction_execute_id, "
+                "fee_id, program_id, function_name, tpk, tcm, index, scm) FROM STDIN",
+                rows["transition"]
+            )
+            await copy_rows("COPY transition_input (id, transition_id, type, index) FROM STDIN", rows["transition_input"])
+            await copy_rows(
+                "COPY transition_input_public (transition_input_id, plaintext_hash, plaintext) FROM STDIN",
+                rows["transition_input_public"]
+            )
+            await copy_rows(
+                "COPY transition_input_private (transition_input_id, ciphertext_hash, ciphertext) FROM STDIN",
+                rows["transition_input_private"]
+            )
+            await copy_rows(
+                "COPY transition_input_record (transition_input_id, serial_number, tag) FROM STDIN",
+                rows["transition_input_record"]
+            )
+            await copy_rows(
+                "COPY transition_input_external_record (transition_input_id, commitment) FROM STDIN",
+                rows["transition_input_external_record"]
+            )
+            await copy_rows("COPY transition_output (id, transition_id, type, index) FROM STDIN", rows["transition_output"])
+            await copy_rows(
+                "COPY transition_output_public (transition_output_id, plaintext_hash, plaintext) FROM STDIN",
+                rows["transition_output_public"]
+            )
+            await copy_rows(
+                "COPY transition_output_private (transition_output_id, ciphertext_hash, ciphertext) FROM STDIN",
+                rows["transition_output_private"]
+            )
+            await copy_rows(
+                "COPY transition_output_record (transition_output_id, commitment, checksum, record_ciphertext) FROM STDIN",
+                rows["transition_output_record"]
+            )
+            await copy_rows(
+                "COPY transition_output_external_record (transition_output_id, commitment) FROM STDIN",
+                rows["transition_output_external_record"]
+            )
+            await copy_rows(
+                "COPY transition_output_future (id, transition_output_id, future_hash) FROM STDIN",
+                rows["transition_output_future"]
+            )
+            for level_futures, level_arguments in zip(future_rows, future_argument_rows):
+                await copy_rows(
+                    "COPY future (id, type, transition_output_future_id, future_argument_id, program_id, function_name) FROM STDIN",
+                    level_futures
+                )
+                await copy_rows("COPY future_argument (id, future_id, type, plaintext) FROM STDIN", level_arguments)
+            await copy_rows(
+                "COPY address_transition (address, transition_id, program_id, function_name, height, timestamp, type) FROM STDIN",
+                rows["address_transition"]
+            )
+
+            await cur.execute(
+                "UPDATE program_function pf SET called = called + c.count "
+                "FROM unnest(%s::int[], %s::text[], %s::int[]) AS c(program_id, name, count) "
+                "WHERE pf.program_id = c.program_id AND pf.name = c.name",
+                ([k[0] for k in called], [k[1] for k in called], list(called.values()))
+            )
+
+
 class DatabaseInsert(DatabaseBase):
 
     def __init__(self, *args, **kwargs): # type: ignore
         super().__init__(*args, **kwargs)
         self.redis_last_history_time = time.monotonic() - 21600
-        self.redis_keys = [
-            "credits.aleo:bonded",
-            "credits.aleo:delegated",
-            "credits.aleo:committee",
-            "address_stake_reward",
-            "address_puzzle_reward",
-            "address_delegate_reward",
-            "address_transfer_in",
-            "address_transfer_out",
-            "address_fee",
-        ]
+        self.network_summary_last_time = 0.0
 
     @staticmethod
     async def _cleanup_unconfirmed_address_transition(conn: psycopg.AsyncConnection[dict[str, Any]], id: Int):
@@ -72,104 +375,7 @@ class DatabaseInsert(DatabaseBase):
                 )
 
 
-    @staticmethod
-    async def _insert_future(conn: psycopg.AsyncConnection[DictRow], future: Future,
-                             transition_output_future_db_id: Optional[int] = None, argument_db_id: Optional[int] = None,):
-        async with conn.cursor() as cur:
-            address_list: list[str] = []
-            if transition_output_future_db_id:
-                await cur.execute(
-                    "INSERT INTO future (type, transition_output_future_id, program_id, function_name) "
-                    "VALUES ('Output', %s, %s, %s) RETURNING id",
-                    (transition_output_future_db_id, str(future.program_id), str(future.function_name))
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise RuntimeError("failed to insert row into database")
-                future_db_id = res["id"]
-                await cur.execute(
-                    "SELECT t.id, t.function_name, t.program_id FROM transition t "
-                    "JOIN transition_output o on t.id = o.transition_id "
-                    "JOIN transition_output_future tof on o.id = tof.transition_output_id "
-                    "WHERE tof.id = %s",
-                    (transition_output_future_db_id,)
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise RuntimeError("database inconsistent")
-                transition_db_id = res["id"]
-                function_name = res["function_name"]
-                program_id = res["program_id"]
-            elif argument_db_id:
-                await cur.execute(
-                    "INSERT INTO future (type, future_argument_id, program_id, function_name) "
-                    "VALUES ('Argument', %s, %s, %s) RETURNING id",
-                    (argument_db_id, str(future.program_id), str(future.function_name))
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise RuntimeError("failed to insert row into database")
-                future_db_id = res["id"]
-                while True:
-                    await cur.execute(
-                        "SELECT f.id, f.transition_output_future_id, f.future_argument_id FROM future f "
-                        "JOIN future_argument a on f.id = a.future_id "
-                        "WHERE a.id = %s",
-                        (argument_db_id,)
-                    )
-                    if (res := await cur.fetchone()) is None:
-                        raise RuntimeError("database inconsistent")
-                    if res["transition_output_future_id"]:
-                        transition_output_future_db_id = res["transition_output_future_id"]
-                        break
-                    argument_db_id = res["future_argument_id"]
-                await cur.execute(
-                    "SELECT t.id, t.function_name, t.program_id FROM transition t "
-                    "JOIN transition_output o on t.id = o.transition_id "
-                    "JOIN transition_output_future tof on o.id = tof.transition_output_id "
-                    "WHERE tof.id = %s",
-                    (transition_output_future_db_id,)
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise RuntimeError("database inconsistent")
-                transition_db_id = res["id"]
-                function_name = res["function_name"]
-                program_id = res["program_id"]
-            else:
-                raise ValueError("transition_output_db_id or argument_db_id must be set")
-            for argument in future.arguments:
-                if isinstance(argument, PlaintextArgument):
-                    plaintext = argument.plaintext
-                    await cur.execute(
-                        "INSERT INTO future_argument (future_id, type, plaintext) VALUES (%s, %s, %s)",
-                        (future_db_id, argument.type.name, plaintext.dump())
-                    )
-                    if isinstance(plaintext, LiteralPlaintext) and plaintext.literal.type == Literal.Type.Address:
-                        address = str(plaintext.literal.primitive)
-                        await cur.execute(
-                            "INSERT INTO address_transition (address, transition_id, program_id, function_name) VALUES (%s, %s, %s, %s)",
-                            (address, transition_db_id, program_id, function_name)
-                        )
-                        address_list.append(address)
-                    elif isinstance(plaintext, StructPlaintext):
-                        addresses = DatabaseUtil.get_addresses_from_struct(plaintext)
-                        for address in addresses:
-                            await cur.execute(
-                                "INSERT INTO address_transition (address, transition_id, program_id, function_name) VALUES (%s, %s, %s, %s)",
-                                (address, transition_db_id, program_id, function_name)
-                            )
-                            address_list.append(address)
-                elif isinstance(argument, FutureArgument):
-                    await cur.execute(
-                        "INSERT INTO future_argument (future_id, type) VALUES (%s, %s) RETURNING id",
-                        (future_db_id, argument.type.name)
-                    )
-                    if (res := await cur.fetchone()) is None:
-                        raise RuntimeError("failed to insert row into database")
-                    argument_db_id = res["id"]
-                    await DatabaseInsert._insert_future(conn, argument.future, argument_db_id=argument_db_id)
-                else:
-                    raise NotImplementedError
-            return address_list
-
-    async def _update_address_stats(self, transaction: Transaction):
+    async def _update_address_stats(self, transaction: Transaction, redis_undo_log: RedisUndoLog):
 
         if isinstance(transaction, DeployTransaction):
             transitions = [cast(Fee, transaction.fee).transition]
@@ -241,177 +447,15 @@ class DatabaseInsert(DatabaseBase):
 
                 if transfer_from != transfer_to:
                     if transfer_from is not None:
-                        await self.redis.hincrby("address_transfer_out", transfer_from, amount) # type: ignore
+                        await redis_undo_log.hincrby("address_transfer_out", {transfer_from: amount})
                     if transfer_to is not None:
-                        await self.redis.hincrby("address_transfer_in", transfer_to, amount) # type: ignore
+                        await redis_undo_log.hincrby("address_transfer_in", {transfer_to: amount})
 
                 if fee_from is not None:
-                    await self.redis.hincrby("address_fee", fee_from, amount) # type: ignore
-
-    @staticmethod
-    async def _insert_transition(conn: psycopg.AsyncConnection[DictRow], redis_conn: Redis[str],
-                                 exe_tx_db_id: Optional[int], fee_db_id: Optional[int],
-                                 transition: Transition, ts_index: int, is_rejected: bool = False, should_exist: bool = False):
-        async with conn.cursor() as cur:
-            await cur.execute(
-                "SELECT id FROM transition WHERE transition_id = %s", (str(transition.id),)
-            )
-            res = await cur.fetchone()
-            if res is not None:
-                if not is_rejected or not should_exist:
-                    await cur.execute(
-                        "DELETE FROM address_transition WHERE transition_id = %s", (res["id"],)
-                    )
-                    await cur.execute(
-                        "DELETE FROM transition WHERE transition_id = %s", (str(transition.id),)
-                    )
-                    # raise RuntimeError("transition already exists in database")
-                else:
-                    return
-            if fee_db_id:
-                await cur.execute(
-                    "SELECT transaction_id FROM fee WHERE id = %s", (fee_db_id,)
-                )
-            elif exe_tx_db_id:
-                await cur.execute(
-                    "SELECT transaction_id FROM transaction_execute WHERE id = %s", (exe_tx_db_id,)
-                )
-            if (res := await cur.fetchone()) is None:
-                raise RuntimeError("transition not exists in database")
-            transaction_id = res["transaction_id"]
-            await cur.execute(
-                "INSERT INTO transition (transition_id, transaction_id, transaction_execute_id, fee_id, program_id, "
-                "function_name, tpk, tcm, index, scm) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id",
-                (str(transition.id), transaction_id, exe_tx_db_id, fee_db_id, str(transition.program_id),
-                 str(transition.function_name), str(transition.tpk), str(transition.tcm), ts_index, str(transition.scm))
-            )
-            if (res := await cur.fetchone()) is None:
-                raise RuntimeError("failed to insert row into database")
-            transition_db_id = res["id"]
-            address_list: list[str] = []
-
-            transition_input: TransitionInput
-            for input_index, transition_input in enumerate(transition.inputs):
-                await cur.execute(
-                    "INSERT INTO transition_input (transition_id, type, index) VALUES (%s, %s, %s) RETURNING id",
-                    (transition_db_id, transition_input.type.name, input_index)
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise RuntimeError("failed to insert row into database")
-                transition_input_db_id = res["id"]
-                if isinstance(transition_input, PublicTransitionInput):
-                    await cur.execute(
-                        "INSERT INTO transition_input_public (transition_input_id, plaintext_hash, plaintext) "
-                        "VALUES (%s, %s, %s)",
-                        (transition_input_db_id, str(transition_input.plaintext_hash),
-                         transition_input.plaintext.dump_nullable())
-                    )
-                    if transition_input.plaintext.value is not None:
-                        plaintext = transition_input.plaintext.value
-                        if isinstance(plaintext, LiteralPlaintext) and plaintext.literal.type == Literal.Type.Address:
-                            address = str(plaintext.literal.primitive)
-                            await cur.execute(
-                                "INSERT INTO address_transition (address, transition_id, program_id, function_name) VALUES (%s, %s, %s, %s)",
-                                (address, transition_db_id, str(transition.program_id), str(transition.function_name))
-                            )
-                            address_list.append(address)
-                        elif isinstance(plaintext, StructPlaintext):
-                            addresses = DatabaseUtil.get_addresses_from_struct(plaintext)
-                            for address in addresses:
-                                await cur.execute(
-                                    "INSERT INTO address_transition (address, transition_id, program_id, function_name) VALUES (%s, %s, %s, %s)",
-                                    (address, transition_db_id, str(transition.program_id), str(transition.function_name))
-                                )
-                                address_list.append(address)
-                elif isinstance(transition_input, PrivateTransitionInput):
-                    await cur.execute(
-                        "INSERT INTO transition_input_private (transition_input_id, ciphertext_hash, ciphertext) "
-                        "VALUES (%s, %s, %s)",
-                        (transition_input_db_id, str(transition_input.ciphertext_hash),
-                         transition_input.ciphertext.dumps())
-                    )
-                elif isinstance(transition_input, RecordTransitionInput):
-                    await cur.execute(
-                        "INSERT INTO transition_input_record (transition_input_id, serial_number, tag) "
-                        "VALUES (%s, %s, %s)",
-                        (transition_input_db_id, str(transition_input.serial_number),
-                         str(transition_input.tag))
-                    )
-                elif isinstance(transition_input, ExternalRecordTransitionInput):
-                    await cur.execute(
-                        "INSERT INTO transition_input_external_record (transition_input_id, commitment) "
-                        "VALUES (%s, %s)",
-                        (transition_input_db_id, str(transition_input.input_commitment))
-                    )
-
-                else:
-                    raise NotImplementedError
-
-            transition_output: TransitionOutput
-            for output_index, transition_output in enumerate(transition.outputs):
-                await cur.execute(
-                    "INSERT INTO transition_output (transition_id, type, index) VALUES (%s, %s, %s) RETURNING id",
-                    (transition_db_id, transition_output.type.name, output_index)
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise RuntimeError("failed to insert row into database")
-                transition_output_db_id = res["id"]
-                if isinstance(transition_output, PublicTransitionOutput):
-                    await cur.execute(
-                        "INSERT INTO transition_output_public (transition_output_id, plaintext_hash, plaintext) "
-                        "VALUES (%s, %s, %s)",
-                        (transition_output_db_id, str(transition_output.plaintext_hash),
-                         transition_output.plaintext.dump_nullable())
-                    )
-                elif isinstance(transition_output, PrivateTransitionOutput):
-                    await cur.execute(
-                        "INSERT INTO transition_output_private (transition_output_id, ciphertext_hash, ciphertext) "
-                        "VALUES (%s, %s, %s)",
-                        (transition_output_db_id, str(transition_output.ciphertext_hash),
-                         transition_output.ciphertext.dumps())
-                    )
-                elif isinstance(transition_output, RecordTransitionOutput):
-                    await cur.execute(
-                        "INSERT INTO transition_output_record (transition_output_id, commitment, checksum, record_ciphertext) "
-                        "VALUES (%s, %s, %s, %s)",
-                        (transition_output_db_id, str(transition_output.commitment),
-                         str(transition_output.checksum), transition_output.record_ciphertext.dumps())
-                    )
-                elif isinstance(transition_output, ExternalRecordTransitionOutput):
-                    await cur.execute(
-                        "INSERT INTO transition_output_external_record (transition_output_id, commitment) "
-                        "VALUES (%s, %s)",
-                        (transition_output_db_id, str(transition_output.commitment))
-                    )
-                elif isinstance(transition_output, FutureTransitionOutput):
-                    await cur.execute(
-                        "INSERT INTO transition_output_future (transition_output_id, future_hash) "
-                        "VALUES (%s, %s) RETURNING id",
-                        (transition_output_db_id, str(transition_output.future_hash))
-                    )
-                    if (res := await cur.fetchone()) is None:
-                        raise Exception("failed to insert row into database")
-                    transition_output_future_db_id = res["id"]
-                    if transition_output.future.value is not None:
-                        address_list += await DatabaseInsert._insert_future(conn, transition_output.future.value, transition_output_future_db_id)
-                else:
-                    raise NotImplementedError
-
-            await cur.execute(
-                "SELECT id FROM program WHERE program_id = %s", (str(transition.program_id),)
-            )
-            if (res := await cur.fetchone()) is None:
-                raise RuntimeError("program in transition does not exist - unconfirmed transaction?")
-            program_db_id = res["id"]
-            await cur.execute(
-                "UPDATE program_function SET called = called + 1 WHERE program_id = %s AND name = %s",
-                (program_db_id, str(transition.function_name))
-            )
-
+                    await redis_undo_log.hincrby("address_fee", {fee_from: amount})
 
     @staticmethod
-    async def _insert_deploy_transaction(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str],
+    async def _insert_deploy_transaction(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str], transition_writer: _TransitionWriter,
                                          deployment: Deployment, owner: ProgramOwner, fee: Fee, transaction_db_id: int,
                                          is_unconfirmed: bool = False, is_rejected: bool = False, fee_should_exist: bool = False):
         async with conn.cursor() as cur:
@@ -446,10 +490,10 @@ class DatabaseInsert(DatabaseBase):
                 raise RuntimeError("failed to insert row into database")
             fee_db_id = res["id"]
 
-            await DatabaseInsert._insert_transition(conn, redis, None, fee_db_id, fee.transition, 0, is_rejected, fee_should_exist)
+            transition_writer.add(transaction_db_id, None, fee_db_id, fee.transition, 0, is_rejected, fee_should_exist)
 
     @staticmethod
-    async def _insert_execute_transaction(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str],
+    async def _insert_execute_transaction(conn: psycopg.AsyncConnection[DictRow], redis: Redis[str], transition_writer: _TransitionWriter,
                                           execution: Execution, fee: Optional[Fee], transaction_db_id: int,
                                           is_rejected: bool = False, ts_should_exist: bool = False):
         async with conn.cursor() as cur:
@@ -472,7 +516,7 @@ class DatabaseInsert(DatabaseBase):
             execute_transaction_db_id = res["id"]
 
             for ts_index, transition in enumerate(execution.transitions):
-                await DatabaseInsert._insert_transition(conn, redis, execute_transaction_db_id, None, transition, ts_index, is_rejected, ts_should_exist)
+                transition_writer.add(transaction_db_id, execute_transaction_db_id, None, transition, ts_index, is_rejected, ts_should_exist)
 
             if fee:
                 await cur.execute(
@@ -483,24 +527,31 @@ class DatabaseInsert(DatabaseBase):
                 if (res := await cur.fetchone()) is None:
                     raise RuntimeError("failed to insert row into database")
                 fee_db_id = res["id"]
-                await DatabaseInsert._insert_transition(conn, redis, None, fee_db_id, fee.transition, 0, is_rejected, ts_should_exist)
+                transition_writer.add(transaction_db_id, None, fee_db_id, fee.transition, 0, is_rejected, ts_should_exist)
 
     async def _insert_transaction(self, conn: psycopg.AsyncConnection[DictRow], redis: Redis[str], transaction: Transaction,
                                   confirmed_transaction: Optional[ConfirmedTransaction] = None, ct_index: Optional[int] = None,
                                   ignore_deploy_txids: Optional[list[str]] = None, confirmed_transaction_db_id: Optional[int] = None,
-                                  reject_reasons: Optional[list[Optional[str]]] = None):
+                                  reject_reasons: Optional[list[Optional[str]]] = None,
+                                  transition_writer: Optional[_TransitionWriter] = None, redis_undo_log: Optional[RedisUndoLog] = None):
+        # without a block level writer, transitions are flushed as soon as the transaction is inserted
+        owns_writer = transition_writer is None
+        if transition_writer is None:
+            transition_writer = _TransitionWriter()
         async with conn.cursor() as cur:
-            optionals = (confirmed_transaction, ct_index, confirmed_transaction_db_id, reject_reasons)
+            optionals = (confirmed_transaction, ct_index, confirmed_transaction_db_id, reject_reasons, redis_undo_log)
             if not (all(x is None for x in optionals) or all(x is not None for x in optionals)):
-                raise ValueError("expected all or none of confirmed_transaction, ct_index, confirmed_transaction_db_id, reject_reasons to be set")
+                raise ValueError("expected all or none of confirmed_transaction, ct_index, confirmed_transaction_db_id, reject_reasons, redis_undo_log to be set")
 
             await cur.execute(
-                "SELECT transaction_id FROM transaction WHERE transaction_id = %s",
+                "SELECT id FROM transaction WHERE transaction_id = %s",
                 (str(transaction.id),)
             )
-            if (await cur.fetchone()) is None: # first seen
+            if (res := await cur.fetchone()) is not None:
+                transaction_db_id: int = res["id"]
+            else: # first seen
                 prior_tx = False
-                transaction_db_id: int = -1
+                transaction_db_id = -1
                 # check for existing transactions and remove unconfirmed transactions
                 # wasteful for now, just a strange edge case avoidance
                 # TODO: refactor
@@ -578,7 +629,7 @@ class DatabaseInsert(DatabaseBase):
                                 "UPDATE transaction SET transaction_id = %s, original_transaction_id = %s, type = 'Fee' WHERE id = %s",
                                 (str(transaction.id), original_transaction_id, transaction_db_id)
                             )
-                            await DatabaseInsert._insert_deploy_transaction(conn, redis, rejected_deployment.deploy, rejected_deployment.program_owner, fee, transaction_db_id, is_rejected=True, fee_should_exist=True)
+                            await DatabaseInsert._insert_deploy_transaction(conn, redis, transition_writer, rejected_deployment.deploy, rejected_deployment.program_owner, fee, transaction_db_id, is_rejected=True, fee_should_exist=True)
 
                     elif isinstance(confirmed_transaction, RejectedExecute):
                         rejected_execution = cast(RejectedExecution, confirmed_transaction.rejected)
@@ -598,7 +649,7 @@ class DatabaseInsert(DatabaseBase):
                                 "UPDATE transaction SET transaction_id = %s, original_transaction_id = %s, type = 'Fee' WHERE id = %s",
                                 (str(transaction.id), original_transaction_id, transaction_db_id)
                             )
-                            await DatabaseInsert._insert_execute_transaction(conn, redis, rejected_execution.execution,
+                            await DatabaseInsert._insert_execute_transaction(conn, redis, transition_writer, rejected_execution.execution,
                                                                              cast(Fee, transaction.fee),
                                                                              transaction_db_id, is_rejected=True,
                                                                              ts_should_exist=True)
@@ -620,27 +671,29 @@ class DatabaseInsert(DatabaseBase):
 
                 if isinstance(transaction, DeployTransaction): # accepted deploy / unconfirmed
                     await DatabaseInsert._insert_deploy_transaction(
-                        conn, redis, transaction.deployment, transaction.owner, cast(Fee, transaction.fee), transaction_db_id,
+                        conn, redis, transition_writer, transaction.deployment, transaction.owner, cast(Fee, transaction.fee), transaction_db_id,
                         is_unconfirmed=(confirmed_transaction is None)
                     )
 
                 elif isinstance(transaction, ExecuteTransaction): # accepted execute / unconfirmed
-                    await DatabaseInsert._insert_execute_transaction(conn, redis, transaction.execution,
+                    await DatabaseInsert._insert_execute_transaction(conn, redis, transition_writer, transaction.execution,
                                                                      cast(Option[Fee], transaction.fee).value,
                                                                      transaction_db_id)
 
                 elif isinstance(transaction, FeeTransaction) and not prior_tx: # first seen rejected tx
                     if isinstance(confirmed_transaction, RejectedDeploy):
                         rejected_deployment = cast(RejectedDeployment, confirmed_transaction.rejected)
-                        await DatabaseInsert._insert_deploy_transaction(conn, redis, rejected_deployment.deploy, rejected_deployment.program_owner, cast(Fee, transaction.fee), transaction_db_id, is_rejected=True)
+                        await DatabaseInsert._insert_deploy_transaction(conn, redis, transition_writer, rejected_deployment.deploy, rejected_deployment.program_owner, cast(Fee, transaction.fee), transaction_db_id, is_rejected=True)
                     elif isinstance(confirmed_transaction, RejectedExecute):
                         rejected_execution = cast(RejectedExecution, confirmed_transaction.rejected)
-                        await DatabaseInsert._insert_execute_transaction(conn, redis, rejected_execution.execution,
+                        await DatabaseInsert._insert_execute_transaction(conn, redis, transition_writer, rejected_execution.execution,
                                                                          cast(Fee, transaction.fee), transaction_db_id,
                                                                          is_rejected=True)
 
             # confirming tx
             if confirmed_transaction is not None:
+                if confirmed_transaction_db_id is None:
+                    raise ValueError("confirmed_transaction_db_id must be set for confirmed transactions")
                 await cur.execute(
                     "UPDATE transaction SET confirmed_transaction_id = %s WHERE transaction_id = %s",
                     (confirmed_transaction_db_id, str(transaction.id))
@@ -656,6 +709,7 @@ class DatabaseInsert(DatabaseBase):
                 )
                 if (res := await cur.fetchone()) is None:
                     raise RuntimeError("database inconsistent")
+                transition_writer.confirm(transaction_db_id, confirmed_transaction_db_id, res["height"], res["timestamp"])
                 await cur.execute(
                     "UPDATE address_transition ats SET height = %s, timestamp = %s "
                     "FROM transition ts, transaction tx WHERE ats.transition_id = ts.id "
@@ -671,6 +725,7 @@ class DatabaseInsert(DatabaseBase):
                         "WHERE at.transition_id = ts.id AND tx.transaction_id = %s",
                         ("Accepted", str(transaction.id))
                     )
+                    transition_writer.set_address_type(transaction_db_id, "Accepted")
                     transaction = cast(DeployTransaction, transaction)
                     if reject_reasons[ct_index] is not None:
                         raise RuntimeError("expected no rejected reason for accepted deploy transaction")
@@ -692,6 +747,7 @@ class DatabaseInsert(DatabaseBase):
                         "WHERE at.transition_id = ts.id AND tx.transaction_id = %s",
                         ("Accepted", str(transaction.id))
                     )
+                    transition_writer.set_address_type(transaction_db_id, "Accepted")
                     if reject_reasons[ct_index] is not None:
                         raise RuntimeError("expected no rejected reason for accepted execute transaction")
 
@@ -705,6 +761,7 @@ class DatabaseInsert(DatabaseBase):
                             "WHERE at.transition_id = ts.id AND tx.transaction_id = %s AND ts.transition_id = %s",
                             ("Accepted", str(transaction.id), str(fee.transition.id))
                         )
+                        transition_writer.set_address_type(transaction_db_id, "Accepted", str(fee.transition.id))
                         rejected = confirmed_transaction.rejected
                         if not isinstance(rejected, RejectedExecution):
                             raise ValueError("expected Rejected Execution transaction")
@@ -715,6 +772,7 @@ class DatabaseInsert(DatabaseBase):
                                 "WHERE at.transition_id = ts.id AND tx.transaction_id = %s AND ts.transition_id = %s",
                                 ("Rejected", str(transaction.id), str(ts.id))
                             )
+                            transition_writer.set_address_type(transaction_db_id, "Rejected", str(ts.id))
                     else:
                         tx = confirmed_transaction.transaction
                         fee = cast(Fee, tx.fee)
@@ -724,12 +782,16 @@ class DatabaseInsert(DatabaseBase):
                             "WHERE at.transition_id = ts.id AND tx.transaction_id = %s AND ts.transition_id = %s",
                             ("Accepted", str(transaction.id), str(fee.transition.id))
                         )
+                        transition_writer.set_address_type(transaction_db_id, "Accepted", str(fee.transition.id))
                     if reject_reasons[ct_index] is None:
                         raise RuntimeError("expected a rejected reason for rejected transaction")
                     await cur.execute("UPDATE confirmed_transaction SET reject_reason = %s WHERE id = %s",
                                       (reject_reasons[ct_index], confirmed_transaction_db_id))
 
-                await self._update_address_stats(transaction)
+                await self._update_address_stats(transaction, cast(RedisUndoLog, redis_undo_log))
+
+            if owns_writer:
+                await transition_writer.flush(conn)
 
     async def save_builtin_program(self, program: Program):
         async with self.write_pool.connection() as conn:
@@ -802,7 +864,8 @@ class DatabaseInsert(DatabaseBase):
         committee_members: dict[Address, tuple[u64, bool_, u8]],
         stakers: dict[Address, tuple[Address, u64]],
         delegated: dict[Address, u64],
-        height: int
+        height: int,
+        redis_undo_log: RedisUndoLog
     ):
         committee_mapping_id = Field.loads(cached_get_mapping_id("credits.aleo", "committee"))
         bonded_mapping_id = Field.loads(cached_get_mapping_id("credits.aleo", "bonded"))
@@ -839,10 +902,7 @@ class DatabaseInsert(DatabaseBase):
                 "key": key,
                 "value": value,
             }
-        await self.redis.execute_command("MULTI") # type: ignore
-        await self.redis.delete("credits.aleo:committee")
-        await self.redis.hset("credits.aleo:committee", mapping={k: json.dumps(v) for k, v in committee_mapping.items()})
-        await self.redis.execute_command("EXEC") # type: ignore
+        await redis_undo_log.replace("credits.aleo:committee", {k: json.dumps(v) for k, v in committee_mapping.items()})
         await cur.execute(
             "INSERT INTO mapping_committee_history (height, content) VALUES (%s, %s) RETURNING id",
             (height, json.dumps({str(i["key"]): i["value"].dump().hex() for i in global_mapping_cache[committee_mapping_id].values()}))
@@ -874,10 +934,7 @@ class DatabaseInsert(DatabaseBase):
                 "key": key,
                 "value": value,
             }
-        await self.redis.execute_command("MULTI") # type: ignore
-        await self.redis.delete("credits.aleo:bonded")
-        await self.redis.hset("credits.aleo:bonded", mapping={k: json.dumps(v) for k, v in bonded_mapping.items()})
-        await self.redis.execute_command("EXEC") # type: ignore
+        await redis_undo_log.replace("credits.aleo:bonded", {k: json.dumps(v) for k, v in bonded_mapping.items()})
         await cur.execute(
             "INSERT INTO mapping_bonded_history (height, content) VALUES (%s, %s) RETURNING id",
             (height, json.dumps({str(i["key"]): i["value"].dump().hex() for i in global_mapping_cache[bonded_mapping_id].values()}))
@@ -897,10 +954,7 @@ class DatabaseInsert(DatabaseBase):
                 "key": key,
                 "value": value,
             }
-        await self.redis.execute_command("MULTI") # type: ignore
-        await self.redis.delete("credits.aleo:delegated")
-        await self.redis.hset("credits.aleo:delegated", mapping={k: json.dumps(v) for k, v in delegated_mapping.items()})
-        await self.redis.execute_command("EXEC") # type: ignore
+        await redis_undo_log.replace("credits.aleo:delegated", {k: json.dumps(v) for k, v in delegated_mapping.items()})
         await cur.execute(
             "INSERT INTO mapping_delegated_history (height, content) VALUES (%s, %s) RETURNING id",
             (height, json.dumps({str(i["key"]): str(i["value"]) for i in global_mapping_cache[delegated_mapping_id].values()}))
@@ -934,7 +988,7 @@ class DatabaseInsert(DatabaseBase):
         return delegated
 
     async def _pre_ratify(self, cur: psycopg.AsyncCursor[dict[str, Any]], ratification: GenesisRatify,
-                          supply_tracker: _SupplyTracker):
+                          supply_tracker: _SupplyTracker, redis_undo_log: RedisUndoLog):
         from interpreter.interpreter import global_mapping_cache
         committee = ratification.committee
         await DatabaseInsert._save_committee_history(cur, 0, committee)
@@ -955,7 +1009,7 @@ class DatabaseInsert(DatabaseBase):
         delegated: dict[Address, u64] = self._stakers_to_delegated(stakers)
 
         committee_members = {address: (amount, is_open, commission) for address, amount, is_open, commission in committee.members}
-        await self._update_committee_bonded_delegated_map(cur, committee_members, stakers, delegated, 0)
+        await self._update_committee_bonded_delegated_map(cur, committee_members, stakers, delegated, 0, redis_undo_log)
 
         public_balances = ratification.public_balances
         operations: list[dict[str, Any]] = []
@@ -1059,7 +1113,7 @@ class DatabaseInsert(DatabaseBase):
         })
 
         from interpreter.interpreter import execute_operations
-        await execute_operations(cast("Database", self), cur, operations)
+        await execute_operations(cast("Database", self), cur, operations, redis_undo_log)
 
     @staticmethod
     async def _get_committee_mapping_unchecked(redis_conn: Redis[str]) -> dict[Address, tuple[bool_, u8]]:
@@ -1211,7 +1265,8 @@ class DatabaseInsert(DatabaseBase):
 
     @profile
     async def _post_ratify(self, cur: psycopg.AsyncCursor[dict[str, Any]], redis_conn: Redis[str], height: int, round_: int,
-                           timestamp: int, ratifications: list[Ratify], address_puzzle_rewards: dict[str, int], supply_tracker: _SupplyTracker):
+                           timestamp: int, ratifications: list[Ratify], address_puzzle_rewards: dict[str, int], supply_tracker: _SupplyTracker,
+                           redis_undo_log: RedisUndoLog):
         from interpreter.interpreter import global_mapping_cache
 
         for ratification in ratifications:
@@ -1247,17 +1302,19 @@ class DatabaseInsert(DatabaseBase):
                         (str(address), height, timestamp, value["committee_stake"], value["stake_reward"], value["delegate_reward"])
                     )
 
-                pipe = self.redis.pipeline()
+                address_stake_rewards: dict[str, int] = defaultdict(int)
                 for address, amount in stake_rewards.items():
-                    pipe.hincrby("address_stake_reward", str(address), amount)
+                    address_stake_rewards[str(address)] += amount
                     supply_tracker.mint(amount)
                     supply_tracker.tally_block_reward(amount)
+                await redis_undo_log.hincrby("address_stake_reward", address_stake_rewards)
 
+                address_delegate_rewards: dict[str, int] = defaultdict(int)
                 for address, value in stake_delegate_reward.items():
-                    pipe.hincrby("address_delegate_reward", str(address), value["delegate_reward"])
-                await pipe.execute() # type: ignore
+                    address_delegate_rewards[str(address)] += value["delegate_reward"]
+                await redis_undo_log.hincrby("address_delegate_reward", address_delegate_rewards)
 
-                await self._update_committee_bonded_delegated_map(cur, committee_members, stakers, delegated, height)
+                await self._update_committee_bonded_delegated_map(cur, committee_members, stakers, delegated, height, redis_undo_log)
                 starting_round = u64(round_)
                 members = Vec[Tuple[Address, u64, bool_, u8], u16]([
                     Tuple[Address, u64, bool_, u8]((address, amount, is_open, commission)) for address, (amount, is_open, commission) in committee_members.items()
@@ -1274,16 +1331,20 @@ class DatabaseInsert(DatabaseBase):
                     continue
                 account_mapping_id = Field.loads(cached_get_mapping_id("credits.aleo", "account"))
 
-                if account_mapping_id not in global_mapping_cache:
-                    from interpreter.finalizer import mapping_cache_read
-                    global_mapping_cache[account_mapping_id] = await mapping_cache_read(cast("Database", self), "credits.aleo", "account")
-
-                current_balances: dict[Field, dict[str, Any]] = global_mapping_cache[account_mapping_id]
+                from interpreter.finalizer import mapping_cache_load, mapping_cache_fetch_keys
+                await mapping_cache_load(cast("Database", self), cur, global_mapping_cache, "credits.aleo", "account")
+                current_balances = global_mapping_cache[account_mapping_id]
+                keys: dict[str, tuple[LiteralPlaintext, Field]] = {}
+                for address in address_puzzle_rewards:
+                    key = LiteralPlaintext(literal=Literal(type_=Literal.Type.Address, primitive=Address.loads(address)))
+                    keys[address] = key, Field.loads(cached_get_key_id("credits.aleo", "account", key.dump()))
+                await mapping_cache_fetch_keys(
+                    cast("Database", self), cur, current_balances, "credits.aleo", "account", [k for _, k in keys.values()]
+                )
 
                 operations: list[dict[str, Any]] = []
                 for address, amount in address_puzzle_rewards.items():
-                    key = LiteralPlaintext(literal=Literal(type_=Literal.Type.Address, primitive=Address.loads(address)))
-                    key_id = Field.loads(cached_get_key_id("credits.aleo", "account", key.dump()))
+                    key, key_id = keys[address]
                     if key_id not in current_balances:
                         current_balance = u64()
                     else:
@@ -1317,39 +1378,33 @@ class DatabaseInsert(DatabaseBase):
                     supply_tracker.mint(amount)
                     supply_tracker.tally_puzzle_reward(amount)
                 from interpreter.interpreter import execute_operations
-                await execute_operations(cast("Database", self), cur, operations)
+                await execute_operations(cast("Database", self), cur, operations, redis_undo_log)
 
     @staticmethod
-    async def _backup_redis_hash_key(redis_conn: Redis[str], keys: list[str], height: int):
-        if height != 0:
-            for key in keys:
-                backup_key = f"{key}:rollback_backup:{height}"
-                if await redis_conn.exists(backup_key) == 0:
-                    if await redis_conn.exists(key) == 1:
-                        await redis_conn.copy(key, backup_key) # type: ignore[arg-type]
-                else:
-                    print("redis backup exists, rolling back")
-                    await redis_conn.copy(backup_key, key, replace=True) # type: ignore[arg-type]
-
-    async def _redis_cleanup(self, redis_conn: Redis[str], keys: list[str], height: int, rollback: bool):
-        if height != 0:
-            now = time.monotonic()
-            history = False
-            if self.redis_last_history_time + 43200 < now:
-                self.redis_last_history_time = now
-                history = True
-            for key in keys:
-                backup_key = f"{key}:rollback_backup:{height}"
-                if await redis_conn.exists(backup_key) == 1:
-                    if rollback:
-                        await redis_conn.copy(backup_key, key, replace=True) # type: ignore[arg-type]
-                    else:
-                        if history:
-                            history_key = f"{key}:history:{height - 1}"
-                            await redis_conn.rename(backup_key, history_key) # type: ignore[arg-type]
-                            await redis_conn.expire(history_key, 60 * 60 * 24 * 3)
-                        else:
-                            await redis_conn.delete(backup_key)
+    async def _start_redis_undo_log(redis_conn: Redis[str], height: int) -> RedisUndoLog:
+        if await redis_conn.exists(RedisUndoLog.log_key(height)) == 1:
+            if await RedisUndoLog.is_committed(redis_conn, height):
+                # left over from a block that was saved before, its changes are not ours to undo
+                await redis_conn.delete(RedisUndoLog.log_key(height))
+            else:
+                print("incomplete redis undo log exists, rolling back")
+                await RedisUndoLog.rollback(redis_conn, height)
+        redis_undo_log = RedisUndoLog(redis_conn, height)
+        await redis_undo_log.start()
+        return redis_undo_log
+
+    async def _redis_cleanup(self, redis_conn: Redis[str], height: int, rollback: bool):
+        if rollback:
+            await RedisUndoLog.rollback(redis_conn, height)
+            return
+        await RedisUndoLog.commit(redis_conn, height)
+        # undo logs are kept for a while so revert_to_last_backup can go back to the last checkpoint
+        await redis_conn.expire(RedisUndoLog.log_key(height), 60 * 60 * 24 * 3)
+        now = time.monotonic()
+        if self.redis_last_history_time + 43200 < now:
+            self.redis_last_history_time = now
+            await redis_conn.zadd(RedisUndoLog.checkpoint_key, {str(height): height})
+            await redis_conn.zremrangebyrank(RedisUndoLog.checkpoint_key, 0, -7)
 
     @profile
     async def _save_block(self, block: Block):
@@ -1359,7 +1414,7 @@ class DatabaseInsert(DatabaseBase):
                 async with conn.cursor() as cur:
                     height = block.height
                     # redis is not protected by transaction so manually saving here
-                    await self._backup_redis_hash_key(self.redis, self.redis_keys, height)
+                    redis_undo_log = await self._start_redis_undo_log(self.redis, height)
                     signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
 
                     try:
@@ -1401,10 +1456,10 @@ class DatabaseInsert(DatabaseBase):
                                 if ratification.amount != puzzle_reward:
                                     raise RuntimeError("invalid puzzle reward")
                             elif isinstance(ratification, GenesisRatify):
-                                await self._pre_ratify(cur, ratification, supply_tracker)
+                                await self._pre_ratify(cur, ratification, supply_tracker, redis_undo_log)
 
                         from interpreter.interpreter import finalize_block
-                        reject_reasons = await finalize_block(cast("Database", self), cur, block)
+                        reject_reasons = await finalize_block(cast("Database", self), cur, block, redis_undo_log)
 
                         await cur.execute(
                             "INSERT INTO block (height, block_hash, previous_hash, previous_state_root, transactions_root, "
@@ -1424,6 +1479,10 @@ class DatabaseInsert(DatabaseBase):
                         if (res := await cur.fetchone()) is None:
                             raise RuntimeError("failed to insert row into database")
                         block_db_id = res["id"]
+                        await cur.execute(
+                            "INSERT INTO block_raw (block_id, data) VALUES (%s, %s)",
+                            (block_db_id, zlib.compress(block.dump()))
+                        )
 
                         # dag_transmission_ids: tuple[dict[str, int], dict[str, int]] = {}, {}
 
@@ -1532,6 +1591,7 @@ class DatabaseInsert(DatabaseBase):
                                 else:
                                     raise ValueError("expected deploy transaction")
 
+                        transition_writer = _TransitionWriter()
                         for ct_index, confirmed_transaction in enumerate(block.transactions):
                             confirmed_transaction: ConfirmedTransaction
                             await cur.execute(
@@ -1545,7 +1605,8 @@ class DatabaseInsert(DatabaseBase):
                             transaction = confirmed_transaction.transaction
 
                             await self._insert_transaction(conn, self.redis, transaction, confirmed_transaction, ct_index, ignore_deploy_txids,
-                                                           confirmed_transaction_db_id, reject_reasons)
+                                                           confirmed_transaction_db_id, reject_reasons, transition_writer,
+                                                           redis_undo_log)
 
                             update_copy_data: list[tuple[int, str, str, str]] = []
                             for index, finalize_operation in enumerate(confirmed_transaction.finalize):
@@ -1598,6 +1659,7 @@ class DatabaseInsert(DatabaseBase):
                                 async with cur.copy("COPY finalize_operation_update_kv (finalize_operation_id, mapping_id, key_id, value_id) FROM STDIN") as copy:
                                     for row in update_copy_data:
                                         await copy.write_row(row)
+                        await transition_writer.flush(conn)
 
                         for index, ratify in enumerate(block.ratifications):
                             if isinstance(ratify, GenesisRatify):
@@ -1661,10 +1723,51 @@ class DatabaseInsert(DatabaseBase):
                                 async with cur.copy("COPY solution (puzzle_solution_id, address, counter, target, reward, epoch_hash, solution_id) FROM STDIN") as copy:
                                     for row in copy_data:
                                         await copy.write_row(row)
-                                for address, reward in address_puzzle_rewards.items():
-                                    pipe = self.redis.pipeline()
-                                    pipe.hincrby("address_puzzle_reward", address, reward)
-                                    await pipe.execute() # type: ignore
+                                await redis_undo_log.hincrby("address_puzzle_reward", address_puzzle_rewards)
+
+                        # running totals for the hashrate windows, see DatabaseAddress.get_window_work
+                        prover_works: dict[str, list[int]] = defaultdict(lambda: [0, 0]) # address: [solution count, work]
+                        if block.solutions.value is not None and not os.environ.get("DEBUG_SKIP_COINBASE"):
+                            await cur.execute("SELECT proof_target FROM block WHERE height = %s", (block.height - 1,))
+                            if (res := await cur.fetchone()) is None:
+                                raise RuntimeError("failed to retrieve previous proof target")
+                            for solution in block.solutions.value.solutions:
+                                prover_work = prover_works[str(solution.partial_solution.address)]
+                                prover_work[0] += 1
+                                prover_work[1] += int(res["proof_target"])
+                        block_solution_count = sum(x[0] for x in prover_works.values())
+                        block_work = sum(x[1] for x in prover_works.values())
+                        await cur.execute(
+                            "SELECT cumulative_solution_count, cumulative_work FROM block_work ORDER BY timestamp DESC LIMIT 1"
+                        )
+                        if (res := await cur.fetchone()) is None:
+                            res = {"cumulative_solution_count": 0, "cumulative_work": 0}
+                        await cur.execute(
+                            "INSERT INTO block_work "
+                            "(block_id, timestamp, solution_count, work, cumulative_solution_count, cumulative_work) "
+                            "VALUES (%s, %s, %s, %s, %s, %s)",
+                            (block_db_id, block.header.metadata.timestamp, block_solution_count, block_work,
+                             res["cumulative_solution_count"] + block_solution_count, res["cumulative_work"] + block_work)
+                        )
+                        if prover_works:
+                            await cur.execute(
+                                "SELECT a.address, w.cumulative_solution_count, w.cumulative_work "
+                                "FROM UNNEST(%s::text[]) a(address) "
+                                "JOIN LATERAL (SELECT cumulative_solution_count, cumulative_work FROM prover_work "
+                                "WHERE address = a.address ORDER BY timestamp DESC LIMIT 1) w ON true",
+                                (list(prover_works),)
+                            )
+                            prover_totals = {x["address"]: x for x in await cur.fetchall()}
+                            async with cur.copy(
+                                "COPY prover_work (block_id, address, timestamp, solution_count, work, "
+                                "cumulative_solution_count, cumulative_work) FROM STDIN"
+                            ) as copy:
+                                for address, (solution_count, work) in prover_works.items():
+                                    totals = prover_totals.get(address, {"cumulative_solution_count": 0, "cumulative_work": 0})
+                                    await copy.write_row((
+                                        block_db_id, address, block.header.metadata.timestamp, solution_count, work,
+                                        totals["cumulative_solution_count"] + solution_count, totals["cumulative_work"] + work
+                                    ))
 
                         for aborted in block.aborted_transactions_ids:
                             await cur.execute(
@@ -1680,7 +1783,7 @@ class DatabaseInsert(DatabaseBase):
 
                         await self._post_ratify(
                             cur, self.redis, block.height, block.round, block.header.metadata.timestamp,
-                            block.ratifications.ratifications, address_puzzle_rewards, supply_tracker
+                            block.ratifications.ratifications, address_puzzle_rewards, supply_tracker, redis_undo_log
                         )
 
                         if os.environ.get("DEBUG_MAPPING_DUMP", False):
@@ -1811,23 +1914,37 @@ class DatabaseInsert(DatabaseBase):
                                 last_epoch_avg_staked = sum(trend["committee_stake"] for trend in trends) / 360
                                 last_epoch_apr = float(last_epoch_total_rewards / last_epoch_avg_staked) * (3600 / last_epoch_time) * 24 * 365 * 100
                                 validators_last_epoch_apr[validator["address"]] = float(last_epoch_apr)
-                            await self.redis.execute_command("MULTI") # type: ignore
-                            await self.redis.delete("validator_last_epoch_apr")
-                            await self.redis.hset("validator_last_epoch_apr", mapping={k: json.dumps(v) for k, v in validators_last_epoch_apr.items()})
-                            await self.redis.execute_command("EXEC") # type: ignore
+                            await redis_undo_log.replace(
+                                "validator_last_epoch_apr", {k: json.dumps(v) for k, v in validators_last_epoch_apr.items()}
+                            )
 
 
                         signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
-                        await self._redis_cleanup(self.redis, self.redis_keys, block.height, False)
 
                         await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseBlockAdded, block.header.metadata.height))
                     except Exception as e:
                         signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
-                        await self._redis_cleanup(self.redis, self.redis_keys, block.height, True)
+                        await self._redis_cleanup(self.redis, block.height, True)
                         signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
                         await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                         raise
+            # only after the database commit, a crash before this leaves the log to be rolled back on the next attempt
+            try:
+                await self._redis_cleanup(self.redis, block.height, False)
+            except Exception as e:
+                # the block is committed, an unmarked log is only rolled back if the height is saved again
+                await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
             signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+        # after the commit, so readers loading the block will find it
+        now = time.monotonic()
+        # while catching up on old blocks the summary is rebuilt at most once a minute instead of for every block
+        if block.header.metadata.timestamp > time.time() - 300 or self.network_summary_last_time + 60 < now:
+            self.network_summary_last_time = now
+            await self.save_network_summary(block.height)
+        try:
+            await self.redis.publish(HotBlockCache.channel, str(block.height))
+        except Exception as e:
+            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
 
     async def cleanup_unconfirmed_transactions(self):
         async with self.pool.connection() as conn:
@@ -2072,6 +2189,14 @@ class DatabaseInsert(DatabaseBase):
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
+    async def save_network_summary(self, height: int):
+        # only called once the block is committed, so a failure here is reported but doesn't fail the block
+        try:
+            summary = await cast(DatabaseBlock, self).build_network_summary(height)
+            await self.redis.set("network_summary", json.dumps(summary))
+        except Exception as e:
+            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+
     # start_timestamp: 5min eg: 1722964800(2024-08-07 01:20:00) < 1722964875(block1 timestamp)
     async def update_hashrate(self, start_timestamp: int):
         async with self.write_pool.connection() as conn:
@@ -2079,25 +2204,8 @@ class DatabaseInsert(DatabaseBase):
                 try:
                     now = int(time.time())
                     while start_timestamp <= now:
-                        await cur.execute(
-                            "SELECT b.height FROM solution s "
-                            "JOIN puzzle_solution ps ON ps.id = s.puzzle_solution_id "
-                            "JOIN block b ON b.id = ps.block_id "
-                            "WHERE timestamp > %s AND timestamp < %s",
-                            (start_timestamp - 900, start_timestamp)
-                        )
-                        partial_solutions = await cur.fetchall()
-                        heights = list(map(lambda x: x['height'], partial_solutions))
-                        ref_heights = list(map(lambda x: x - 1, set(heights)))
-                        await cur.execute(
-                            "SELECT height, proof_target FROM block WHERE height = ANY(%s::bigint[])", (ref_heights,)
-                        )
-                        ref_proof_targets = await cur.fetchall()
-                        ref_proof_target_dict = dict(map(lambda x: (x['height'], x['proof_target']), ref_proof_targets))
-                        total_solutions = 0
-                        for height in heights:
-                            total_solutions += ref_proof_target_dict[height - 1]
-                        hashrate = total_solutions / 900
+                        _, work = await DatabaseAddress.get_window_work(cur, start_timestamp - 899, start_timestamp)
+                        hashrate = work / 900
                         await cur.execute(
                             "INSERT INTO hashrate (timestamp, hashrate) VALUES (%s, %s) "
                             "ON CONFLICT (timestamp) DO UPDATE SET hashrate = %s",
@@ -7,6 +7,8 @@ from aleo_types import *
 from aleo_types.cached import cached_get_mapping_id
 from explorer.types import Message as ExplorerMessage
 from .base import DatabaseBase
+from .util import RedisUndoLog
+from collections import defaultdict
 from typing import cast
 
 
@@ -46,6 +48,44 @@ class DatabaseMapping(DatabaseBase):
             async with conn.cursor() as cur:
                 return await self.get_mapping_cache_with_cur(cur, program_name, mapping_name)
 
+    async def get_mapping_cache_keys_with_cur(self, cur: psycopg.AsyncCursor[dict[str, Any]], program_name: str,
+                                              mapping_name: str, key_ids: list[Field]) -> dict[Field, Any]:
+        if not key_ids:
+            return {}
+        if program_name == "credits.aleo" and mapping_name in ["committee", "bonded", "delegated"]:
+            values = await self.redis.hmget(f"{program_name}:{mapping_name}", [str(k) for k in key_ids]) # type: ignore[arg-type]
+            result: dict[Field, Any] = {}
+            for key_id, v in zip(key_ids, values):
+                if v is not None:
+                    d = json.loads(v)
+                    result[key_id] = {
+                        "key": Plaintext.load(BytesIO(bytes.fromhex(d["key"]))),
+                        "value": Value.load(BytesIO(bytes.fromhex(d["value"]))),
+                    }
+            return result
+        mapping_id = Field.loads(cached_get_mapping_id(program_name, mapping_name))
+        try:
+            await cur.execute(
+                "SELECT key_id, key, value FROM mapping_value mv "
+                "JOIN mapping m on mv.mapping_id = m.id "
+                "WHERE m.mapping_id = %s AND mv.key_id = ANY(%s::text[])",
+                (str(mapping_id), [str(k) for k in key_ids])
+            )
+            return {
+                Field.loads(x["key_id"]): {
+                    "key": Plaintext.load(BytesIO(x["key"])),
+                    "value": Value.load(BytesIO(x["value"])),
+                } for x in await cur.fetchall()
+            }
+        except Exception as e:
+            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
+            raise
+
+    async def get_mapping_cache_keys(self, program_name: str, mapping_name: str, key_ids: list[Field]) -> dict[Field, Any]:
+        async with self.pool.connection() as conn:
+            async with conn.cursor() as cur:
+                return await self.get_mapping_cache_keys_with_cur(cur, program_name, mapping_name, key_ids)
+
     async def get_mapping_value(self, program_id: str, mapping: str, key_id: str) -> Optional[bytes]:
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
@@ -229,110 +269,142 @@ class DatabaseMapping(DatabaseBase):
                     await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                     raise
 
-    async def update_mapping_key_value(self, cur: psycopg.AsyncCursor[dict[str, Any]], program_name: str,
-                                       mapping_name: str, mapping_id: str, key_id: str, value_id: str,
-                                       key: bytes, value: bytes, height: int, from_transaction: bool):
+    async def update_mapping_key_values(self, cur: psycopg.AsyncCursor[dict[str, Any]], operations: list[dict[str, Any]],
+                                        redis_undo_log: RedisUndoLog):
+        """
+        Applies a list of UpdateKeyValue and RemoveKeyValue operations in order, writing mapping values, history and
+        public balances. Mapping ids and last history ids are looked up once, history rows are written with one COPY
+        and the other tables with one statement each. The redis copies of the limited tracking mappings are changed
+        through the block's undo log.
+        """
+        if not operations:
+            return
         try:
-            limited_tracking = program_name == "credits.aleo" and mapping_name in ["committee", "bonded", "delegated"]
-            if limited_tracking:
-                conn = self.redis
-                data = {
-                    "key": key.hex(),
-                    "value": value.hex(),
-                }
-                await conn.hset(f"{program_name}:{mapping_name}", key_id, json.dumps(data))
+            redis_changes: dict[str, dict[str, Optional[str]]] = defaultdict(dict)
+            tracked: list[dict[str, Any]] = []
+            for operation in operations:
+                program_name = operation["program_name"]
+                mapping_name = operation["mapping_name"]
+                limited_tracking = program_name == "credits.aleo" and mapping_name in ["committee", "bonded", "delegated"]
+                key_id = str(operation["key_id"])
+                if operation["type"] == FinalizeOperation.Type.UpdateKeyValue:
+                    key = operation["key"].dump()
+                    value = operation["value"].dump()
+                elif operation["type"] == FinalizeOperation.Type.RemoveKeyValue:
+                    key = operation["key"].dump()
+                    value = None
+                else:
+                    raise ValueError(f"unexpected operation type {operation['type']}")
+                if limited_tracking:
+                    if value is None:
+                        redis_changes[f"{program_name}:{mapping_name}"][key_id] = None
+                    else:
+                        data = {
+                            "key": key.hex(),
+                            "value": value.hex(),
+                        }
+                        redis_changes[f"{program_name}:{mapping_name}"][key_id] = json.dumps(data)
+                if not limited_tracking or operation["from_transaction"]:
+                    tracked.append({
+                        "mapping_id": str(operation["mapping_id"]),
+                        "key_id": key_id,
+                        "value_id": str(operation["value_id"]) if value is not None else None,
+                        "key": key,
+                        "value": value,
+                        "height": operation["height"],
+                        "from_transaction": operation["from_transaction"],
+                        "limited_tracking": limited_tracking,
+                        "account": program_name == "credits.aleo" and mapping_name == "account",
+                    })
+            for redis_key, changes in redis_changes.items():
+                await redis_undo_log.update(redis_key, changes)
+            if not tracked:
+                return
 
-            if not limited_tracking or from_transaction:
-                await cur.execute("SELECT id FROM mapping WHERE mapping_id = %s", (mapping_id,))
-                mapping = await cur.fetchone()
-                if mapping is None:
+            mapping_ids = list({t["mapping_id"] for t in tracked})
+            await cur.execute("SELECT id, mapping_id FROM mapping WHERE mapping_id = ANY(%s::text[])", (mapping_ids,))
+            mapping_db_ids = {row["mapping_id"]: row["id"] for row in await cur.fetchall()}
+            for mapping_id in mapping_ids:
+                if mapping_id not in mapping_db_ids:
                     raise ValueError(f"mapping {mapping_id} not found")
-                mapping_id = mapping['id']
 
-                if not limited_tracking:
-                    await cur.execute(
-                        "INSERT INTO mapping_value (mapping_id, key_id, value_id, key, value) "
-                        "VALUES (%s, %s, %s, %s, %s) "
-                        "ON CONFLICT (mapping_id, key_id) DO UPDATE SET value_id = %s, value = %s",
-                        (mapping_id, key_id, value_id, key, value, value_id, value)
-                    )
+            key_ids = list({t["key_id"] for t in tracked})
+            await cur.execute(
+                "SELECT key_id, last_history_id FROM mapping_history_last_id WHERE key_id = ANY(%s::text[])",
+                (key_ids,)
+            )
+            last_history_ids: dict[str, Optional[int]] = {row["key_id"]: row["last_history_id"] for row in await cur.fetchall()}
 
-                await cur.execute(
-                    "SELECT last_history_id FROM mapping_history_last_id WHERE key_id = %s",
-                    (key_id,)
-                )
-                previous_id = res['last_history_id'] if (res := await cur.fetchone()) is not None else None
+            await cur.execute(
+                "SELECT nextval(pg_get_serial_sequence('mapping_history', 'id')) AS id FROM generate_series(1, %s)",
+                (len(tracked),)
+            )
+            history_ids = iter(sorted(row["id"] for row in await cur.fetchall()))
 
+            history_rows: list[tuple[Any, ...]] = []
+            # only the final state of each key is written to mapping_value / address
+            values: dict[tuple[int, str], dict[str, Any]] = {}
+            public_credits: dict[str, int] = {}
+            for t in tracked:
+                mapping_db_id = mapping_db_ids[t["mapping_id"]]
+                key_id = t["key_id"]
+                history_id = next(history_ids)
+                history_rows.append((
+                    history_id, mapping_db_id, t["height"], key_id, t["key"], t["value"], t["from_transaction"],
+                    last_history_ids.get(key_id)
+                ))
+                last_history_ids[key_id] = history_id
+                if not t["limited_tracking"]:
+                    values[(mapping_db_id, key_id)] = t
+                if t["account"] and t["value"] is not None:
+                    address = str(Plaintext.load(BytesIO(t["key"])))
+                    plaintextvalue = cast(PlaintextValue, Value.load(BytesIO(t["value"])))
+                    plaintext = cast(LiteralPlaintext, plaintextvalue.plaintext)
+                    public_credits[address] = cast(int, plaintext.literal.primitive)
+
+            updated = [(k, t) for k, t in values.items() if t["value"] is not None]
+            removed = [k for k, t in values.items() if t["value"] is None]
+            if updated:
                 await cur.execute(
-                    "INSERT INTO mapping_history (mapping_id, height, key_id, key, value, from_transaction, previous_id) "
-                    "VALUES (%s, %s, %s, %s, %s, %s, %s) "
-                    "RETURNING id",
-                    (mapping_id, height, key_id, key, value, from_transaction, previous_id)
+                    "INSERT INTO mapping_value (mapping_id, key_id, value_id, key, value) "
+                    "SELECT * FROM unnest(%s::int[], %s::text[], %s::text[], %s::bytea[], %s::bytea[]) "
+                    "ON CONFLICT (mapping_id, key_id) DO UPDATE SET value_id = excluded.value_id, value = excluded.value",
+                    (
+                        [k[0] for k, _ in updated],
+                        [k[1] for k, _ in updated],
+                        [t["value_id"] for _, t in updated],
+                        [t["key"] for _, t in updated],
+                        [t["value"] for _, t in updated],
+                    )
                 )
-                if (res := await cur.fetchone()) is None:
-                    raise ValueError("failed to insert mapping history")
-                latest_id = res['id']
+            if removed:
                 await cur.execute(
-                    "INSERT INTO mapping_history_last_id (key_id, last_history_id) VALUES (%s, %s) "
-                    "ON CONFLICT (key_id) DO UPDATE SET last_history_id = %s",
-                    (key_id, latest_id, latest_id)
+                    "DELETE FROM mapping_value USING unnest(%s::int[], %s::text[]) AS r(mapping_id, key_id) "
+                    "WHERE mapping_value.mapping_id = r.mapping_id AND mapping_value.key_id = r.key_id",
+                    ([k[0] for k in removed], [k[1] for k in removed])
                 )
 
-                if program_name == "credits.aleo" and mapping_name == "account":
-                    address = str(Plaintext.load(BytesIO(key)))
-                    plaintextvalue = cast(PlaintextValue, Value.load(BytesIO(value)))
-                    plaintext = cast(LiteralPlaintext, plaintextvalue.plaintext)
-                    public_balance = cast(int, plaintext.literal.primitive)
-                    await cur.execute(
-                        "INSERT INTO address (address, public_credits) VALUES (%s, %s) "
-                        "ON CONFLICT (address) DO UPDATE SET public_credits = %s",
-                        (address, public_balance, public_balance)
-                    )
-
-        except Exception as e:
-            await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
-            raise
-
-    async def remove_mapping_key_value(self, cur: psycopg.AsyncCursor[dict[str, Any]], program_name: str,
-                                       mapping_name: str, mapping_id: str, key_id: str, key: bytes, height: int,
-                                       from_transaction: bool):
-        try:
-            limited_tracking = program_name == "credits.aleo" and mapping_name in ["committee", "bonded", "delegated"]
-            if limited_tracking:
-                conn = self.redis
-                await conn.hdel(f"{program_name}:{mapping_name}", key_id)
-
-            if not limited_tracking or from_transaction:
-                await cur.execute("SELECT id FROM mapping WHERE mapping_id = %s", (mapping_id,))
-                mapping = await cur.fetchone()
-                if mapping is None:
-                    raise ValueError(f"mapping {mapping_id} not found")
-                mapping_id = mapping['id']
-                if not limited_tracking:
-                    await cur.execute(
-                        "DELETE FROM mapping_value WHERE mapping_id = %s AND key_id = %s",
-                        (mapping_id, key_id)
-                    )
+            async with cur.copy(
+                "COPY mapping_history (id, mapping_id, height, key_id, key, value, from_transaction, previous_id) "
+                "FROM STDIN"
+            ) as copy:
+                for row in history_rows:
+                    await copy.write_row(row)
 
-                await cur.execute(
-                    "SELECT last_history_id FROM mapping_history_last_id WHERE key_id = %s",
-                    (key_id,)
-                )
-                previous_id = res['last_history_id'] if (res := await cur.fetchone()) is not None else None
+            last_ids = {key_id: last_history_ids[key_id] for key_id in key_ids}
+            await cur.execute(
+                "INSERT INTO mapping_history_last_id (key_id, last_history_id) "
+                "SELECT * FROM unnest(%s::text[], %s::bigint[]) "
+                "ON CONFLICT (key_id) DO UPDATE SET last_history_id = excluded.last_history_id",
+                (list(last_ids.keys()), list(last_ids.values()))
+            )
 
+            if public_credits:
                 await cur.execute(
-                    "INSERT INTO mapping_history (mapping_id, height, key_id, key, value, from_transaction, previous_id) "
-                    "VALUES (%s, %s, %s, %s, NULL, %s, %s) "
-                    "RETURNING id",
-                    (mapping_id, height, key_id, key, from_transaction, previous_id)
-                )
-                if (res := await cur.fetchone()) is None:
-                    raise ValueError("failed to insert mapping history")
-                latest_id = res['id']
-                await cur.execute(
-                    "INSERT INTO mapping_history_last_id (key_id, last_history_id) VALUES (%s, %s) "
-                    "ON CONFLICT (key_id) DO UPDATE SET last_history_id = %s",
-                    (key_id, latest_id, latest_id)
+                    "INSERT INTO address (address, public_credits) "
+                    "SELECT * FROM unnest(%s::text[], %s::numeric[]) "
+                    "ON CONFLICT (address) DO UPDATE SET public_credits = excluded.public_credits",
+                    (list(public_credits.keys()), list(public_credits.values()))
                 )
 
         except Exception as e:
@@ -17,7 +17,9 @@ class DatabaseMigrate(DatabaseBase):
     # migration methods
     async def migrate(self):
         migrations: list[tuple[int, Callable[[psycopg.AsyncConnection[DictRow], Redis[str]], Awaitable[None]]]] = [
-            (1, self.migrate_1_add_address_transition_type)
+            (1, self.migrate_1_add_address_transition_type),
+            (2, self.migrate_2_add_block_raw),
+            (3, self.migrate_3_add_block_prover_work),
         ]
         async with self.pool.connection() as conn:
             async with conn.cursor() as cur:
@@ -103,4 +105,67 @@ class DatabaseMigrate(DatabaseBase):
                         "UPDATE address_transition_summary at SET rejected_transition_count = %s "
                         "WHERE address = %s AND program_id = %s AND function_name = %s", 
                         (res["count"], atm["address"], atm["program_id"], atm["function_name"])
-                    )
\ No newline at end of file
+                    )
+
+    async def migrate_2_add_block_raw(self, conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        # existing blocks are not backfilled, reading them falls back to the normalized tables
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "CREATE TABLE IF NOT EXISTS block_raw ("
+                "block_id integer NOT NULL CONSTRAINT block_raw_pk PRIMARY KEY "
+                "CONSTRAINT block_raw_block_id_fk REFERENCES block(id) ON DELETE CASCADE, "
+                "data bytea NOT NULL)"
+            )
+            await cur.execute("ALTER TABLE block_raw ALTER COLUMN data SET STORAGE EXTERNAL")
+
+    async def migrate_3_add_block_prover_work(self, conn: psycopg.AsyncConnection[DictRow], redis: Redis[str]):
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "CREATE TABLE IF NOT EXISTS block_work ("
+                "block_id integer NOT NULL CONSTRAINT block_work_pk PRIMARY KEY "
+                "CONSTRAINT block_work_block_id_fk REFERENCES block(id) ON DELETE CASCADE, "
+                "timestamp bigint NOT NULL, solution_count integer NOT NULL, work numeric(40,0) NOT NULL, "
+                "cumulative_solution_count bigint NOT NULL, cumulative_work numeric(60,0) NOT NULL)"
+            )
+            await cur.execute("CREATE INDEX IF NOT EXISTS block_work_timestamp_index ON block_work (timestamp)")
+            await cur.execute(
+                "CREATE TABLE IF NOT EXISTS prover_work ("
+                "block_id integer NOT NULL CONSTRAINT prover_work_block_id_fk REFERENCES block(id) ON DELETE CASCADE, "
+                "address text NOT NULL, timestamp bigint NOT NULL, solution_count integer NOT NULL, "
+                "work numeric(40,0) NOT NULL, cumulative_solution_count bigint NOT NULL, "
+                "cumulative_work numeric(60,0) NOT NULL, CONSTRAINT prover_work_pk PRIMARY KEY (block_id, address))"
+            )
+            await cur.execute("CREATE INDEX IF NOT EXISTS prover_work_address_timestamp_index ON prover_work (address, timestamp)")
+            await cur.execute("SELECT EXISTS (SELECT 1 FROM block_work)")
+            if (res := await cur.fetchone()) is None or res["exists"]:
+                # created from pg_dump.sql and filled since the first block
+                return
+            # a solution's work is the proof target of the block before the one including it
+            await cur.execute(
+                "CREATE TEMPORARY TABLE _solution_work ON COMMIT DROP AS "
+                "SELECT ps.block_id, s.address, b.timestamp, COUNT(*) AS solution_count, SUM(pb.proof_target) AS work "
+                "FROM solution s "
+                "JOIN puzzle_solution ps ON ps.id = s.puzzle_solution_id "
+                "JOIN block b ON b.id = ps.block_id "
+                "JOIN block pb ON pb.height = b.height - 1 "
+                "GROUP BY ps.block_id, s.address, b.timestamp"
+            )
+            await cur.execute(
+                "INSERT INTO block_work "
+                "(block_id, timestamp, solution_count, work, cumulative_solution_count, cumulative_work) "
+                "SELECT b.id, b.timestamp, COALESCE(w.solution_count, 0), COALESCE(w.work, 0), "
+                "SUM(COALESCE(w.solution_count, 0)) OVER (ORDER BY b.height), "
+                "SUM(COALESCE(w.work, 0)) OVER (ORDER BY b.height) "
+                "FROM block b LEFT JOIN ("
+                "SELECT block_id, SUM(solution_count) AS solution_count, SUM(work) AS work "
+                "FROM _solution_work GROUP BY block_id"
+                ") w ON w.block_id = b.id"
+            )
+            await cur.execute(
+                "INSERT INTO prover_work "
+                "(block_id, address, timestamp, solution_count, work, cumulative_solution_count, cumulative_work) "
+                "SELECT block_id, address, timestamp, solution_count, work, "
+                "SUM(solution_count) OVER (PARTITION BY address ORDER BY timestamp), "
+                "SUM(work) OVER (PARTITION BY address ORDER BY timestamp) "
+                "FROM _solution_work"
+            )
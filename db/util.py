@@ -1,18 +1,114 @@
 from __future__ import annotations
 
+import json
 import signal
 
 from aleo_explorer_rust import get_value_id
+from redis.asyncio import Redis
 
 from aleo_types import *
 from explorer.types import Message as ExplorerMessage
+from util.global_cache import HotBlockCache, clear_program_caches, program_cache_channel
 from .base import DatabaseBase
 from .block import DatabaseBlock
 
 
-class DatabaseUtil(DatabaseBase):
+class RedisUndoLog:
+    """
+    Per block undo log for the redis hashes maintained while saving blocks (credits.aleo:bonded, address_fee, ...).
+
+    Before a block changes a hash field, the field's previous value (or null if it didn't exist) is saved once into
+    redis_undo:{height}. Rolling the block back replays those values, so only the fields touched by the block are
+    copied instead of the whole hashes. Once the block is committed to the database the log is marked as such, a log
+    without the mark belongs to a block that never made it and is rolled back before the block is saved again.
+    """
+
+    checkpoint_key = "redis_undo:checkpoints"
+    # fields of the log that aren't undo entries
+    meta_fields = ("height", "committed")
+
+    def __init__(self, redis_conn: Redis[str], height: int):
+        self.redis = redis_conn
+        self.height = height
+        self.key = self.log_key(height)
+
+    @staticmethod
+    def log_key(height: int):
+        return f"redis_undo:{height}"
+
+    async def start(self):
+        # marks the block as started even if it doesn't touch any hash
+        await self.redis.hset(self.key, "height", self.height) # type: ignore
+
+    async def _record(self, key: str, fields: list[str]):
+        if not fields:
+            return
+        values = await self.redis.hmget(key, fields) # type: ignore[arg-type]
+        pipe = self.redis.pipeline()
+        for field, value in zip(fields, values):
+            pipe.hsetnx(self.key, json.dumps([key, field]), json.dumps(value))
+        await pipe.execute() # type: ignore
+
+    async def hincrby(self, key: str, increments: dict[str, int]):
+        await self._record(key, list(increments.keys()))
+        pipe = self.redis.pipeline()
+        for field, amount in increments.items():
+            pipe.hincrby(key, field, amount)
+        await pipe.execute() # type: ignore
+
+    async def update(self, key: str, mapping: dict[str, Optional[str]]):
+        # None removes the field
+        await self._record(key, list(mapping.keys()))
+        pipe = self.redis.pipeline()
+        for field, value in mapping.items():
+            if value is None:
+                pipe.hdel(key, field)
+            else:
+                pipe.hset(key, field, value)
+        await pipe.execute() # type: ignore
+
+    async def replace(self, key: str, mapping: dict[str, str]):
+        current: dict[str, str] = await self.redis.hgetall(key) # type: ignore
+        changed = {field: value for field, value in mapping.items() if current.get(field) != value}
+        removed = [field for field in current if field not in mapping]
+        if not changed and not removed:
+            return
+        pipe = self.redis.pipeline()
+        for field in list(changed.keys()) + removed:
+            pipe.hsetnx(self.key, json.dumps([key, field]), json.dumps(current.get(field)))
+        if changed:
+            pipe.hset(key, mapping=changed) # type: ignore[arg-type]
+        if removed:
+            pipe.hdel(key, *removed)
+        await pipe.execute() # type: ignore
 
-    redis_keys: list[str]
+    @staticmethod
+    async def is_committed(redis_conn: Redis[str], height: int) -> bool:
+        return await redis_conn.hexists(RedisUndoLog.log_key(height), "committed") # type: ignore
+
+    @staticmethod
+    async def commit(redis_conn: Redis[str], height: int):
+        await redis_conn.hset(RedisUndoLog.log_key(height), "committed", 1) # type: ignore
+
+    @staticmethod
+    async def rollback(redis_conn: Redis[str], height: int):
+        log_key = RedisUndoLog.log_key(height)
+        entries: dict[str, str] = await redis_conn.hgetall(log_key) # type: ignore
+        pipe = redis_conn.pipeline()
+        for field, value in entries.items():
+            if field in RedisUndoLog.meta_fields:
+                continue
+            key, hash_field = json.loads(field)
+            previous = json.loads(value)
+            if previous is None:
+                pipe.hdel(key, hash_field)
+            else:
+                pipe.hset(key, hash_field, previous)
+        pipe.delete(log_key)
+        await pipe.execute() # type: ignore
+
+
+class DatabaseUtil(DatabaseBase):
 
     @staticmethod
     def get_addresses_from_struct(plaintext: StructPlaintext):
@@ -30,6 +126,15 @@ class DatabaseUtil(DatabaseBase):
         literal = cast(LiteralPlaintext, plaintext).literal
         return literal.primitive
 
+    async def save_ingest_queue_depth(self, depth: int):
+        await self.redis.set("explorer:ingest_queue_depth", depth)
+
+    async def get_ingest_queue_depth(self) -> int:
+        depth = await self.redis.get("explorer:ingest_queue_depth")
+        if depth is None:
+            return 0
+        return int(depth)
+
     # debug method
     async def clear_database(self):
         async with self.pool.connection() as conn:
@@ -44,6 +149,8 @@ class DatabaseUtil(DatabaseBase):
                 await conn.execute("TRUNCATE TABLE mapping_delegated_history RESTART IDENTITY CASCADE")
                 await conn.execute("TRUNCATE TABLE ratification_genesis_balance RESTART IDENTITY CASCADE")
                 await self.redis.flushall()
+                clear_program_caches()
+                await self.redis.publish(program_cache_channel, "")
             except Exception as e:
                 await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                 raise
@@ -54,19 +161,19 @@ class DatabaseUtil(DatabaseBase):
             async with conn.transaction():
                 async with conn.cursor() as cur:
                     try:
-                        cursor, keys = await self.redis.scan(0, f"{self.redis_keys[0]}:history:*", 500)
-                        if cursor != 0:
-                            raise RuntimeError("unsupported configuration")
-                        if not keys:
+                        checkpoints = await self.redis.zrevrange(RedisUndoLog.checkpoint_key, 0, 0)
+                        if not checkpoints:
                             raise RuntimeError("no backup found")
-                        keys = sorted(keys, key=lambda x: int(x.split(":")[-1]))
-                        last_backup = keys[-1]
-                        last_backup_height = int(last_backup.split(":")[-1])
-                        for redis_key in self.redis_keys:
-                            backup_key = f"{redis_key}:history:{last_backup_height}"
-                            if not await self.redis.exists(backup_key):
-                                raise RuntimeError(f"backup key not found: {backup_key}")
-                            await self.redis.persist(backup_key)
+                        last_backup_height = int(checkpoints[0])
+                        await cur.execute("SELECT height FROM block ORDER BY height DESC LIMIT 1")
+                        if (res := await cur.fetchone()) is None:
+                            raise RuntimeError("no block in database")
+                        latest_height: int = res["height"]
+                        for height in range(latest_height, last_backup_height, -1):
+                            log_key = RedisUndoLog.log_key(height)
+                            if not await self.redis.exists(log_key):
+                                raise RuntimeError(f"undo log not found: {log_key}")
+                            await self.redis.persist(log_key)
                         print(f"reverting to last backup: {last_backup_height}")
 
                         print("fetching old mapping values from mapping history")
@@ -232,19 +339,15 @@ class DatabaseUtil(DatabaseBase):
                             (last_backup_height,)
                         )
 
-                        for redis_key in self.redis_keys:
-                            backup_key = f"{redis_key}:history:{last_backup_height}"
-                            await self.redis.copy(backup_key, redis_key, replace=True) # type: ignore[arg-type]
-                            await self.redis.persist(redis_key)
-                            await self.redis.persist(backup_key)
-
-                            # remove rollback backup as well
-                            _, keys = await self.redis.scan(0, f"{redis_key}:rollback_backup:*", 100)
-                            for key in keys:
-                                await self.redis.delete(key)
+                        for height in range(latest_height, last_backup_height, -1):
+                            await RedisUndoLog.rollback(self.redis, height)
 
                     except Exception as e:
                         await self.message_callback(ExplorerMessage(ExplorerMessage.Type.DatabaseError, e))
                         signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
                         raise
-        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
\ No newline at end of file
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+        clear_program_caches()
+        await self.redis.publish(program_cache_channel, str(last_backup_height))
+        await cast("Database", self).save_network_summary(last_backup_height)
+        await self.redis.publish(HotBlockCache.channel, str(last_backup_height))
\ No newline at end of file
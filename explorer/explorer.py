@@ -4,6 +4,7 @@ import traceback
 from sys import stdout
 import time
 import json
+from typing import Optional
 import requests
 
 import rpc
@@ -38,6 +39,16 @@ class Explorer:
         self.dev_mode = False
         self.latest_height = 0
         self.latest_block_hash: BlockHash = Network.genesis_block.block_hash
+        # blocks accepted from the node but not saved yet, latest_height / latest_block_hash already include them
+        ingest_queue_size = int(os.environ.get("BLOCK_INGEST_QUEUE_SIZE", 0))
+        self.ingest_queue: Optional[asyncio.Queue[Block]] = None
+        if ingest_queue_size > 0:
+            self.ingest_queue = asyncio.Queue(maxsize=ingest_queue_size)
+        self.pending_blocks: dict[int, Block] = {}
+        # latest block saved by the persister, which is the database tip
+        self.persisted_height = 0
+        self.persisted_block_hash: BlockHash = Network.genesis_block.block_hash
+        self.persist_task: Optional[asyncio.Task[None]] = None
         self.scheduler = TornadoScheduler()
         self.scheduler.start()
 
@@ -53,14 +64,21 @@ class Explorer:
         elif isinstance(request, Request.ProcessUnconfirmedTransaction):
             await self.db.save_unconfirmed_transaction(request.tx)
         elif isinstance(request, Request.ProcessBlock):
-            await self.add_block(request.block)
+            if self.ingest_queue is None:
+                await self.add_block(request.block)
+            else:
+                await self.enqueue_block(request.block)
         elif isinstance(request, Request.GetBlockByHeight):
             return await self.db.get_block_by_height(request.height)
         elif isinstance(request, Request.GetBlockHashByHeight):
             if request.height == self.latest_height:
                 return self.latest_block_hash
+            if (block := self.pending_blocks.get(request.height)) is not None:
+                return block.block_hash
             return await self.db.get_block_hash_by_height(request.height)
         elif isinstance(request, Request.GetBlockHeaderByHeight):
+            if (block := self.pending_blocks.get(request.height)) is not None:
+                return block.header
             return await self.db.get_block_header_by_height(request.height)
         elif isinstance(request, Request.RevertToBlock):
             raise NotImplementedError
@@ -93,7 +111,11 @@ class Explorer:
             if latest_block_hash is None:
                 raise ValueError("no block in database")
             self.latest_block_hash = latest_block_hash
+            self.persisted_height = latest_height
+            self.persisted_block_hash = latest_block_hash
             print(f"latest height: {self.latest_height}")
+            if self.ingest_queue is not None:
+                self.start_persister()
             self.node = Node(explorer_message=self.message, explorer_request=self.node_request)
             await self.node.connect(os.environ.get("P2P_NODE_HOST", "127.0.0.1"), int(os.environ.get("P2P_NODE_PORT", "4133")))
             # _ = asyncio.create_task(webapi.run())
@@ -128,6 +150,12 @@ class Explorer:
             print("explorer error:", e)
             traceback.print_exc()
             raise
+        finally:
+            if self.persist_task is not None:
+                self.persist_task.remove_done_callback(self.persister_done)
+                self.persist_task.cancel()
+            if self.node is not None:
+                await self.node.stop()
 
     async def add_block(self, block: Block):
         if block in [Network.genesis_block, Network.dev_genesis_block]:
@@ -143,6 +171,79 @@ class Explorer:
             self.latest_height = block.header.metadata.height
             self.latest_block_hash = block.block_hash
 
+    async def enqueue_block(self, block: Block):
+        if block.previous_hash != self.latest_block_hash:
+            print(f"ignoring block {block} because previous block hash does not match")
+            return
+        if self.ingest_queue is None:
+            raise RuntimeError("block ingest queue is not enabled")
+        height = block.header.metadata.height
+        self.pending_blocks[height] = block
+        self.latest_height = height
+        self.latest_block_hash = block.block_hash
+        # waits here when the persister falls behind, which in turn slows down the node
+        await self.ingest_queue.put(block)
+        await self.report_ingest_queue_depth()
+
+    async def report_ingest_queue_depth(self):
+        # only a metric, it must never hold up or break ingest
+        if self.ingest_queue is None:
+            return
+        try:
+            await asyncio.wait_for(self.db.save_ingest_queue_depth(self.ingest_queue.qsize()), timeout=1)
+        except Exception as e:
+            print("failed to save ingest queue depth:", e)
+
+    def start_persister(self):
+        self.persist_task = asyncio.create_task(self.persist_blocks())
+        self.persist_task.add_done_callback(self.persister_done)
+
+    def persister_done(self, task: asyncio.Task[None]):
+        # enqueue_block would wait forever on a full queue without a persister, so it's never left dead
+        if task.cancelled():
+            return
+        if (e := task.exception()) is not None:
+            print("block persister error:", e)
+            traceback.print_exception(e)
+            # the block it was working on may be lost, so sync again from the database tip
+            self.rewind_to_persisted()
+        self.start_persister()
+
+    def rewind_to_persisted(self):
+        # drops everything queued, the tip is rewound before yielding so no block gets accepted on top of the dropped ones
+        if self.ingest_queue is not None:
+            while not self.ingest_queue.empty():
+                self.ingest_queue.get_nowait()
+        self.pending_blocks.clear()
+        self.latest_height = self.persisted_height
+        self.latest_block_hash = self.persisted_block_hash
+        if self.node is not None:
+            self.node.reset_sync()
+
+    async def persist_blocks(self):
+        if self.ingest_queue is None:
+            raise RuntimeError("block ingest queue is not enabled")
+        while True:
+            block = await self.ingest_queue.get()
+            height = block.header.metadata.height
+            if block.previous_hash != self.persisted_block_hash:
+                # queued on top of a block that failed to save
+                print(f"dropping block {block} because previous block hash does not match")
+                self.pending_blocks.pop(height, None)
+                continue
+            try:
+                print(f"adding block {block}")
+                await self.db.save_block(block)
+            except Exception:
+                traceback.print_exc()
+                # everything queued after the failed block depends on it, drop it all and sync again from the database
+                self.rewind_to_persisted()
+            else:
+                self.pending_blocks.pop(height, None)
+                self.persisted_height = height
+                self.persisted_block_hash = block.block_hash
+            await self.report_ingest_queue_depth()
+
     async def get_latest_block(self):
         return await self.db.get_latest_block()
 
@@ -0,0 +1,143 @@
+from enum import IntEnum
+
+from aleo_types import *
+from util.global_cache import global_finalize_cache
+from .environment import Registers
+from .instruction import compile_instruction
+from .utils import CompiledOperand, compile_operand, FinalizeState
+
+
+class Op(IntEnum):
+    Instruction = 0
+    Contains = 1
+    Get = 2
+    GetOrUse = 3
+    Set = 4
+    Remove = 5
+    RandChaCha = 6
+    BranchEq = 7
+    BranchNeq = 8
+    Position = 9
+    Await = 10
+
+
+class CompiledCommand:
+    """
+    A finalize command with everything that doesn't depend on the execution resolved: the handler, operand accessors,
+    mapping locators and branch targets. The original command is kept for disassembly.
+    """
+    __slots__ = ("op", "command", "run", "program_id", "mapping", "key", "value", "default", "first", "second",
+                 "operands", "destination", "target")
+
+    def __init__(self, op: Op, command: Command):
+        self.op = op
+        self.command = command
+        self.run: Callable[[Registers, FinalizeState], None] = _not_instruction
+        self.program_id = ""
+        self.mapping = Identifier(value="")
+        self.key: CompiledOperand
+        self.value: CompiledOperand
+        self.default: CompiledOperand
+        self.first: CompiledOperand
+        self.second: CompiledOperand
+        self.operands: list[CompiledOperand] = []
+        self.destination: Register
+        self.target = 0
+
+
+def _not_instruction(registers: Registers, finalize_state: FinalizeState):
+    raise TypeError("not an instruction")
+
+
+def _mapping_locator(command: CompiledCommand, operator: CallOperator, program: Program):
+    if isinstance(operator, LocatorCallOperator):
+        command.program_id = str(operator.locator.id)
+        command.mapping = operator.locator.resource
+    elif isinstance(operator, ResourceCallOperator):
+        command.program_id = str(program.id)
+        command.mapping = operator.resource
+    else:
+        raise TypeError("invalid locator type")
+
+
+def compile_command(c: Command, finalize: Finalize, program: Program) -> CompiledCommand:
+    if isinstance(c, InstructionCommand):
+        compiled = CompiledCommand(Op.Instruction, c)
+        compiled.run = compile_instruction(c.instruction, program)
+    elif isinstance(c, ContainsCommand):
+        compiled = CompiledCommand(Op.Contains, c)
+        _mapping_locator(compiled, c.mapping, program)
+        compiled.key = compile_operand(c.key)
+        compiled.destination = c.destination
+    elif isinstance(c, GetCommand | GetOrUseCommand):
+        if isinstance(c, GetOrUseCommand):
+            compiled = CompiledCommand(Op.GetOrUse, c)
+            compiled.default = compile_operand(c.default)
+        else:
+            compiled = CompiledCommand(Op.Get, c)
+        _mapping_locator(compiled, c.mapping, program)
+        compiled.key = compile_operand(c.key)
+        compiled.destination = c.destination
+    elif isinstance(c, SetCommand):
+        compiled = CompiledCommand(Op.Set, c)
+        compiled.program_id = str(program.id)
+        compiled.mapping = c.mapping
+        compiled.key = compile_operand(c.key)
+        compiled.value = compile_operand(c.value)
+    elif isinstance(c, RemoveCommand):
+        compiled = CompiledCommand(Op.Remove, c)
+        compiled.program_id = str(program.id)
+        compiled.mapping = c.mapping
+        compiled.key = compile_operand(c.key)
+    elif isinstance(c, RandChaChaCommand):
+        compiled = CompiledCommand(Op.RandChaCha, c)
+        compiled.operands = [compile_operand(o) for o in c.operands]
+        compiled.destination = c.destination
+    elif isinstance(c, (BranchEqCommand, BranchNeqCommand)):
+        compiled = CompiledCommand(Op.BranchEq if isinstance(c, BranchEqCommand) else Op.BranchNeq, c)
+        compiled.first = compile_operand(c.first)
+        compiled.second = compile_operand(c.second)
+        compiled.target = finalize.positions[c.position]
+    elif isinstance(c, PositionCommand):
+        compiled = CompiledCommand(Op.Position, c)
+    elif isinstance(c, AwaitCommand):
+        compiled = CompiledCommand(Op.Await, c)
+        compiled.destination = c.register
+    else:
+        raise NotImplementedError
+    return compiled
+
+
+def _destination(c: Command) -> Optional[Register]:
+    if isinstance(c, InstructionCommand):
+        literals = c.instruction.literals
+        if isinstance(literals, Literals | CastInstruction | HashInstruction | CommitInstruction):
+            return literals.destination
+        return None
+    if isinstance(c, ContainsCommand | GetCommand | GetOrUseCommand | RandChaChaCommand):
+        return c.destination
+    return None
+
+
+class CompiledFinalize:
+    __slots__ = ("commands", "register_count")
+
+    def __init__(self, finalize: Finalize, program: Program):
+        self.commands = [compile_command(c, finalize, program) for c in finalize.commands]
+        registers: list[Register] = [i.register for i in finalize.inputs]
+        for c in finalize.commands:
+            if (destination := _destination(c)) is not None:
+                registers.append(destination)
+        self.register_count = max((int(r.locator) + 1 for r in registers if isinstance(r, LocatorRegister)), default=0)
+
+
+def compile_finalize(program: Program, function_name: Identifier) -> CompiledFinalize:
+    key = (str(program.id), str(function_name))
+    if (compiled := global_finalize_cache.get(key)) is not None:
+        return compiled
+    function = program.functions[function_name]
+    if function.finalize.value is None:
+        raise ValueError("invalid finalize function")
+    compiled = CompiledFinalize(function.finalize.value, program)
+    global_finalize_cache[key] = compiled
+    return compiled
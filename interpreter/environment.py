@@ -1,19 +1,40 @@
-from aleo_types import Value
+from typing import Iterator, Optional
+
+from aleo_types import Plaintext, FutureValue
+
+RegisterValue = Plaintext | FutureValue
 
 
 class Registers:
+    """
+    Register file of a finalize execution, indexed by register locator. Plaintexts are stored as is and only wrapped
+    in PlaintextValue when they leave the finalizer.
+    """
+    __slots__ = ("_registers",)
 
-    def __init__(self):
-        self._registers: dict[int, Value] = {}
+    def __init__(self, size: int = 0):
+        self._registers: list[Optional[RegisterValue]] = [None] * size
 
-    def __getitem__(self, index: int):
-        if index not in self._registers:
+    def __getitem__(self, index: int) -> RegisterValue:
+        try:
+            value = self._registers[index]
+        except IndexError:
             raise IndexError(index)
-        return self._registers[index]
+        if value is None:
+            raise IndexError(index)
+        return value
+
+    def __setitem__(self, index: int, value: RegisterValue):
+        try:
+            self._registers[index] = value
+        except IndexError:
+            self._registers.extend([None] * (index + 1 - len(self._registers)))
+            self._registers[index] = value
 
-    def __setitem__(self, index: int, value: Value):
-        self._registers[index] = value
+    def __iter__(self) -> Iterator[RegisterValue]:
+        return (r for r in self._registers if r is not None)
 
     def dump(self):
-        for i, r in self._registers.items():
-            print(f"r{i} = {r}")
+        for i, r in enumerate(self._registers):
+            if r is not None:
+                print(f"r{i} = {r}")
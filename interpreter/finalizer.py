@@ -1,6 +1,6 @@
 import os
 import time
-from typing import ParamSpec, Awaitable
+from typing import ParamSpec, Awaitable, MutableMapping
 
 import psycopg
 from aleo_explorer_rust import RustExecuteError
@@ -9,10 +9,10 @@ from aleo_types import *
 from aleo_types.cached import cached_get_key_id, cached_get_mapping_id
 from db import Database
 from disasm.aleo import disasm_instruction, disasm_command
-from util.global_cache import MappingCacheDict, get_program
+from util.global_cache import MappingCache, MappingCacheDict, MappingCacheStore, get_program
+from .compiler import Op, compile_finalize
 from .environment import Registers
-from .instruction import execute_instruction
-from .utils import load_plaintext_from_operand, store_plaintext_to_register, FinalizeState, load_future_from_register
+from .utils import store_plaintext_to_register, FinalizeState, load_future_from_register
 
 try:
     from line_profiler import profile
@@ -32,6 +32,38 @@ async def mapping_cache_read_with_cur(db: Database, cur: psycopg.AsyncCursor[dic
                                       mapping_name: str) -> MappingCacheDict:
     return await db.get_mapping_cache_with_cur(cur, program_name, mapping_name)
 
+async def mapping_cache_load(db: Database, cur: Optional[psycopg.AsyncCursor[dict[str, Any]]],
+                             mapping_cache: MappingCacheStore, program_name: str, mapping_name: str) -> Field:
+    mapping_id = Field.loads(cached_get_mapping_id(program_name, mapping_name))
+    if mapping_id in mapping_cache:
+        return mapping_id
+    if not mapping_cache.preload and mapping_id not in mapping_cache.pinned:
+        # keys are read on demand by mapping_cache_fetch_keys
+        mapping_cache.new(mapping_id, {}, False)
+    elif cur:
+        mapping_cache[mapping_id] = await mapping_cache_read_with_cur(db, cur, program_name, mapping_name)
+    else:
+        mapping_cache[mapping_id] = await mapping_cache_read(db, program_name, mapping_name)
+    return mapping_id
+
+async def mapping_cache_fetch_keys(db: Database, cur: Optional[psycopg.AsyncCursor[dict[str, Any]]], mapping_cache: MappingCacheDict,
+                                   program_name: str, mapping_name: str, key_ids: list[Field]):
+    # only incomplete caches can miss keys that exist in the mapping
+    if not isinstance(mapping_cache, MappingCache):
+        return
+    unknown = [key_id for key_id in dict.fromkeys(key_ids) if not mapping_cache.known(key_id)]
+    if not unknown:
+        return
+    if cur is None:
+        data = await db.get_mapping_cache_keys(program_name, mapping_name, unknown)
+    else:
+        data = await db.get_mapping_cache_keys_with_cur(cur, program_name, mapping_name, unknown)
+    for key_id in unknown:
+        if key_id in data:
+            mapping_cache[key_id] = data[key_id]
+        else:
+            mapping_cache.set_missing(key_id)
+
 class ExecuteError(Exception):
     def __init__(self, message: str, exception: Optional[Exception], instruction: str, transition_id: TransitionID,
                  program: Optional[str] = None, function_name: Optional[str] = None):
@@ -47,15 +79,16 @@ class ExecuteError(Exception):
 async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict[str, Any]]], finalize_state: FinalizeState,
                             transition_id: TransitionID, program: Program,
                             function_name: Identifier, inputs: list[Value],
-                            mapping_cache: dict[Field, MappingCacheDict],
-                            local_mapping_cache: dict[Field, MappingCacheDict],
+                            mapping_cache: MappingCacheStore,
+                            local_mapping_cache: MappingCacheStore | MutableMapping[Field, MappingCacheDict],
                             allow_state_change: bool) -> list[dict[str, Any]]:
-    registers = Registers()
     operations: list[dict[str, Any]] = []
     function = program.functions[function_name]
     if function.finalize.value is None:
         raise ValueError("invalid finalize function")
     finalize = function.finalize.value
+    compiled = compile_finalize(program, function_name)
+    registers = Registers(compiled.register_count)
 
     if len(inputs) != len(finalize.inputs):
         raise TypeError("invalid number of inputs")
@@ -65,7 +98,12 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
         ir = fi.register
         if not isinstance(ir, LocatorRegister):
             raise TypeError("invalid input register type")
-        registers[int(ir.locator)] = i
+        if isinstance(i, PlaintextValue):
+            registers[int(ir.locator)] = i.plaintext
+        elif isinstance(i, FutureValue):
+            registers[int(ir.locator)] = i
+        else:
+            raise TypeError("invalid input value type")
 
     debug = os.environ.get("DEBUG", False)
     timer = time.perf_counter_ns()
@@ -75,19 +113,17 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
 
     pc = 0
 
-    async def load_mapping_cache_id(program_id_: ProgramID, mapping_: Identifier):
-        mapping_id_ = Field.loads(cached_get_mapping_id(str(program_id_), str(mapping_)))
-        if mapping_id_ not in mapping_cache:
-            if cur:
-                mapping_cache[mapping_id_] = await mapping_cache_read_with_cur(db, cur, str(program_id_), str(mapping_))
-            else:
-                mapping_cache[mapping_id_] = await mapping_cache_read(db, str(program_id_), str(mapping_))
+    async def load_mapping_cache_id(program_id_: str, mapping_: Identifier):
+        mapping_id_ = await mapping_cache_load(db, cur, mapping_cache, program_id_, str(mapping_))
         if not allow_state_change and mapping_id_ not in local_mapping_cache:
             local_mapping_cache[mapping_id_] = {}
         return mapping_id_
 
-    while pc < len(finalize.commands):
-        c = finalize.commands[pc]
+    commands = compiled.commands
+    while pc < len(commands):
+        cc = commands[pc]
+        op = cc.op
+        c = cc.command
         if debug:
             if isinstance(c, InstructionCommand):
                 print(disasm_instruction(c.instruction))
@@ -95,29 +131,32 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
                 print(disasm_command(c))
 
         try:
-            if isinstance(c, InstructionCommand):
-                instruction = c.instruction
+            if op is Op.Instruction:
                 try:
-                    execute_instruction(instruction, program, registers, finalize_state)
+                    cc.run(registers, finalize_state)
                 except (AssertionError, OverflowError, ZeroDivisionError, RustExecuteError) as e:
-                    raise ExecuteError(str(e), e, disasm_instruction(instruction), transition_id, str(program.id), str(function_name))
+                    raise ExecuteError(str(e), e, disasm_instruction(cast(InstructionCommand, c).instruction), transition_id, str(program.id), str(function_name))
                 except Exception:
                     registers.dump()
                     raise
 
-            elif isinstance(c, ContainsCommand):
-                operator = c.mapping
-                if isinstance(operator, LocatorCallOperator):
-                    program_id = operator.locator.id
-                    mapping = operator.locator.resource
-                elif isinstance(operator, ResourceCallOperator):
-                    program_id = program.id
-                    mapping = operator.resource
-                else:
-                    raise TypeError("invalid locator type")
+            elif op is Op.BranchEq or op is Op.BranchNeq:
+                first = cc.first.load_plaintext(registers, finalize_state)
+                second = cc.second.load_plaintext(registers, finalize_state)
+                if (first == second and op is Op.BranchEq) or (first != second and op is Op.BranchNeq):
+                    pc = cc.target
+                    continue
+
+            elif op is Op.Position:
+                pass
+
+            elif op is Op.Contains:
+                program_id = cc.program_id
+                mapping = cc.mapping
                 mapping_id = await load_mapping_cache_id(program_id, mapping)
-                key = load_plaintext_from_operand(c.key, registers, finalize_state)
-                key_id = Field.loads(cached_get_key_id(str(program_id), str(mapping), key.dump()))
+                key = cc.key.load_plaintext(registers, finalize_state)
+                key_id = Field.loads(cached_get_key_id(program_id, str(mapping), key.dump()))
+                await mapping_cache_fetch_keys(db, cur, mapping_cache[mapping_id], program_id, str(mapping), [key_id])
                 if not allow_state_change and key_id in local_mapping_cache[mapping_id]:
                     contains = local_mapping_cache[mapping_id][key_id]["value"] is not None
                 else:
@@ -131,35 +170,28 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
                         )
                     )
                 )
-                destination = c.destination
-                store_plaintext_to_register(value.plaintext, destination, registers)
-
-            elif isinstance(c, GetCommand | GetOrUseCommand):
-                operator = c.mapping
-                if isinstance(operator, LocatorCallOperator):
-                    program_id = operator.locator.id
-                    mapping = operator.locator.resource
-                elif isinstance(operator, ResourceCallOperator):
-                    program_id = program.id
-                    mapping = operator.resource
-                else:
-                    raise TypeError("invalid locator type")
+                store_plaintext_to_register(value.plaintext, cc.destination, registers)
+
+            elif op is Op.Get or op is Op.GetOrUse:
+                program_id = cc.program_id
+                mapping = cc.mapping
                 mapping_id = await load_mapping_cache_id(program_id, mapping)
-                key = load_plaintext_from_operand(c.key, registers, finalize_state)
-                key_id = Field.loads(cached_get_key_id(str(program_id), str(mapping), key.dump()))
+                key = cc.key.load_plaintext(registers, finalize_state)
+                key_id = Field.loads(cached_get_key_id(program_id, str(mapping), key.dump()))
+                await mapping_cache_fetch_keys(db, cur, mapping_cache[mapping_id], program_id, str(mapping), [key_id])
                 if not allow_state_change and key_id in local_mapping_cache[mapping_id]:
                     if local_mapping_cache[mapping_id][key_id]["value"] is None:
-                        if isinstance(c, GetCommand):
+                        if op is Op.Get:
                             raise ExecuteError(f"key {key} not found in mapping {mapping}", None, disasm_command(c), transition_id, str(program.id), str(function_name))
-                        default = load_plaintext_from_operand(c.default, registers, finalize_state)
+                        default = cc.default.load_plaintext(registers, finalize_state)
                         value = PlaintextValue(plaintext=default)
                     else:
                         value = local_mapping_cache[mapping_id][key_id]["value"]
                 else:
                     if key_id not in mapping_cache[mapping_id]:
-                        if isinstance(c, GetCommand):
+                        if op is Op.Get:
                             raise ExecuteError(f"key {key} not found in mapping {mapping}", None, disasm_command(c), transition_id, str(program.id), str(function_name))
-                        default = load_plaintext_from_operand(c.default, registers, finalize_state)
+                        default = cc.default.load_plaintext(registers, finalize_state)
                         value = PlaintextValue(plaintext=default)
                     else:
                         value = mapping_cache[mapping_id][key_id]["value"]
@@ -167,14 +199,13 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
                     print(f"get {mapping}[{key}] = {value}")
                 if not isinstance(value, PlaintextValue):
                     raise TypeError("invalid value type")
-                destination = c.destination
-                store_plaintext_to_register(value.plaintext, destination, registers)
-
-            elif isinstance(c, SetCommand):
-                mapping_id = await load_mapping_cache_id(program.id, c.mapping)
-                key = load_plaintext_from_operand(c.key, registers, finalize_state)
-                value = PlaintextValue(plaintext=load_plaintext_from_operand(c.value, registers, finalize_state))
-                key_id = Field.loads(cached_get_key_id(str(program.id), str(c.mapping), key.dump()))
+                store_plaintext_to_register(value.plaintext, cc.destination, registers)
+
+            elif op is Op.Set:
+                mapping_id = await load_mapping_cache_id(cc.program_id, cc.mapping)
+                key = cc.key.load_plaintext(registers, finalize_state)
+                value = PlaintextValue(plaintext=cc.value.load_plaintext(registers, finalize_state))
+                key_id = Field.loads(cached_get_key_id(cc.program_id, str(cc.mapping), key.dump()))
                 value_id = Field.loads(aleo_explorer_rust.get_value_id(str(key_id), value.dump()))
                 effective_mapping_cache = local_mapping_cache if not allow_state_change else mapping_cache
                 if key_id not in effective_mapping_cache[mapping_id]:
@@ -185,23 +216,24 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
                 else:
                     effective_mapping_cache[mapping_id][key_id]["value"] = value
                 if debug:
-                    print(f"set {c.mapping}[{key}] = {value}")
+                    print(f"set {cc.mapping}[{key}] = {value}")
                 del effective_mapping_cache
                 operations.append({
                     "type": FinalizeOperation.Type.UpdateKeyValue,
-                    "program_name": str(program.id),
+                    "program_name": cc.program_id,
                     "mapping_id": mapping_id,
                     "key_id": key_id,
                     "value_id": value_id,
-                    "mapping_name": c.mapping,
+                    "mapping_name": cc.mapping,
                     "key": key,
                     "value": value,
                     "height": finalize_state.block_height,
                     "from_transaction": True,
                 })
 
-            elif isinstance(c, RandChaChaCommand):
-                additional_seeds = list(map(lambda x: PlaintextValue(plaintext=load_plaintext_from_operand(x, registers, finalize_state)).dump(), c.operands))
+            elif op is Op.RandChaCha:
+                c = cast(RandChaChaCommand, c)
+                additional_seeds = [PlaintextValue(plaintext=o.load_plaintext(registers, finalize_state)).dump() for o in cc.operands]
                 chacha_seed = aleo_explorer_rust.chacha_random_seed(
                     finalize_state.random_seed,
                     transition_id.dump(),
@@ -219,15 +251,16 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
                         primitive=value,
                     )
                 )
-                store_plaintext_to_register(res, c.destination, registers)
+                store_plaintext_to_register(res, cc.destination, registers)
 
-            elif isinstance(c, RemoveCommand):
-                mapping_id = await load_mapping_cache_id(program.id, c.mapping)
-                key = load_plaintext_from_operand(c.key, registers, finalize_state)
-                key_id = Field.loads(cached_get_key_id(str(program.id), str(c.mapping), key.dump()))
+            elif op is Op.Remove:
+                mapping_id = await load_mapping_cache_id(cc.program_id, cc.mapping)
+                key = cc.key.load_plaintext(registers, finalize_state)
+                key_id = Field.loads(cached_get_key_id(cc.program_id, str(cc.mapping), key.dump()))
+                await mapping_cache_fetch_keys(db, cur, mapping_cache[mapping_id], cc.program_id, str(cc.mapping), [key_id])
                 effective_mapping_cache = local_mapping_cache if not allow_state_change else mapping_cache
                 if key_id not in effective_mapping_cache[mapping_id]:
-                    print(f"Key {key} not found in mapping {c.mapping}")
+                    print(f"Key {key} not found in mapping {cc.mapping}")
                     pc += 1
                     continue
                 if allow_state_change:
@@ -235,30 +268,20 @@ async def execute_finalizer(db: Database, cur: Optional[psycopg.AsyncCursor[dict
                 else:
                     effective_mapping_cache[mapping_id][key_id]["value"] = None
                 if debug:
-                    print(f"del {c.mapping}[{key}]")
+                    print(f"del {cc.mapping}[{key}]")
                 operations.append({
                     "type": FinalizeOperation.Type.RemoveKeyValue,
-                    "program_name": str(program.id),
+                    "program_name": cc.program_id,
                     "mapping_id": mapping_id,
-                    "mapping_name": c.mapping,
+                    "mapping_name": cc.mapping,
                     "key_id": key_id,
                     "key": key,
                     "height": finalize_state.block_height,
                     "from_transaction": True,
                 })
 
-            elif isinstance(c, (BranchEqCommand, BranchNeqCommand)):
-                first = load_plaintext_from_operand(c.first, registers, finalize_state)
-                second = load_plaintext_from_operand(c.second, registers, finalize_state)
-                if (first == second and isinstance(c, BranchEqCommand)) or (first != second and isinstance(c, BranchNeqCommand)):
-                    pc = finalize.positions[c.position]
-                    continue
-
-            elif isinstance(c, PositionCommand):
-                pass
-
-            elif isinstance(c, AwaitCommand):
-                call_future = load_future_from_register(c.register, registers, finalize_state)
+            elif op is Op.Await:
+                call_future = load_future_from_register(cc.destination, registers, finalize_state)
                 call_program = await get_program(db, str(call_future.program_id))
                 if not call_program:
                     raise RuntimeError("program not found")
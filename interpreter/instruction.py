@@ -2,7 +2,7 @@ from typing import cast
 
 from aleo_types import *
 from interpreter.environment import Registers
-from interpreter.utils import load_plaintext_from_operand, store_plaintext_to_register, FinalizeState
+from interpreter.utils import load_plaintext_from_operand, store_plaintext_to_register, FinalizeState, compile_operand
 
 IT = Instruction.Type
 HT = HashInstruction.Type
@@ -41,6 +41,43 @@ def execute_instruction(instruction: Instruction, program: Program, registers: R
         raise NotImplementedError
 
 
+def compile_instruction(instruction: Instruction, program: Program) -> Callable[[Registers, FinalizeState], None]:
+    """
+    Resolves the dispatch of execute_instruction and the operand accessors once, returning a function that executes
+    the instruction.
+    """
+    literals = instruction.literals
+    if isinstance(literals, Literals):
+        op = literal_ops[instruction.type]
+        operands: list[Operand] = [compile_operand(o) for o in literals.operands[:literals.num_operands]]
+        destination = literals.destination
+        return lambda registers, finalize_state: op(operands, destination, registers, finalize_state)
+    elif isinstance(literals, CastInstruction):
+        operands: list[Operand] = [compile_operand(o) for o in literals.operands]
+        destination = literals.destination
+        cast_type = literals.cast_type
+        return lambda registers, finalize_state: cast_op(operands, destination, cast_type, program, registers, finalize_state)
+    elif isinstance(literals, AssertInstruction) and literals.variant in (0, 1):
+        assert_operands = (compile_operand(literals.operands[0]), compile_operand(literals.operands[1]))
+        assert_func = assert_eq if literals.variant == 0 else assert_neq
+        return lambda registers, finalize_state: assert_func(assert_operands, registers, finalize_state)
+    elif isinstance(literals, HashInstruction):
+        second = literals.operands[1]
+        hash_operands = (compile_operand(literals.operands[0]), compile_operand(second) if second is not None else None)
+        hash_literals = literals
+        return lambda registers, finalize_state: hash_op(
+            hash_operands, hash_literals.destination, hash_literals.destination_type, registers, finalize_state, hash_literals.type
+        )
+    elif isinstance(literals, CommitInstruction):
+        commit_operands = (compile_operand(literals.operands[0]), compile_operand(literals.operands[1]))
+        commit_literals = literals
+        return lambda registers, finalize_state: commit_op(
+            commit_operands, commit_literals.destination, commit_literals.destination_type, registers, finalize_state, commit_literals.type
+        )
+    # unsupported instructions fail when executed, same as before compiling
+    return lambda registers, finalize_state: execute_instruction(instruction, program, registers, finalize_state)
+
+
 def abs_(operands: list[Operand], destination: Register, registers: Registers, finalize_state: FinalizeState):
     op = load_plaintext_from_operand(operands[0], registers, finalize_state)
     if not isinstance(op, LiteralPlaintext):
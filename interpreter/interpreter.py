@@ -1,11 +1,15 @@
+from collections import defaultdict
+from typing import MutableMapping
+
 import psycopg
 
 from aleo_types import *
 from aleo_types.cached import cached_get_key_id, cached_get_mapping_id
 from db import Database
-from interpreter.finalizer import execute_finalizer, ExecuteError, mapping_cache_read, profile
+from db.util import RedisUndoLog
+from interpreter.finalizer import execute_finalizer, ExecuteError, mapping_cache_load, mapping_cache_fetch_keys, profile
 from interpreter.utils import FinalizeState
-from util.global_cache import global_mapping_cache, global_program_cache, MappingCacheDict, get_program
+from util.global_cache import global_mapping_cache, MappingCacheDict, MappingCacheStore, get_program
 
 
 async def init_builtin_program(db: Database, program: Program):
@@ -16,8 +20,8 @@ async def init_builtin_program(db: Database, program: Program):
             await db.save_builtin_program(program)
 
 async def _execute_public_fee(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], finalize_state: FinalizeState,
-                              fee_transition: Transition, mapping_cache: dict[Field, MappingCacheDict],
-                              local_mapping_cache: dict[Field, MappingCacheDict], allow_state_change: bool
+                              fee_transition: Transition, mapping_cache: MappingCacheStore,
+                              local_mapping_cache: MappingCacheStore | MutableMapping[Field, MappingCacheDict], allow_state_change: bool
                               ) -> list[dict[str, Any]]:
     if fee_transition.program_id != "credits.aleo" or fee_transition.function_name != "fee_public":
         raise TypeError("not a fee transition")
@@ -36,7 +40,7 @@ async def _execute_public_fee(db: Database, cur: psycopg.AsyncCursor[dict[str, A
                                    mapping_cache, local_mapping_cache, allow_state_change)
 
 async def finalize_deploy(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], finalize_state: FinalizeState,
-                          confirmed_transaction: ConfirmedTransaction, mapping_cache: dict[Field, MappingCacheDict]
+                          confirmed_transaction: ConfirmedTransaction, mapping_cache: MappingCacheStore
                           ) -> tuple[list[FinalizeOperation], list[dict[str, Any]], Optional[str]]:
     transaction = confirmed_transaction.transaction
     if isinstance(transaction, (DeployTransaction, FeeTransaction)):
@@ -79,7 +83,7 @@ def load_input_from_arguments(arguments: list[Argument]) -> list[Value]:
 
 @profile
 async def finalize_execute(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], finalize_state: FinalizeState,
-                           confirmed_transaction: ConfirmedTransaction, mapping_cache: dict[Field, MappingCacheDict]
+                           confirmed_transaction: ConfirmedTransaction, mapping_cache: MappingCacheStore
                            ) -> tuple[list[FinalizeOperation], list[dict[str, Any]], Optional[str]]:
     expected_operations = list(confirmed_transaction.finalize)
     if isinstance(confirmed_transaction, AcceptedExecute):
@@ -88,7 +92,7 @@ async def finalize_execute(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]
             raise TypeError("invalid execute transaction")
         execution = transaction.execution
         allow_state_change = True
-        local_mapping_cache = mapping_cache
+        local_mapping_cache: MappingCacheStore | dict[Field, MappingCacheDict] = mapping_cache
         fee = cast(Option[Fee], transaction.fee).value
     elif isinstance(confirmed_transaction, RejectedExecute):
         if not isinstance(confirmed_transaction.rejected, RejectedExecution):
@@ -155,9 +159,64 @@ async def finalize_execute(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]
             operations.extend(await _execute_public_fee(db, cur, finalize_state, transition, mapping_cache, local_mapping_cache, True))
     return expected_operations, operations, reject_reason
 
+def _block_futures(block: Block) -> list[Future]:
+    futures: list[Future] = []
+    def add_future(future: Future):
+        futures.append(future)
+        for argument in future.arguments:
+            if isinstance(argument, FutureArgument):
+                add_future(argument.future)
+
+    for confirmed_transaction in block.transactions.transactions:
+        transaction = confirmed_transaction.transaction
+        transitions: list[Transition] = []
+        if isinstance(transaction, ExecuteTransaction):
+            transitions.extend(transaction.execution.transitions)
+            if (fee := cast(Option[Fee], transaction.fee).value) is not None:
+                transitions.append(fee.transition)
+        elif isinstance(transaction, (DeployTransaction, FeeTransaction)):
+            transitions.append(cast(Fee, transaction.fee).transition)
+        if isinstance(confirmed_transaction, RejectedExecute) and isinstance(confirmed_transaction.rejected, RejectedExecution):
+            transitions.extend(confirmed_transaction.rejected.execution.transitions)
+        for transition in transitions:
+            for output in transition.outputs:
+                if isinstance(output, FutureTransitionOutput) and output.future.value is not None:
+                    add_future(output.future.value)
+    return futures
+
+async def prefetch_mapping_keys(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], block: Block):
+    # most mapping keys are future arguments (addresses, ids, ...), so look up every literal argument that matches
+    # the key type of a mapping in the called program with one query per mapping before finalizing the block
+    candidates: dict[tuple[str, str], list[Field]] = defaultdict(list)
+    for future in _block_futures(block):
+        literals = [
+            argument.plaintext for argument in future.arguments
+            if isinstance(argument, PlaintextArgument) and isinstance(argument.plaintext, LiteralPlaintext)
+        ]
+        if not literals:
+            continue
+        program = await get_program(db, str(future.program_id))
+        if program is None:
+            continue
+        program_id = str(program.id)
+        for mapping_name, mapping in program.mappings.items():
+            key_type = mapping.key.plaintext_type
+            if not isinstance(key_type, LiteralPlaintextType):
+                continue
+            literal_type = Literal.Type(key_type.literal_type.value)
+            for plaintext in literals:
+                if plaintext.literal.type == literal_type:
+                    key_id = Field.loads(cached_get_key_id(program_id, str(mapping_name), plaintext.dump()))
+                    candidates[(program_id, str(mapping_name))].append(key_id)
+    for (program_id, mapping_name), key_ids in candidates.items():
+        mapping_id = await mapping_cache_load(db, cur, global_mapping_cache, program_id, mapping_name)
+        await mapping_cache_fetch_keys(db, cur, global_mapping_cache[mapping_id], program_id, mapping_name, key_ids)
+
 @profile
-async def finalize_block(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], block: Block) -> list[Optional[str]]:
+async def finalize_block(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], block: Block,
+                         redis_undo_log: RedisUndoLog) -> list[Optional[str]]:
     finalize_state = FinalizeState(block)
+    await prefetch_mapping_keys(db, cur, block)
     reject_reasons: list[Optional[str]] = []
     for confirmed_transaction in block.transactions.transactions:
         confirmed_transaction: ConfirmedTransaction
@@ -198,60 +257,45 @@ async def finalize_block(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]],
                 global_mapping_cache.clear()
                 raise
 
-        await execute_operations(db, cur, operations)
+        await execute_operations(db, cur, operations, redis_undo_log)
         reject_reasons.append(reject_reason)
     return reject_reasons
 
 
-async def execute_operations(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], operations: list[dict[str, Any]]):
+async def execute_operations(db: Database, cur: psycopg.AsyncCursor[dict[str, Any]], operations: list[dict[str, Any]],
+                             redis_undo_log: RedisUndoLog):
+    # consecutive key value operations are written in one batch, mapping initializations flush the batch first
+    batch: list[dict[str, Any]] = []
     for operation in operations:
         match operation["type"]:
             case FinalizeOperation.Type.InitializeMapping:
+                await db.update_mapping_key_values(cur, batch, redis_undo_log)
+                batch = []
                 mapping_id = operation["mapping_id"]
                 program_id = operation["program_id"]
                 mapping = operation["mapping"]
                 await db.initialize_mapping(cur, str(mapping_id), str(program_id), str(mapping))
-            case FinalizeOperation.Type.UpdateKeyValue:
-                mapping_id = operation["mapping_id"]
-                key_id = operation["key_id"]
-                value_id = operation["value_id"]
-                key = operation["key"]
-                value = operation["value"]
-                program_name = operation["program_name"]
-                mapping_name = operation["mapping_name"]
-                from_transaction = operation["from_transaction"]
-                await db.update_mapping_key_value(cur, program_name, mapping_name, str(mapping_id), str(key_id), str(value_id), key.dump(), value.dump(), operation["height"], from_transaction)
-            case FinalizeOperation.Type.RemoveKeyValue:
-                mapping_id = operation["mapping_id"]
-                key_id = operation["key_id"]
-                key = operation["key"]
-                program_name = operation["program_name"]
-                mapping_name = operation["mapping_name"]
-                from_transaction = operation["from_transaction"]
-                height = operation["height"]
-                await db.remove_mapping_key_value(cur, program_name, mapping_name, str(mapping_id), str(key_id), key.dump(), height, from_transaction)
+            case FinalizeOperation.Type.UpdateKeyValue | FinalizeOperation.Type.RemoveKeyValue:
+                batch.append(operation)
             case _:
                 raise NotImplementedError
+    await db.update_mapping_key_values(cur, batch, redis_undo_log)
+    # the database has caught up with the cache, so entries can be evicted safely now
+    global_mapping_cache.trim()
 
 async def get_mapping_value(db: Database, program_id: str, mapping_name: str, key: str) -> Value:
     # where was this used?
-    mapping_id = Field.loads(cached_get_mapping_id(program_id, mapping_name))
-    if mapping_id not in global_mapping_cache:
-        global_mapping_cache[mapping_id] = await mapping_cache_read(db, program_id, mapping_name)
-    if str(program_id) in global_program_cache:
-        program = global_program_cache[str(program_id)]
-    else:
-        program_bytes = await db.get_program(str(program_id))
-        if program_bytes is None:
-            raise RuntimeError("program not found")
-        program = Program.load(BytesIO(program_bytes))
-        global_program_cache[str(program_id)] = program
+    mapping_id = await mapping_cache_load(db, None, global_mapping_cache, program_id, mapping_name)
+    program = await get_program(db, str(program_id))
+    if program is None:
+        raise RuntimeError("program not found")
     mapping = program.mappings[Identifier(value=mapping_name)]
     mapping_key_type = mapping.key.plaintext_type
     if not isinstance(mapping_key_type, LiteralPlaintextType):
         raise TypeError("unsupported key type")
     key_plaintext = LiteralPlaintext(literal=Literal.loads(Literal.Type(mapping_key_type.literal_type.value), key))
     key_id = Field.loads(cached_get_key_id(program_id, mapping_name, key_plaintext.dump()))
+    await mapping_cache_fetch_keys(db, None, global_mapping_cache[mapping_id], program_id, mapping_name, [key_id])
     if key_id not in global_mapping_cache[mapping_id]:
         raise ExecuteError(f"key {key} not found in mapping {mapping_id}", None, "", TransitionID.load(BytesIO(b"\x00" * 32)))
     else:
@@ -271,7 +315,7 @@ async def preview_finalize_execution(db: Database, program: Program, function_na
         program,
         function_name,
         inputs,
-        mapping_cache={},
+        mapping_cache=MappingCacheStore(0, global_mapping_cache.pinned),
         local_mapping_cache={},
         allow_state_change=False,
     )
\ No newline at end of file
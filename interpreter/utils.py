@@ -16,20 +16,56 @@ class FinalizeState:
         if len(self.random_seed) != 32:
             raise RuntimeError("invalid random seed length")
 
+class CompiledOperand(Operand):
+    """
+    Operand with its accessor resolved ahead of time by compile_operand, accepted anywhere an Operand is loaded.
+    """
+
+    load_plaintext: Callable[[Registers, FinalizeState], Plaintext]
+
+    def __init__(self, operand: Operand, load_plaintext: Callable[[Registers, FinalizeState], Plaintext]):
+        self.operand = operand
+        self.load_plaintext = load_plaintext
+
+    def dump(self) -> bytes:
+        return self.operand.dump()
+
+def compile_operand(operand: Operand) -> CompiledOperand:
+    if isinstance(operand, CompiledOperand):
+        return operand
+    if isinstance(operand, LiteralOperand):
+        literal = LiteralPlaintext(literal=operand.literal)
+        return CompiledOperand(operand, lambda registers, finalize_state: literal)
+    if isinstance(operand, RegisterOperand) and isinstance(operand.register, LocatorRegister):
+        index = int(operand.register.locator)
+        def load_register(registers: Registers, finalize_state: FinalizeState) -> Plaintext:
+            value = registers[index]
+            if not isinstance(value, Plaintext):
+                raise TypeError("register is not plaintext")
+            return value
+        return CompiledOperand(operand, load_register)
+    if isinstance(operand, ProgramIDOperand | NetworkIDOperand):
+        constant = load_plaintext_from_operand(operand, Registers(), cast(FinalizeState, None))
+        return CompiledOperand(operand, lambda registers, finalize_state: constant)
+    # access registers and block height depend on the execution
+    return CompiledOperand(operand, lambda registers, finalize_state: load_plaintext_from_operand(operand, registers, finalize_state))
+
 def load_plaintext_from_operand(operand: Operand, registers: Registers, finalize_state: FinalizeState) -> Plaintext:
+    if isinstance(operand, CompiledOperand):
+        return operand.load_plaintext(registers, finalize_state)
     if isinstance(operand, LiteralOperand):
         return LiteralPlaintext(literal=operand.literal)
     elif isinstance(operand, RegisterOperand):
         register = operand.register
         if isinstance(register, LocatorRegister):
             value = registers[int(register.locator)]
-            if not isinstance(value, PlaintextValue):
+            if not isinstance(value, Plaintext):
                 raise TypeError("register is not plaintext")
-            return value.plaintext
+            return value
         elif isinstance(register, AccessRegister):
             value = registers[int(register.locator)]
-            if isinstance(value, PlaintextValue):
-                plaintext = value.plaintext
+            if isinstance(value, Plaintext):
+                plaintext = value
                 for access in register.accesses:
                     if isinstance(access, MemberAccess):
                         if not isinstance(plaintext, StructPlaintext):
@@ -40,7 +76,7 @@ def load_plaintext_from_operand(operand: Operand, registers: Registers, finalize
                             raise TypeError("register is not array")
                         plaintext = plaintext[access.index]
                 return plaintext
-            elif isinstance(value, FutureValue):
+            else:
                 next_value: Plaintext | Future = value.future
                 for access in register.accesses:
                     if isinstance(access, MemberAccess):
@@ -59,8 +95,6 @@ def load_plaintext_from_operand(operand: Operand, registers: Registers, finalize
                 if not isinstance(next_value, Plaintext):
                     raise TypeError("register is not plaintext")
                 return next_value
-            else:
-                raise NotImplementedError
         else:
             raise NotImplementedError
     elif isinstance(operand, BlockHeightOperand):
@@ -103,7 +137,7 @@ def load_future_from_register(register: Register, registers: Registers, finalize
 
 def store_plaintext_to_register(plaintext: Plaintext, register: Register, registers: Registers):
     if isinstance(register, LocatorRegister):
-        registers[int(register.locator)] = PlaintextValue(plaintext=plaintext)
+        registers[int(register.locator)] = plaintext
     # elif isinstance(register, AccessRegister):
     #     struct_ = registers[int(register.locator)]
     #     if not isinstance(struct_, StructPlaintext):
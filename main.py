@@ -1,5 +1,4 @@
 import asyncio
-import decimal
 import gc
 
 from dotenv import load_dotenv
@@ -23,7 +22,6 @@ async def main():
     gc.set_threshold(allocs, gen1, gen2)
 
     set_proc_title("aleo-explorer: main")
-    decimal.getcontext().prec = 80
     e = Explorer()
     e.start()
     while True:
@@ -3,7 +3,7 @@ from io import BytesIO
 
 import aleo_explorer_rust
 
-from aleo_types import u16, Block, u32, Program, Field
+from aleo_types import u16, LazyBlock, u32, Program, Field
 
 
 def load_program(program_id: str) -> Program:
@@ -14,8 +14,8 @@ class Canary:
     network_id = u16(2)
     version = u32(17)
 
-    genesis_block = Block.load(BytesIO(open(os.path.join(os.path.dirname(__file__), "block.genesis"), "rb").read()))
-    dev_genesis_block = Block.load(BytesIO(open(os.path.join(os.path.dirname(__file__), "dev.genesis"), "rb").read()))
+    genesis_block = LazyBlock.from_bytes(open(os.path.join(os.path.dirname(__file__), "block.genesis"), "rb").read())
+    dev_genesis_block = LazyBlock.from_bytes(open(os.path.join(os.path.dirname(__file__), "dev.genesis"), "rb").read())
     
     builtin_programs = [
         load_program("credits.aleo"),
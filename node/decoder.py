@@ -0,0 +1,55 @@
+import asyncio
+import pickle
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Optional
+
+from aleo_types import Frame, Message, load_from_view
+from aleo_types.generic import generic_classes
+
+
+def _load_generic_class(cls: type, key: Any) -> type:
+    return cls.__class_getitem__(key).__origin__ # type: ignore
+
+
+class _FramePickler(pickle.Pickler):
+    # classes like Vec[Transition, u8] are created on the fly and can't be pickled by reference,
+    # so they are sent over as their generic class and parameters instead
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, type) and (generic := generic_classes.get(obj)) is not None:
+            return _load_generic_class, generic
+        return NotImplemented
+
+
+def _decode_frame(frame: bytes) -> bytes:
+    buffer = BytesIO()
+    _FramePickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(load_from_view(Frame, frame))
+    return buffer.getvalue()
+
+
+class FrameDecoder:
+    """
+    Decodes BlockResponse frames in worker processes, so large blocks don't stall the event loop.
+    Other messages are small and decoded in place.
+    """
+
+    def __init__(self, workers: int):
+        self.executor: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+
+    @property
+    def enabled(self):
+        return self.executor is not None
+
+    async def decode(self, frame: bytes) -> Frame:
+        if self.executor is None or len(frame) < 2 or struct.unpack("<H", frame[:2])[0] != Message.Type.BlockResponse:
+            return load_from_view(Frame, frame)
+        data = await asyncio.get_running_loop().run_in_executor(self.executor, _decode_frame, frame)
+        return pickle.loads(data)
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -10,6 +10,7 @@ import explorer.types as explorer
 from aleo_types import *  # too many types
 # from .light_node import LightNodeState
 from . import Network
+from .decoder import FrameDecoder
 
 # Do not open PR about this value.
 # The deviation from the node's behavior is for lower sync delays.
@@ -25,6 +26,7 @@ class Node:
         self.worker_task: asyncio.Task[None]
         self.explorer_message = explorer_message
         self.explorer_request = explorer_request
+        self.decoder = FrameDecoder(int(os.environ.get("P2P_DECODE_WORKERS", 0)))
 
         self.node_ip: str
         self.node_port: int
@@ -37,6 +39,10 @@ class Node:
         self.peer_block_locators: Optional[BlockLocators] = None
         self.block_requests: list[int] = []
         self.block_requests_deadline = float('inf')
+        # blocks can arrive out of order when several requests are in flight, they wait here until it's their turn
+        self.block_buffer: dict[int, Block] = {}
+        self.sync_next_height = 0
+        self.sync_requested_height = 0
         self.ping_task = None
         self.is_syncing = False
         # self.light_node_state = light_node_state
@@ -58,6 +64,8 @@ class Node:
             await self.close()
             return
         await self.explorer_message(explorer.Message(explorer.Message.Type.NodeConnected, None))
+        frames: Optional[asyncio.Queue[asyncio.Future[Frame]]] = None
+        consumer_task: Optional[asyncio.Task[None]] = None
         try:
             challenge_request = ChallengeRequest(
                 version=Network.version,
@@ -67,6 +75,10 @@ class Node:
                 nonce=self.nonce,
             )
             await self.send_message(challenge_request)
+            if self.decoder.enabled:
+                # keep reading and decoding the next frames while the current one is being processed
+                frames = asyncio.Queue(maxsize=int(os.environ.get("P2P_DECODE_QUEUE_SIZE", 16)))
+                consumer_task = asyncio.create_task(self.consume_frames(frames))
             while True:
                 try:
                     size = await self.reader.readexactly(4)
@@ -77,13 +89,31 @@ class Node:
                     frame = await self.reader.readexactly(size)
                 except:
                     raise Exception("connection closed")
-                await self.parse_message(Frame.load(BytesIO(frame)))
+                if frames is None:
+                    await self.parse_message(load_from_view(Frame, frame))
+                else:
+                    await frames.put(asyncio.ensure_future(self.decoder.decode(frame)))
         except Exception:
             traceback.print_exc()
+            if consumer_task is not None:
+                consumer_task.cancel()
             await self.explorer_message(explorer.Message(explorer.Message.Type.NodeDisconnected, None))
             await self.close()
             return
 
+    async def consume_frames(self, frames: asyncio.Queue[asyncio.Future[Frame]]):
+        try:
+            while True:
+                frame = await frames.get()
+                await self.parse_message(await frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            traceback.print_exc()
+            # the reader notices the closed connection and takes care of reconnecting
+            if self.writer is not None:
+                self.writer.close()
+
     async def parse_message(self, frame: Frame):
         if isinstance(frame.message, BlockRequest):
             if self.handshake_state != 1:
@@ -105,8 +135,18 @@ class Node:
                 height = block.header.metadata.height
                 if height in self.block_requests:
                     self.block_requests.remove(height)
-                    await self.explorer_request(explorer.Request.ProcessBlock(block))
-            if not self.block_requests:
+                    self.block_buffer[height] = block
+            missing = [h for h in range(msg.request.start_height, msg.request.end_height) if h in self.block_requests]
+            if missing:
+                await self.send_message(BlockRequest(start_height=u32(missing[0]), end_height=u32(missing[-1] + 1)))
+            while self.sync_next_height in self.block_buffer:
+                block = self.block_buffer.pop(self.sync_next_height)
+                self.sync_next_height += 1
+                await self.explorer_request(explorer.Request.ProcessBlock(block))
+                # only moving the sync height forward extends the deadline, so a stuck block times out even while
+                # other frames and later blocks keep arriving
+                self.block_requests_deadline = time.time() + 30
+            if not self.block_requests and not self.block_buffer:
                 self.is_syncing = False
                 self.block_requests_deadline = float('inf')
                 self.is_fork = False
@@ -203,7 +243,7 @@ class Node:
                 is_fork=Option[bool_](is_fork),
             )
             await self.send_message(pong)
-            if not self.is_syncing:
+            if not self.is_syncing or self.block_requests_deadline < time.time():
                 await self._sync()
 
         elif isinstance(frame.message, Pong):
@@ -232,8 +272,11 @@ class Node:
 
     async def _sync(self):
         batch_size = int(os.environ.get("P2P_BLOCK_BATCH_SIZE", 1))
+        # number of block requests kept in flight at the same time
+        window_size = int(os.environ.get("P2P_SYNC_WINDOW", 1))
         if self.block_requests_deadline < time.time():
             self.block_requests.clear()
+            self.block_buffer.clear()
             self.block_requests_deadline = float("inf")
             self.is_syncing = False
         locators = self.peer_block_locators
@@ -241,26 +284,33 @@ class Node:
             return
         recents = locators.recents
         self.peer_block_height = max(recents.keys())
-        if self.is_syncing:
-            next_block = self.block_requests[0]
-            self.block_requests_deadline = time.time() + 30
-            msg = BlockRequest(start_height=u32(next_block), end_height=u32(min(max(self.block_requests) + 1, next_block + batch_size)))
-            await self.send_message(msg)
-        else:
+        if not self.is_syncing:
             latest_height = await self.explorer_request(explorer.Request.GetLatestHeight())
             if latest_height >= self.peer_block_height:
                 return
-
-            start_block_height = latest_height + 1
-            end_block_height = min(self.peer_block_height + 1, start_block_height + batch_size)
-            print(f"Synchronizing from block {start_block_height} to {end_block_height}")
+            print(f"Synchronizing from block {latest_height + 1} to {self.peer_block_height}")
             self.is_syncing = True
+            self.sync_next_height = latest_height + 1
+            self.sync_requested_height = latest_height + 1
 
+        while len(self.block_requests) + len(self.block_buffer) < window_size * batch_size \
+                and self.sync_requested_height <= self.peer_block_height:
+            start_block_height = self.sync_requested_height
+            end_block_height = min(self.peer_block_height + 1, start_block_height + batch_size)
             self.block_requests.extend(range(start_block_height, end_block_height))
-            self.block_requests_deadline = time.time() + 30
+            self.sync_requested_height = end_block_height
+            if self.block_requests_deadline == float('inf'):
+                self.block_requests_deadline = time.time() + 30
             msg = BlockRequest(start_height=u32(start_block_height), end_height=u32(end_block_height))
             await self.send_message(msg)
 
+    def reset_sync(self):
+        # drops the blocks requested so far, the next sync starts again from the explorer's latest height
+        self.block_requests.clear()
+        self.block_buffer.clear()
+        self.block_requests_deadline = float('inf')
+        self.is_syncing = False
+
     async def send_ping(self):
         ping = Ping(
             version=Network.version,
@@ -301,8 +351,20 @@ class Node:
         self.peer_block_locators = None
         self.block_requests = []
         self.block_requests_deadline = float('inf')
+        self.block_buffer = {}
+        self.sync_next_height = 0
+        self.sync_requested_height = 0
         self.is_syncing = False
         if self.ping_task is not None:
             self.ping_task.cancel()
         await asyncio.sleep(5)
         self.worker_task = asyncio.create_task(self.worker(self.node_ip, self.node_port))
+
+    async def stop(self):
+        # unlike close(), doesn't reconnect
+        self.worker_task.cancel()
+        if self.ping_task is not None:
+            self.ping_task.cancel()
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.close()
+        self.decoder.shutdown()
@@ -719,6 +719,46 @@ CREATE SEQUENCE explorer.block_id_seq
 ALTER SEQUENCE explorer.block_id_seq OWNED BY explorer.block.id;
 
 
+--
+-- Name: block_raw; Type: TABLE; Schema: explorer; Owner: -
+--
+
+CREATE TABLE explorer.block_raw (
+    block_id integer NOT NULL,
+    data bytea NOT NULL
+);
+ALTER TABLE ONLY explorer.block_raw ALTER COLUMN data SET STORAGE EXTERNAL;
+
+
+--
+-- Name: block_work; Type: TABLE; Schema: explorer; Owner: -
+--
+
+CREATE TABLE explorer.block_work (
+    block_id integer NOT NULL,
+    "timestamp" bigint NOT NULL,
+    solution_count integer NOT NULL,
+    work numeric(40,0) NOT NULL,
+    cumulative_solution_count bigint NOT NULL,
+    cumulative_work numeric(60,0) NOT NULL
+);
+
+
+--
+-- Name: prover_work; Type: TABLE; Schema: explorer; Owner: -
+--
+
+CREATE TABLE explorer.prover_work (
+    block_id integer NOT NULL,
+    address text NOT NULL,
+    "timestamp" bigint NOT NULL,
+    solution_count integer NOT NULL,
+    work numeric(40,0) NOT NULL,
+    cumulative_solution_count bigint NOT NULL,
+    cumulative_work numeric(60,0) NOT NULL
+);
+
+
 --
 -- Name: block_validator; Type: TABLE; Schema: explorer; Owner: -
 --
@@ -2744,6 +2784,30 @@ ALTER TABLE ONLY explorer.block
     ADD CONSTRAINT block_pk PRIMARY KEY (id);
 
 
+--
+-- Name: block_raw block_raw_pk; Type: CONSTRAINT; Schema: explorer; Owner: -
+--
+
+ALTER TABLE ONLY explorer.block_raw
+    ADD CONSTRAINT block_raw_pk PRIMARY KEY (block_id);
+
+
+--
+-- Name: block_work block_work_pk; Type: CONSTRAINT; Schema: explorer; Owner: -
+--
+
+ALTER TABLE ONLY explorer.block_work
+    ADD CONSTRAINT block_work_pk PRIMARY KEY (block_id);
+
+
+--
+-- Name: prover_work prover_work_pk; Type: CONSTRAINT; Schema: explorer; Owner: -
+--
+
+ALTER TABLE ONLY explorer.prover_work
+    ADD CONSTRAINT prover_work_pk PRIMARY KEY (block_id, address);
+
+
 --
 -- Name: block_validator block_validator_pk; Type: CONSTRAINT; Schema: explorer; Owner: -
 --
@@ -3481,6 +3545,20 @@ CREATE UNIQUE INDEX block_height_uindex ON explorer.block USING btree (height);
 CREATE INDEX block_timestamp_index ON explorer.block USING btree ("timestamp");
 
 
+--
+-- Name: block_work_timestamp_index; Type: INDEX; Schema: explorer; Owner: -
+--
+
+CREATE INDEX block_work_timestamp_index ON explorer.block_work USING btree ("timestamp");
+
+
+--
+-- Name: prover_work_address_timestamp_index; Type: INDEX; Schema: explorer; Owner: -
+--
+
+CREATE INDEX prover_work_address_timestamp_index ON explorer.prover_work USING btree (address, "timestamp");
+
+
 --
 -- Name: block_validator_validator_index; Type: INDEX; Schema: explorer; Owner: -
 --
@@ -4136,6 +4214,30 @@ ALTER TABLE ONLY explorer.block_aborted_transaction_id
     ADD CONSTRAINT block_aborted_transaction_id_block_id_fk FOREIGN KEY (block_id) REFERENCES explorer.block(id) ON DELETE CASCADE;
 
 
+--
+-- Name: block_raw block_raw_block_id_fk; Type: FK CONSTRAINT; Schema: explorer; Owner: -
+--
+
+ALTER TABLE ONLY explorer.block_raw
+    ADD CONSTRAINT block_raw_block_id_fk FOREIGN KEY (block_id) REFERENCES explorer.block(id) ON DELETE CASCADE;
+
+
+--
+-- Name: block_work block_work_block_id_fk; Type: FK CONSTRAINT; Schema: explorer; Owner: -
+--
+
+ALTER TABLE ONLY explorer.block_work
+    ADD CONSTRAINT block_work_block_id_fk FOREIGN KEY (block_id) REFERENCES explorer.block(id) ON DELETE CASCADE;
+
+
+--
+-- Name: prover_work prover_work_block_id_fk; Type: FK CONSTRAINT; Schema: explorer; Owner: -
+--
+
+ALTER TABLE ONLY explorer.prover_work
+    ADD CONSTRAINT prover_work_block_id_fk FOREIGN KEY (block_id) REFERENCES explorer.block(id) ON DELETE CASCADE;
+
+
 --
 -- Name: block_validator block_validator_block_id_fk; Type: FK CONSTRAINT; Schema: explorer; Owner: -
 --
@@ -13,6 +13,7 @@ from aleo_types import DeployTransaction, Deployment, Program, \
     AcceptedDeploy, u32, AcceptedExecute, RejectedExecute, ExecuteTransaction, \
     FeeTransaction, RejectedExecution, Fee
 from db import Database
+from util.global_cache import get_program
 from .utils import function_signature
 from .format import *
 
@@ -73,12 +74,11 @@ async def program_route(request: Request):
         if transaction is None:
             raise HTTPException(status_code=550, detail="Deploy transaction not found")
         deployment: Deployment = transaction.deployment
-        program: Program = deployment.program
+        program: Program | None = deployment.program
     else:
-        program_bytes = await db.get_program(program_id)
-        if not program_bytes:
+        program = await get_program(db, program_id)
+        if program is None:
             raise HTTPException(status_code=404, detail="Program not found")
-        program = Program.load(BytesIO(program_bytes))
         transaction = None
         height = None
         deploy_time = None
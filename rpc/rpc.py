@@ -26,7 +26,7 @@ from middleware.asgi_logger import AccessLoggerMiddleware
 from starlette.middleware.cors import CORSMiddleware
 from middleware.api_quota import APIQuotaMiddleware
 from middleware.server_timing import ServerTimingMiddleware
-from util.cache import Cache
+from util.global_cache import global_mapping_cache
 from util.set_proc_title import set_proc_title
 from middleware.minify import MinifyMiddleware
 # from node.light_node import LightNodeState
@@ -55,34 +55,23 @@ class UvicornServer(multiprocessing.Process):
 
 async def index_route(request: Request):
     db: Database = request.app.state.db
-    recent_blocks = await db.get_recent_blocks_fast(10)
-    network_speed = await db.get_network_speed(900)
-    sync_info = await out_of_sync_check(request.app.state.session, db)
-    latest_block = await db.get_latest_block()
-    validators_count = await db.get_validator_count_at_height(latest_block.height)
-    provers_count, _ = await db.get_puzzle_reward_all()
-    delegators = await db.get_bonded_mapping()
-    committee = await db.get_committee_at_height(latest_block.header.metadata.height)
-    puzzle_reward_24H = await db.get_24H_puzzle_reward()
-    block_reward_24H = await db.get_24H_block_reward()
-    puzzle_reward_1M = await db.get_24H_puzzle_reward_1M()
-
-    def get_reward(block: dict[str, Any]):
-        block["reward"] = block["block_reward"] + block["coinbase_reward"]  * 2 // 3
-        return block
-    recent_blocks = [get_reward(block) for block in recent_blocks]
+    summary, sync_info, latest_block = await asyncio.gather(
+        db.get_network_summary(),
+        out_of_sync_check(request.app.state.session, db),
+        db.get_latest_block(),
+    )
     ctx = {
         "latest_block": format_block(latest_block),
-        "validators_count": validators_count,
-        "provers_count": provers_count,
-        "delegators_count": len(delegators) - validators_count,
-        "total_stake": int(committee["total_stake"]),
-        "recent_blocks": [format_number(recent_block) for recent_block in recent_blocks],
-        "network_speed": str(network_speed),
-        "total_reward": puzzle_reward_24H + block_reward_24H,
-        "puzzle_reward": puzzle_reward_24H,
-        "block_reward": block_reward_24H,
-        "puzzle_reward_1M": puzzle_reward_1M,
+        "validators_count": summary["validators_count"],
+        "provers_count": summary["provers_count"],
+        "delegators_count": summary["delegators_count"],
+        "total_stake": summary["total_stake"],
+        "recent_blocks": summary["recent_blocks"],
+        "network_speed": summary["network_speed"],
+        "total_reward": summary["puzzle_reward"] + summary["block_reward"],
+        "puzzle_reward": summary["puzzle_reward"],
+        "block_reward": summary["block_reward"],
+        "puzzle_reward_1M": summary["puzzle_reward_1M"],
         "sync_info": sync_info,
     }
     return JSONResponse(ctx)
@@ -173,7 +162,10 @@ async def startup():
     await db.connect()
     # noinspection PyUnresolvedReferences
     app.state.db = db
-    app.state.program_cache = Cache()
+    # noinspection PyUnresolvedReferences
+    app.state.hot_block_task = asyncio.create_task(db.run_hot_block_cache())
+    # nothing is written from here, so the mapping cache can be trimmed right away
+    global_mapping_cache.trim_on_insert = True
     app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
 
 log_format = '\033[92mACCESS\033[0m: \033[94m%(client_addr)s\033[0m - - %(t)s \033[96m"%(request_line)s"\033[0m \033[93m%(s)s\033[0m %(B)s "%(f)s" "%(a)s" %(L)s \033[95m%(htmx)s\033[0m'
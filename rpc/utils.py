@@ -44,9 +44,10 @@ async def get_remote_height(session: aiohttp.ClientSession, rpc_root: str) -> st
 
 
 async def out_of_sync_check(session: aiohttp.ClientSession, db: Database):
-    last_timestamp, last_height = await asyncio.gather(
+    last_timestamp, last_height, ingest_queue_depth = await asyncio.gather(
         db.get_latest_block_timestamp(),
-        db.get_latest_height()
+        db.get_latest_height(),
+        db.get_ingest_queue_depth(),
     )
     now = int(time.time())
     maintenance_info = os.environ.get("MAINTENANCE_INFO")
@@ -65,6 +66,7 @@ async def out_of_sync_check(session: aiohttp.ClientSession, db: Database):
         "explorer_height": last_height,
         "node_height": node_height,
         "reference_height": reference_height,
+        "ingest_queue_depth": ingest_queue_depth,
         "relative_time": get_relative_time(last_timestamp),
     }
 
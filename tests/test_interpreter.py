@@ -0,0 +1,59 @@
+import asyncio
+import os
+from typing import Any
+
+import pytest
+
+pytest.importorskip("aleo_explorer_rust")
+os.environ.setdefault("NETWORK", "mainnet")
+
+from aleo_types import *
+from aleo_types.cached import cached_get_key_id, cached_get_mapping_id
+from interpreter import interpreter
+from node import Network
+from util.global_cache import MappingCacheStore
+
+ADDRESS = "aleo1rhgdu77hgyqd3xjj8ucu3jj9r2krwz6mnzyd80gncr5fxcwlh5rsvzp9px"
+
+
+class _FakeDatabase:
+    def __init__(self):
+        self.fetched: list[tuple[str, str, list[Field]]] = []
+
+    async def get_mapping_cache_keys_with_cur(self, cur: Any, program_name: str, mapping_name: str,
+                                              key_ids: list[Field]) -> dict[Field, dict[str, Any]]:
+        self.fetched.append((program_name, mapping_name, key_ids))
+        return {}
+
+
+def test_prefetch_mapping_keys_with_literal_arguments(monkeypatch: pytest.MonkeyPatch):
+    credits = next(p for p in Network.builtin_programs if str(p.id) == "credits.aleo")
+    address = LiteralPlaintext(literal=Literal(type_=Literal.Type.Address, primitive=Address.loads(ADDRESS)))
+    amount = LiteralPlaintext(literal=Literal(type_=Literal.Type.U64, primitive=u64(100)))
+    future = Future(
+        program_id=credits.id,
+        function_name=Identifier(value="transfer_public"),
+        arguments=Vec[Argument, u8]([PlaintextArgument(plaintext=address), PlaintextArgument(plaintext=amount)]),
+    )
+
+    def block_futures(block: Block) -> list[Future]:
+        return [future]
+
+    async def get_program(db: Any, program_id: str):
+        return credits if program_id == "credits.aleo" else None
+
+    mapping_cache = MappingCacheStore(100, set())
+    monkeypatch.setattr(interpreter, "_block_futures", block_futures)
+    monkeypatch.setattr(interpreter, "get_program", get_program)
+    monkeypatch.setattr(interpreter, "global_mapping_cache", mapping_cache)
+    db = _FakeDatabase()
+
+    asyncio.run(interpreter.prefetch_mapping_keys(db, object(), None)) # type: ignore[arg-type]
+
+    # only the address argument matches the key type of the address keyed mappings, the u64 one is never looked up
+    assert ("credits.aleo", "account") in [(program, mapping) for program, mapping, _ in db.fetched]
+    for program_id, mapping_name, key_ids in db.fetched:
+        assert key_ids == [Field.loads(cached_get_key_id(program_id, mapping_name, address.dump()))]
+    account_mapping_id = Field.loads(cached_get_mapping_id("credits.aleo", "account"))
+    account_key_id = Field.loads(cached_get_key_id("credits.aleo", "account", address.dump()))
+    assert mapping_cache[account_mapping_id].known(account_key_id)
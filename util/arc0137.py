@@ -16,9 +16,10 @@ async def _get_mapping_value(db: Database, program_id: str, mapping_name: str, k
     mapping_id = Field.loads(cached_get_mapping_id(program_id, mapping_name))
     key_id = Field.loads(cached_get_key_id(program_id, mapping_name, key.dump()))
     if mapping_id in global_mapping_cache:
-        if key_id not in global_mapping_cache[mapping_id]:
+        if key_id in global_mapping_cache[mapping_id]:
+            return global_mapping_cache[mapping_id][key_id]["value"]
+        if global_mapping_cache[mapping_id].known(key_id):
             return None
-        return global_mapping_cache[mapping_id][key_id]["value"]
     data = await db.get_mapping_value(program_id, mapping_name, str(key_id))
     if data is None:
         return None
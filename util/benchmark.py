@@ -0,0 +1,110 @@
+import decimal
+import os
+import sys
+import timeit
+from decimal import Decimal
+from typing import Callable
+
+from aleo_types import *
+
+genesis_path = os.path.join(os.path.dirname(__file__), "..", "node", "mainnet", "block.genesis")
+
+
+def _report(name: str, func: Callable[[], Any], number: int, per: int = 1):
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{name:<40} {best / number / per * 1e9:>12.1f} ns")
+
+
+def _count_variant_loads(func: Callable[[], Any]) -> int:
+    count = 0
+    load_variant = EnumBaseSerialize.load_variant.__func__ # type: ignore[reportFunctionMemberAccess]
+
+    def counting(cls: type[EnumBaseSerialize], type_: IntEnum, data: BytesIO) -> Any:
+        nonlocal count
+        count += 1
+        return load_variant(cls, type_, data)
+
+    setattr(EnumBaseSerialize, "load_variant", classmethod(counting))
+    try:
+        func()
+    finally:
+        setattr(EnumBaseSerialize, "load_variant", classmethod(load_variant))
+    return count
+
+
+_u8_struct = struct.Struct("<B")
+
+
+def _chain_plaintext_load(data: BytesIO) -> Plaintext:
+    # tag lookup and if chain as the enum loaders did before the variant table, kept for comparison
+    type_ = Plaintext.Type(read_struct(data, _u8_struct)[0])
+    if type_ == Plaintext.Type.Literal:
+        return LiteralPlaintext.load(data)
+    elif type_ == Plaintext.Type.Struct:
+        return StructPlaintext.load(data)
+    elif type_ == Plaintext.Type.Array:
+        return ArrayPlaintext.load(data)
+    else:
+        raise ValueError("invalid type")
+
+
+def bench_decode():
+    raw = open(genesis_path, "rb").read()
+    nodes = _count_variant_loads(lambda: Block.load(BytesIO(raw)))
+    print(f"genesis block: {len(raw)} bytes, {nodes} enum nodes")
+    _report("block decode (BytesIO)", lambda: Block.load(BytesIO(raw)), 20)
+    _report("block decode (view)", lambda: load_from_view(Block, raw), 20)
+    _report("block decode per enum node", lambda: load_from_view(Block, raw), 20, nodes)
+
+    literal = LiteralPlaintext(literal=Literal(type_=Literal.Type.U64, primitive=u64(1))).dump()
+    _report("literal plaintext, if chain", lambda: _chain_plaintext_load(BytesIO(literal)), 100000)
+    _report("literal plaintext, variant table",
+            lambda: Plaintext.load_variant(Plaintext.Type.load(data := BytesIO(literal)), data), 100000)
+
+
+def _decimal_floordiv(a: Int, b: Int) -> Int:
+    # the Decimal based truncating division Int used before, kept for comparison
+    return a.__class__(int(Decimal(int(a)) // Decimal(int(b))))
+
+
+def bench_int():
+    from interpreter.environment import Registers
+    from interpreter.instruction import literal_ops
+    from interpreter.utils import FinalizeState, compile_operand
+
+    decimal.getcontext().prec = 80
+    a, b = u128(2 ** 80 + 12345), u128(987654321)
+    _report("u128 // decimal", lambda: _decimal_floordiv(a, b), 100000)
+    _report("u128 // truncdiv", lambda: a // b, 100000)
+    _report("u128 +", lambda: a + b, 100000)
+    _report("u128 &", lambda: a & b, 100000)
+
+    registers = Registers(3)
+    registers[0] = LiteralPlaintext(literal=Literal(type_=Literal.Type.U128, primitive=a))
+    registers[1] = LiteralPlaintext(literal=Literal(type_=Literal.Type.U128, primitive=b))
+    operands: list[Operand] = [compile_operand(RegisterOperand(register=LocatorRegister(locator=VarInt(i)))) for i in (0, 1)]
+    destination = LocatorRegister(locator=VarInt(2))
+    state = cast(FinalizeState, None)
+    for instruction in (Instruction.Type.Add, Instruction.Type.Sub, Instruction.Type.Mul, Instruction.Type.Div,
+                        Instruction.Type.Modulo, Instruction.Type.And, Instruction.Type.Shr):
+        op = literal_ops[instruction]
+        _report(f"literal_ops {instruction.name}", lambda: op(operands, destination, registers, state), 20000)
+
+
+def bench_json():
+    block = Block.load(BytesIO(open(genesis_path, "rb").read()))
+    _report("genesis block json()", block.json, 20)
+
+
+benchmarks: dict[str, Callable[[], None]] = {
+    "decode": bench_decode,
+    "int": bench_int,
+    "json": bench_json,
+}
+
+
+if __name__ == "__main__":
+    # python -m util.benchmark [name ...]
+    for name in sys.argv[1:] or benchmarks:
+        print(f"== {name}")
+        benchmarks[name]()
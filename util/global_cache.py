@@ -1,18 +1,294 @@
 
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from typing import MutableMapping, Iterator, TYPE_CHECKING
+
 from aleo_types import *
+from aleo_types.cached import cached_get_mapping_id
+
+if TYPE_CHECKING:
+    from interpreter.compiler import CompiledFinalize
+
+MappingCacheDict = MutableMapping[Field, dict[str, Any]]
+
+
+class MappingCache(MutableMapping[Field, dict[str, Any]]):
+    """
+    Cached entries of one mapping. A complete cache holds every key of the mapping, so a missing key is absent from
+    the mapping. Once entries are evicted the cache is incomplete and missing keys have to be fetched by key_id.
+    """
+
+    def __init__(self, store: "MappingCacheStore", mapping_id: Field, pinned: bool):
+        self.store = store
+        self.mapping_id = mapping_id
+        self.pinned = pinned
+        self.complete = True
+        self.data: dict[Field, dict[str, Any]] = {}
+        # keys fetched from the database and found absent, only tracked while incomplete
+        self.missing: set[Field] = set()
+
+    def known(self, key_id: Field) -> bool:
+        return self.complete or key_id in self.data or key_id in self.missing
+
+    def set_missing(self, key_id: Field):
+        if self.complete:
+            return
+        self.missing.add(key_id)
+        self.store.touch(self, key_id)
+
+    def __getitem__(self, key_id: Field) -> dict[str, Any]:
+        value = self.data[key_id]
+        self.store.touch(self, key_id)
+        return value
+
+    def __setitem__(self, key_id: Field, value: dict[str, Any]):
+        self.data[key_id] = value
+        self.missing.discard(key_id)
+        self.store.touch(self, key_id)
+
+    def __delitem__(self, key_id: Field):
+        del self.data[key_id]
+        if self.complete:
+            self.store.forget(self, key_id)
+        else:
+            self.set_missing(key_id)
+
+    def __contains__(self, key_id: object) -> bool:
+        return key_id in self.data
+
+    def __iter__(self) -> Iterator[Field]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def evict(self, key_id: Field):
+        self.data.pop(key_id, None)
+        self.missing.discard(key_id)
+        self.complete = False
+
+
+class MappingCacheStore(MutableMapping[Field, MappingCache]):
+    """
+    Mapping state used by the finalizer, bounded to max_entries cached keys over all mappings.
+
+    Entries are only evicted in trim(), which must be called when the database has caught up with the cache (after the
+    finalize operations are written), so changes that aren't written yet are never dropped. Processes that never write
+    set trim_on_insert instead, so the cache is trimmed as soon as it outgrows max_entries. Pinned mappings are
+    iterated as a whole and never evicted.
+
+    Mappings start empty and incomplete and are filled by point lookups, unless preload is set, in which case a
+    mapping is read in full the first time it is used.
+    """
+
+    def __init__(self, max_entries: int, pinned: set[Field], preload: bool = False):
+        self.max_entries = max_entries
+        self.pinned = pinned
+        self.preload = preload
+        self.trim_on_insert = False
+        self._mappings: dict[Field, MappingCache] = {}
+        self._lru: OrderedDict[tuple[Field, Field], None] = OrderedDict()
+
+    def touch(self, mapping: MappingCache, key_id: Field):
+        if mapping.pinned:
+            return
+        key = (mapping.mapping_id, key_id)
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+        if self.trim_on_insert and len(self._lru) > self.max_entries:
+            self.trim()
+
+    def forget(self, mapping: MappingCache, key_id: Field):
+        self._lru.pop((mapping.mapping_id, key_id), None)
+
+    def new(self, mapping_id: Field, data: MappingCacheDict, complete: bool) -> MappingCache:
+        if mapping_id in self._mappings:
+            del self[mapping_id]
+        mapping = MappingCache(self, mapping_id, mapping_id in self.pinned)
+        mapping.complete = complete
+        for key_id, value in data.items():
+            mapping[key_id] = value
+        self._mappings[mapping_id] = mapping
+        return mapping
+
+    def trim(self):
+        if self.max_entries <= 0:
+            return
+        while len(self._lru) > self.max_entries:
+            (mapping_id, key_id), _ = self._lru.popitem(last=False)
+            self._mappings[mapping_id].evict(key_id)
+
+    def __getitem__(self, mapping_id: Field) -> MappingCache:
+        return self._mappings[mapping_id]
+
+    def __setitem__(self, mapping_id: Field, data: MappingCacheDict): # type: ignore[override]
+        self.new(mapping_id, data, True)
+
+    def __delitem__(self, mapping_id: Field):
+        mapping = self._mappings.pop(mapping_id)
+        for key_id in list(mapping.data) + list(mapping.missing):
+            self.forget(mapping, key_id)
+
+    def __iter__(self) -> Iterator[Field]:
+        return iter(self._mappings)
+
+    def __len__(self) -> int:
+        return len(self._mappings)
+
+    def clear(self):
+        self._mappings.clear()
+        self._lru.clear()
+
+
+global_mapping_cache = MappingCacheStore(
+    int(os.environ.get("MAPPING_CACHE_SIZE", 1000000)),
+    {Field.loads(cached_get_mapping_id("credits.aleo", m)) for m in ["committee", "bonded", "delegated"]},
+    bool(int(os.environ.get("MAPPING_CACHE_PRELOAD", 0))),
+)
+
+
+class ProgramStore:
+    """
+    Raw bytes of deployed programs shared by every explorer process on the host, one file per program under directory.
+    By default the directory is on /dev/shm, so all processes read the same pages instead of each asking the database.
+    Programs can't change once deployed, so entries are written once, atomically, and only dropped when the database
+    is cleared or reverted, as the programs deployed since may be gone or deployed differently afterwards.
+    """
+
+    program_id_pattern = re.compile(r"[a-z0-9_]+\.aleo")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, program_id: str) -> Optional[str]:
+        # program ids come from urls too, anything that isn't a plain program id is never stored
+        if not self.directory or not self.program_id_pattern.fullmatch(program_id):
+            return None
+        return os.path.join(self.directory, program_id)
+
+    def get(self, program_id: str) -> Optional[bytes]:
+        if (path := self._path(program_id)) is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, program_id: str, data: bytes):
+        if (path := self._path(program_id)) is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def clear(self):
+        if not self.directory:
+            return
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+def _default_program_store_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    # programs with the same id differ between networks and between databases of dev networks
+    name = "-".join(filter(None, (os.environ.get(k) for k in ("NETWORK", "DB_HOST", "DB_DATABASE", "DB_SCHEMA"))))
+    return os.path.join(base, "aleo-explorer-programs-" + re.sub(r"[^A-Za-z0-9_.-]", "_", name))
+
+
+global_program_store = ProgramStore(os.environ.get("PROGRAM_CACHE_DIR", _default_program_store_dir()))
+
+
+class HotBlockCache:
+    """
+    The most recent blocks, for processes that only read the database. The writer publishes the height of every
+    committed block on `channel` and DatabaseBlock.run_hot_block_cache loads it here, so the latest block is read from
+    memory instead of rebuilt for every request. Empty and inactive while not subscribed, as blocks could be missed.
+    """
+
+    channel = "block_saved"
+
+    def __init__(self, size: int):
+        self.size = size
+        self.active = False
+        # by height, ascending
+        self.blocks: OrderedDict[int, Block] = OrderedDict()
+
+    def latest(self) -> Block | None:
+        if not self.active or not self.blocks:
+            return None
+        return next(reversed(self.blocks.values()))
+
+    def get(self, height: int) -> Block | None:
+        if not self.active:
+            return None
+        return self.blocks.get(height)
+
+    def set_latest(self, block: Block):
+        # anything above was reverted, anything at the height may have been replaced
+        for height in [x for x in self.blocks if x >= block.height]:
+            del self.blocks[height]
+        self.blocks[block.height] = block
+        while len(self.blocks) > self.size:
+            self.blocks.popitem(last=False)
+        self.active = True
+
+    def clear(self):
+        self.active = False
+        self.blocks.clear()
+
+
+global_hot_blocks = HotBlockCache(int(os.environ.get("HOT_BLOCK_CACHE_SIZE", 10)))
+
+# decoded programs of this process, least recently used first
+global_program_cache: OrderedDict[str, Program] = OrderedDict()
+program_cache_size = int(os.environ.get("PROGRAM_CACHE_SIZE", 1000))
+# compiled finalize commands by (program id, function name), programs can't change once deployed
+global_finalize_cache: dict[tuple[str, str], "CompiledFinalize"] = {}
+
+# the writer publishes on this channel after clearing or reverting the database, every other process then drops the
+# programs it decoded, as a program id may have been deployed differently since
+program_cache_channel = "program_cache_cleared"
 
-MappingCacheDict = dict[Field, dict[str, Any]]
+def clear_local_program_caches():
+    # the decoded programs of this process
+    global_program_cache.clear()
+    global_finalize_cache.clear()
 
-global_mapping_cache: dict[Field, MappingCacheDict] = {}
-global_program_cache: dict[str, Program] = {}
+def clear_program_caches():
+    # the shared store too, only for the process that changed the database
+    global_program_store.clear()
+    clear_local_program_caches()
 
 async def get_program(db: "Database", program_id: str) -> Program | None:
     try:
-        return global_program_cache[program_id]
+        program = global_program_cache[program_id]
+        global_program_cache.move_to_end(program_id)
+        return program
     except KeyError:
-        program = await db.get_program(program_id)
-        if not program:
+        pass
+    program_bytes = global_program_store.get(program_id)
+    if program_bytes is None:
+        program_bytes = await db.get_program(program_id)
+        if not program_bytes:
             return None
-        program = Program.load(BytesIO(program))
-        global_program_cache[program_id] = program
-        return program
\ No newline at end of file
+        global_program_store.set(program_id, program_bytes)
+    program = Program.load(BytesIO(program_bytes))
+    global_program_cache[program_id] = program
+    if len(global_program_cache) > program_cache_size > 0:
+        global_program_cache.popitem(last=False)
+    return program
@@ -16,6 +16,7 @@ from db import Database
 from middleware.asgi_logger import AccessLoggerMiddleware
 from middleware.auth import AuthMiddleware
 from middleware.server_timing import ServerTimingMiddleware
+from util.global_cache import global_mapping_cache
 from util.set_proc_title import set_proc_title
 from .block_routes import blocks_route, get_summary, recent_blocks_route, index_update_route, block_route
 from .error_routes import bad_request, not_found, internal_error
@@ -82,6 +83,10 @@ async def startup():
     # noinspection PyUnresolvedReferences
     app.state.db = db
     # noinspection PyUnresolvedReferences
+    app.state.hot_block_task = asyncio.create_task(db.run_hot_block_cache())
+    # nothing is written from here, so the mapping cache can be trimmed right away
+    global_mapping_cache.trim_on_insert = True
+    # noinspection PyUnresolvedReferences
     # app.state.lns.connect(os.environ.get("P2P_NODE_HOST", "127.0.0.1"), int(os.environ.get("P2P_NODE_PORT", "4130")), None)
     app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))
     set_proc_title("aleo-explorer: webapi")
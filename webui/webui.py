@@ -15,6 +15,7 @@ from middleware.asgi_logger import AccessLoggerMiddleware
 from middleware.htmx import HtmxMiddleware
 from middleware.minify import MinifyMiddleware
 from middleware.server_timing import ServerTimingMiddleware
+from util.global_cache import global_mapping_cache
 from util.set_proc_title import set_proc_title
 from .chain_routes import *
 from .error_routes import *
@@ -180,6 +181,10 @@ async def startup():
     # noinspection PyUnresolvedReferences
     app.state.db = db
     # noinspection PyUnresolvedReferences
+    app.state.hot_block_task = asyncio.create_task(db.run_hot_block_cache())
+    # nothing is written from here, so the mapping cache can be trimmed right away
+    global_mapping_cache.trim_on_insert = True
+    # noinspection PyUnresolvedReferences
     app.state.lns.connect(os.environ.get("P2P_NODE_HOST", "127.0.0.1"), int(os.environ.get("P2P_NODE_PORT", "4133")), None)
     app.state.lns.start_listener()
     app.state.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1))